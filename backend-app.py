@@ -2,6 +2,9 @@
 Minimal backend for Color‑Distance Study
 - Accepts POST /submit with JSON: {name, colorA, colorB, score}
 - Appends a TSV line to ratings.tsv: ip timestamp name colorA colorB score\n
+- Serves GET /next with JSON {colorA, colorB}: the pair to rate next
+- Serves GET /stats with JSON per-pair aggregates and model correlations
+- Serves GET /metrics with request latency histograms and counters (Prometheus text format)
 CORS enabled for simplicity (Access-Control-Allow-Origin: *).
 """
 from http.server import HTTPServer, BaseHTTPRequestHandler
@@ -9,6 +12,9 @@ import json
 import os
 import sys
 import time
+from urllib.parse import parse_qs
+
+from study import LiveStats, Metrics, PairScheduler, SessionMonitor, read_ratings
 
 
 BASE_DIR = os.path.dirname(__file__)
@@ -20,7 +26,21 @@ OUTPUT_FILE = os.environ.get(
 HOST = os.environ.get('HOST', '0.0.0.0')
 PORT = int(os.environ.get('PORT', '28080'))
 
+METRICS = Metrics()
+
+# Per-pair rating counts and variances, and running aggregates for /stats,
+# seeded from the ratings log.  Ratings of untrusted sessions are kept out of them,
+# and those of new sessions until they are judged.
+SCHEDULER = PairScheduler()
+STATS = LiveStats()
+SESSIONS = SessionMonitor()
+for _ip, _ts, _name, _colorA, _colorB, _score in read_ratings(OUTPUT_FILE):
+    for _rating in SESSIONS.submit(_name, _ip, _ts, _colorA, _colorB, _score)[1]:
+        SCHEDULER.add(*_rating)
+        STATS.add(*_rating)
 
+
+@METRICS.instrument_handler
 class Handler(BaseHTTPRequestHandler):
     server_version = "ColorDistanceStudy/1.0"
 
@@ -31,7 +51,7 @@ class Handler(BaseHTTPRequestHandler):
     def _set_cors(self):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
 
     def do_OPTIONS(self):
         self.send_response(204)
@@ -39,7 +59,7 @@ class Handler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
-        path = self.path.split("?", 1)[0]
+        path, _, query = self.path.partition("?")
 
         if path == "/health":
             self.send_response(200)
@@ -49,6 +69,26 @@ class Handler(BaseHTTPRequestHandler):
             self.wfile.write(b'{"ok": true}')
             return
 
+        if path == "/next":
+            params = parse_qs(query)
+            shown = (params.get("a", [""])[0], params.get("b", [""])[0])
+            colorA, colorB = SCHEDULER.next_pair(exclude=shown if all(shown) else None)
+            self.send_response(200)
+            self._set_cors()
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.end_headers()
+            self.wfile.write(json.dumps({"colorA": colorA, "colorB": colorB}).encode("utf-8"))
+            return
+
+        if path == "/stats":
+            body = json.dumps(dict(STATS.summary(), sessions=SESSIONS.summary()), ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self._set_cors()
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
         if path == '/':
             try:
                 body = self._read_file_bytes(INDEX_FILE)
@@ -81,14 +121,15 @@ class Handler(BaseHTTPRequestHandler):
         try:
             length = int(self.headers.get('Content-Length', '0'))
             raw = self.rfile.read(length) if length else b''
-            data = json.loads(raw.decode('utf-8'))
-            ip_addr = self.client_address[0]
-            name = str(data.get('name', '')).strip()
-            # Replace all whitespace characters with spaces
-            name = ' '.join(name.split())
-            colorA = str(data.get('colorA', '')).strip()
-            colorB = str(data.get('colorB', '')).strip()
-            score = int(data.get('score'))
+            with METRICS.phase(self.path, 'parse'):
+                data = json.loads(raw.decode('utf-8'))
+                ip_addr = self.client_address[0]
+                name = str(data.get('name', '')).strip()
+                # Replace all whitespace characters with spaces
+                name = ' '.join(name.split())
+                colorA = str(data.get('colorA', '')).strip()
+                colorB = str(data.get('colorB', '')).strip()
+                score = int(data.get('score'))
             if not name or not colorA or not colorB or not (0 <= score <= 100):
                 raise ValueError('Invalid payload')
         except Exception:
@@ -100,10 +141,15 @@ class Handler(BaseHTTPRequestHandler):
         # Append TSV line
         timestamp = int(time.time())
         line = f"{ip_addr}\t{timestamp}\t{name}\t{colorA}\t{colorB}\t{score}\n"
-        # Ensure directory exists if path includes folders
-        os.makedirs(os.path.dirname(OUTPUT_FILE) or '.', exist_ok=True)
-        with open(OUTPUT_FILE, 'a', encoding='utf-8') as f:
-            f.write(line)
+        with METRICS.writing(), METRICS.phase(self.path, 'write'):
+            # Ensure directory exists if path includes folders
+            os.makedirs(os.path.dirname(OUTPUT_FILE) or '.', exist_ok=True)
+            with open(OUTPUT_FILE, 'a', encoding='utf-8') as f:
+                f.write(line)
+        # Untrusted sessions are logged, but kept out of live aggregates
+        for rating in SESSIONS.submit(name, ip_addr, timestamp, colorA, colorB, score)[1]:
+            SCHEDULER.add(*rating)
+            STATS.add(*rating)
 
         self.send_response(204)  # No Content
         self._set_cors()
@@ -0,0 +1,185 @@
+"""
+Cost and quality of the color difference metrics.
+
+Cost per million pairs:
+- scalar: the distance method of model objects (conversion excluded);
+- batch: colors.batch on arrays, the distance alone and with the conversion from display sRGB.
+Quality: correlation with the human distances of every results/ dataset.
+Oklab fast path: conversion of 8-bit display sRGB to Lab and to Oklab (float64, float32,
+lookup table), and how often nearest palette colors by Oklab agree with ΔE2000.
+
+Usage: python bench-metrics.py [batch_pairs]
+"""
+import glob
+import sys
+import time
+
+import numpy as np
+from scipy.stats import pearsonr, spearmanr
+
+from colors import (
+    RGBDisplay,
+    rgbd_to_rgbl,
+    rgb_to_lab76,
+    rgb_to_lab2k,
+    rgb_to_lab94,
+    rgb_to_labcmc,
+    rgb_to_oklab,
+    rgb_to_cam16ucs,
+)
+from colors import batch
+from colors.metrics import get_metric
+from study import PREDEFINED_PAIRS, parse_hex_color
+from study.evaluation import load_pair_table
+
+
+# Registered metric -> scalar conversion from linear RGB
+METRICS = {
+    'lab76': rgb_to_lab76,
+    'lab2k': rgb_to_lab2k,
+    'lab94': rgb_to_lab94,
+    'cmc': rgb_to_labcmc,
+    'oklab': rgb_to_oklab,
+    'cam16': rgb_to_cam16ucs,
+}
+RESULTS = 'results/*.tsv'
+MIN_PAIRS = 10  # datasets with less rated pairs are skipped
+SCALAR_PAIRS = 20_000
+BATCH_PAIRS = 1_000_000
+REPEAT = 3
+NEAREST_COLORS = 20_000
+
+
+def best_time(func, repeat: int = REPEAT) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def cost(batch_pairs: int) -> dict:
+    rng = np.random.default_rng(0)
+    rgbd_a = rng.random((batch_pairs, 3))
+    rgbd_b = rng.random((batch_pairs, 3))
+    scalar_a = [rgbd_to_rgbl(RGBDisplay(*c)) for c in rgbd_a[:SCALAR_PAIRS].tolist()]
+    scalar_b = [rgbd_to_rgbl(RGBDisplay(*c)) for c in rgbd_b[:SCALAR_PAIRS].tolist()]
+
+    result = {}
+    for name, convert in METRICS.items():
+        metric = get_metric(name)
+        colors_a = [convert(c) for c in scalar_a]
+        colors_b = [convert(c) for c in scalar_b]
+        scalar = best_time(lambda: [a.distance(b) for a, b in zip(colors_a, colors_b)])
+        conv_a = metric.convert(rgbd_a)
+        conv_b = metric.convert(rgbd_b)
+        distance = best_time(lambda: metric.distance(conv_a, conv_b))
+        total = best_time(lambda: metric.pair_distances(rgbd_a, rgbd_b))
+        scale = 1_000_000
+        result[name] = {
+            'scalar': scalar * scale / len(colors_a),
+            'batch': distance * scale / batch_pairs,
+            'batch_convert': total * scale / batch_pairs,
+        }
+    return result
+
+
+def quality() -> dict:
+    result = {}
+    for path in sorted(glob.glob(RESULTS)):
+        table = load_pair_table(path)
+        rated = ~np.isnan(table['human'])
+        if rated.sum() < MIN_PAIRS:
+            continue
+        human = table['human'][rated]
+        result[path] = {}
+        for name in METRICS:
+            d = get_metric(name).pair_distances(table['rgbd_a'][rated], table['rgbd_b'][rated])
+            result[path][name] = (float(pearsonr(d, human)[0]), float(spearmanr(d, human)[0]))
+    return result
+
+
+def oklab_fast_path(n_colors: int) -> dict:
+    rng = np.random.default_rng(1)
+    rgb8 = rng.integers(0, 256, (n_colors, 3), dtype=np.uint8)
+    rgbd = rgb8 / 255.0
+    scale = 1_000_000 / n_colors
+    timings = {
+        'Lab': best_time(lambda: batch.rgb_to_lab(batch.srgb_to_linear(rgb8 / 255.0))),
+        'Oklab float64': best_time(lambda: batch.rgb_to_oklab(batch.srgb_to_linear(rgb8 / 255.0))),
+        'Oklab float32': best_time(lambda: batch.rgb_to_oklab(batch.srgb_to_linear(rgb8 / 255.0), np.float32)),
+        'Oklab float32 + LUT': best_time(lambda: batch.srgb8_to_oklab(rgb8)),
+    }
+    reference = batch.rgb_to_oklab(batch.srgb_to_linear(rgbd))
+    error = float(np.abs(batch.srgb8_to_oklab(rgb8) - reference).max())
+
+    # Nearest color of the predefined pairs' palette, by each metric
+    palette = np.array(sorted({parse_hex_color(c) for pair in PREDEFINED_PAIRS for c in pair}), dtype=np.uint8)
+    colors = rgb8[:NEAREST_COLORS]
+    lab = batch.rgb_to_lab(batch.srgb_to_linear(colors / 255.0))[:, None, :]
+    palette_lab = batch.rgb_to_lab(batch.srgb_to_linear(palette / 255.0))[None, :, :]
+    nearest = {
+        'ΔE2000': batch.delta_e2000(lab, palette_lab).argmin(axis=1),
+        'ΔE76': batch.delta_e76(lab, palette_lab).argmin(axis=1),
+        'Oklab': (((batch.srgb8_to_oklab(colors)[:, None, :] - batch.srgb8_to_oklab(palette)[None, :, :]) ** 2)
+                  .sum(axis=-1).argmin(axis=1)),
+    }
+    agreement = {name: float(np.mean(index == nearest['ΔE2000'])) for name, index in nearest.items()}
+
+    # Agreement with the human ratings of the latest dataset
+    table = load_pair_table(sorted(glob.glob(RESULTS))[-1])
+    rated = ~np.isnan(table['human'])
+    human = table['human'][rated]
+    a8 = np.rint(table['rgbd_a'][rated] * 255).astype(np.uint8)
+    b8 = np.rint(table['rgbd_b'][rated] * 255).astype(np.uint8)
+    fast = batch.oklab_distance(batch.srgb8_to_oklab(a8), batch.srgb8_to_oklab(b8))
+    correlation = {'Oklab float32 + LUT': (float(pearsonr(fast, human)[0]), float(spearmanr(fast, human)[0]))}
+    for name in ('oklab', 'lab76', 'lab2k'):
+        d = get_metric(name).pair_distances(table['rgbd_a'][rated], table['rgbd_b'][rated])
+        correlation[get_metric(name).label] = (float(pearsonr(d, human)[0]), float(spearmanr(d, human)[0]))
+    return {
+        'timings': {name: t * scale for name, t in timings.items()},
+        'error': error,
+        'palette': len(palette),
+        'agreement': agreement,
+        'correlation': correlation,
+    }
+
+
+def main():
+    batch_pairs = int(sys.argv[1]) if len(sys.argv) > 1 else BATCH_PAIRS
+
+    print("Seconds per million pairs")
+    print(f"{'':13s} | {'scalar':>8s} | {'batch':>8s} | {'batch+conv':>10s} | vs ΔE2000 (scalar, batch+conv)")
+    timings = cost(batch_pairs)
+    ref = timings['lab2k']
+    for name, t in timings.items():
+        print(
+            f"{get_metric(name).label:13s} | {t['scalar']:8.3f} | {t['batch']:8.4f} | {t['batch_convert']:10.4f} |"
+            f" {t['scalar'] / ref['scalar']:5.2f}x, {t['batch_convert'] / ref['batch_convert']:5.2f}x"
+        )
+
+    print()
+    print("Correlation with human distances, Pearson r / Spearman ρ")
+    for path, rows in quality().items():
+        print(path)
+        for name, (r, rho) in rows.items():
+            print(f"  {get_metric(name).label:13s} | {r:6.3f} / {rho:6.3f}")
+
+    print()
+    fast = oklab_fast_path(batch_pairs)
+    print("Conversion of 8-bit display sRGB, seconds per million colors")
+    for name, t in fast['timings'].items():
+        print(f"{name:20s} | {t:8.4f}")
+    print(f"Oklab float32 + LUT, max abs error vs float64: {fast['error']:.2e}")
+    print(f"Nearest of {fast['palette']} palette colors, agreement with ΔE2000")
+    for name, share in fast['agreement'].items():
+        print(f"{name:20s} | {100 * share:6.2f}%")
+    print("Correlation with human distances (latest dataset), Pearson r / Spearman ρ")
+    for name, (r, rho) in fast['correlation'].items():
+        print(f"{name:20s} | {r:6.3f} / {rho:6.3f}")
+
+
+if __name__ == "__main__":
+    main()
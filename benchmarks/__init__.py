@@ -0,0 +1,5 @@
+"""
+Benchmark suite of the colors package.
+
+Run with `python -m benchmarks`, see benchmarks/__main__.py for the options.
+"""
@@ -0,0 +1,51 @@
+"""
+Run the benchmark suite.
+
+  python -m benchmarks                      # measure and print
+  python -m benchmarks --save default       # store as benchmarks/baselines/default.json
+  python -m benchmarks --compare default    # compare with a stored baseline
+  python -m benchmarks --filter lab2k --quick
+
+The exit status is 1 if --compare finds a regression.
+"""
+import argparse
+import sys
+
+from . import suite
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks of the colors package')
+    parser.add_argument('--filter', default='', help='run only the cases containing this text')
+    parser.add_argument('--quick', action='store_true', help='smaller inputs and fewer repeats')
+    parser.add_argument('--save', metavar='NAME', help='store the results as a baseline')
+    parser.add_argument('--compare', metavar='NAME', help='compare with a stored baseline')
+    parser.add_argument('--threshold', type=float, default=suite.THRESHOLD,
+                        help='relative change reported as a regression (default %(default)s)')
+    args = parser.parse_args(argv)
+
+    cases = [case for case in suite.all_cases(args.quick) if args.filter in case.name]
+    repeat = 2 if args.quick else suite.REPEAT
+    min_time = 0.01 if args.quick else suite.MIN_TIME
+
+    def progress(name, result):
+        print(f"{name:40s} {suite.format_value(result['value'], result['unit'])}", flush=True)
+
+    report = suite.run(cases, repeat=repeat, min_time=min_time, progress=progress)
+    if args.save:
+        print(f"Saved to {suite.save(report, args.save)}")
+    if args.compare:
+        baseline = suite.load(args.compare)
+        baseline['results'] = {name: result for name, result in baseline['results'].items() if args.filter in name}
+        rows = suite.compare(report, baseline, args.threshold)
+        print()
+        print(f"Compared with {args.compare}:")
+        for line in suite.format_comparison(rows):
+            print(line)
+        if any(row['status'] == 'regression' for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
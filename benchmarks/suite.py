@@ -0,0 +1,290 @@
+"""
+Benchmark cases and measurement.
+
+Every case measures one thing:
+- scalar/<converter>, scalar/<Model>.distance: operations per second on model objects;
+- batch/<kernel>, batch/<metric>: colors (or pairs) per second on NumPy arrays;
+- construct/<Model>: objects created per second;
+- memory/<Model>: bytes per color object.
+Time is the best of several repeats of a calibrated loop, as in timeit.
+"""
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+import colors
+from colors import batch
+from colors.metrics import registered_metrics
+
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+REPEAT = 5
+MIN_TIME = 0.05  # seconds per repeat
+SCALAR_COLORS = 1000
+BATCH_COLORS = 100_000
+MEMORY_COLORS = 10_000
+THRESHOLD = 0.25  # relative change reported as a regression, above the run-to-run noise
+
+# Forward conversion from linear RGB to every model, by name in the converters
+FORWARD = {
+    'rgbd': colors.rgbl_to_rgbd,
+    'rgbl': lambda c: c,
+    'rgb': lambda c: c,
+    'yiq': colors.rgb_to_yiq,
+    'hsv': colors.rgb_to_hsv,
+    'hls': colors.rgb_to_hls,
+    'lab76': colors.rgb_to_lab76,
+    'lab2k': colors.rgb_to_lab2k,
+    'lab94': colors.rgb_to_lab94,
+    'labcmc': colors.rgb_to_labcmc,
+    'oklab': colors.rgb_to_oklab,
+    'cam16ucs': colors.rgb_to_cam16ucs,
+}
+
+# Model classes, and how to get one from linear RGB
+MODELS = {
+    'RGBDisplay': colors.rgbl_to_rgbd,
+    'RGBLinear': lambda c: c,
+    'YIQ': colors.rgb_to_yiq,
+    'HSV': colors.rgb_to_hsv,
+    'HLS': colors.rgb_to_hls,
+    'Lab76': colors.rgb_to_lab76,
+    'Lab2k': colors.rgb_to_lab2k,
+    'Lab2kTextiles': lambda c: colors.Lab2kTextiles(*colors.rgb_to_lab2k(c).components()),
+    'Lab94': colors.rgb_to_lab94,
+    'LabCMC': colors.rgb_to_labcmc,
+    'Oklab': colors.rgb_to_oklab,
+    'CAM16UCS': colors.rgb_to_cam16ucs,
+}
+
+BATCH_KERNELS = (
+    'srgb_to_linear', 'linear_to_srgb', 'srgb8_to_linear',
+    'rgb_to_yiq', 'rgb_to_hsv', 'rgb_to_hls', 'rgb_to_lab', 'rgb_to_oklab', 'srgb8_to_oklab', 'rgb_to_cam16ucs',
+)
+
+
+class Case:
+    """
+    A benchmark case.
+    func: runs `n` operations, unit: what the value counts,
+    kind: 'time' (value is operations per second, higher is better)
+    or 'memory' (value is bytes per color, lower is better).
+    """
+    def __init__(self, name: str, func, n: int, unit: str = 'ops/s', kind: str = 'time'):
+        self.name = name
+        self.func = func
+        self.n = n
+        self.unit = unit
+        self.kind = kind
+
+    def measure(self, repeat: int = REPEAT, min_time: float = MIN_TIME) -> float:
+        if self.kind == 'memory':
+            return self.func()
+        timer = timeit.Timer(self.func)
+        number = 1
+        while True:
+            if timer.timeit(number) >= min_time:
+                break
+            number *= 2
+        best = min(timer.repeat(repeat=repeat, number=number))
+        return self.n * number / best
+
+
+def _sample_rgbl(n: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    return [colors.RGBLinear(*c) for c in rng.random((n, 3)).tolist()]
+
+
+def _memory_per_color(make, components) -> float:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [make(*c) for c in components]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The list itself is not counted
+    return (after - before - sys.getsizeof(objects)) / len(objects)
+
+
+def scalar_cases(n: int = SCALAR_COLORS) -> list[Case]:
+    rgbl = _sample_rgbl(n)
+    rgbl_b = _sample_rgbl(n, seed=1)
+    cases = []
+    for name in colors.__all__:
+        if '_to_' not in name:
+            continue
+        source = name.split('_to_')[0]
+        convert = getattr(colors, name)
+        inputs = [FORWARD[source](c) for c in rgbl]
+        cases.append(Case(f"scalar/{name}", lambda f=convert, xs=inputs: [f(x) for x in xs], n))
+    for model, make in MODELS.items():
+        a = [make(c) for c in rgbl]
+        b = [make(c) for c in rgbl_b]
+        cases.append(Case(
+            f"scalar/{model}.distance", lambda xs=a, ys=b: [x.distance(y) for x, y in zip(xs, ys)], n,
+        ))
+    return cases
+
+
+def construct_cases(n: int = SCALAR_COLORS) -> list[Case]:
+    rgbl = _sample_rgbl(n)
+    cases = []
+    for model, make in MODELS.items():
+        cls = getattr(colors, model)
+        components = [make(c).components() for c in rgbl]
+        cases.append(Case(f"construct/{model}", lambda k=cls, xs=components: [k(*x) for x in xs], n))
+    rgb8 = [c.to_8bit() for c in rgbl]
+    hexes = [c.to_hex() for c in rgbl]
+    cases.append(Case("construct/RGB.from_8bit", lambda: [colors.RGBLinear.from_8bit(*x) for x in rgb8], n))
+    cases.append(Case("construct/RGB.from_hex", lambda: [colors.RGBLinear.from_hex(x) for x in hexes], n))
+    cases.append(Case("construct/parse_hex_array", lambda: colors.parse_hex_array(hexes), n))
+    return cases
+
+
+def memory_cases(n: int = MEMORY_COLORS) -> list[Case]:
+    rgbl = _sample_rgbl(n)
+    cases = []
+    for model, make in MODELS.items():
+        cls = getattr(colors, model)
+        components = [make(c).components() for c in rgbl]
+        cases.append(Case(
+            f"memory/{model}", lambda k=cls, xs=components: _memory_per_color(k, xs), n,
+            unit='bytes/color', kind='memory',
+        ))
+    return cases
+
+
+def batch_cases(n: int = BATCH_COLORS) -> list[Case]:
+    rng = np.random.default_rng(0)
+    rgbd_a = rng.random((n, 3))
+    rgbd_b = rng.random((n, 3))
+    rgb8 = rng.integers(0, 256, (n, 3), dtype=np.uint8)
+    cases = []
+    for name in BATCH_KERNELS:
+        kernel = getattr(batch, name)
+        values = rgb8 if name.startswith('srgb8_') else rgbd_a
+        cases.append(Case(f"batch/{name}", lambda k=kernel, x=values: k(x), n))
+    for metric in registered_metrics():
+        a = metric.convert(rgbd_a)
+        b = metric.convert(rgbd_b)
+        cases.append(Case(f"batch/{metric.name}.distance", lambda m=metric, x=a, y=b: m.distance(x, y), n))
+        cases.append(Case(
+            f"batch/{metric.name}.pair_distances", lambda m=metric: m.pair_distances(rgbd_a, rgbd_b), n,
+        ))
+        cases.append(Case(
+            f"batch/{metric.name}.pair_distances.float32",
+            lambda m=metric: m.pair_distances(rgbd_a, rgbd_b, np.float32), n,
+        ))
+    return cases
+
+
+def all_cases(quick: bool = False) -> list[Case]:
+    scale = 10 if quick else 1
+    return (
+        scalar_cases(SCALAR_COLORS // scale)
+        + construct_cases(SCALAR_COLORS // scale)
+        + memory_cases(MEMORY_COLORS // scale)
+        + batch_cases(BATCH_COLORS // scale)
+    )
+
+
+def run(cases, repeat: int = REPEAT, min_time: float = MIN_TIME, progress=None) -> dict:
+    """
+    Measure the cases. Returns {'meta': {...}, 'results': {name: {'value', 'unit', 'kind'}}}.
+    """
+    results = {}
+    for case in cases:
+        results[case.name] = {'value': case.measure(repeat, min_time), 'unit': case.unit, 'kind': case.kind}
+        if progress is not None:
+            progress(case.name, results[case.name])
+    meta = {
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'system': platform.system(),
+    }
+    return {'meta': meta, 'results': results}
+
+
+def baseline_path(name: str) -> str:
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, name + '.json')
+
+
+def save(report: dict, name: str) -> str:
+    path = baseline_path(name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+        f.write('\n')
+    return path
+
+
+def load(name: str) -> dict:
+    with open(baseline_path(name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(current: dict, baseline: dict, threshold: float = THRESHOLD) -> list[dict]:
+    """
+    Rows {name, unit, baseline, current, change, status} for the cases of either report.
+    change: relative, positive is better; status: 'regression', 'improvement' or 'ok',
+    'new' for the cases without a baseline and 'missing' for those not measured now
+    (their baseline, current and change are None).
+    """
+    rows = []
+    for name, cur in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            rows.append({'name': name, 'unit': cur['unit'], 'baseline': None, 'current': cur['value'],
+                         'change': None, 'status': 'new'})
+            continue
+        if cur['kind'] == 'memory':
+            change = base['value'] / cur['value'] - 1 if cur['value'] else 0.0
+        else:
+            change = cur['value'] / base['value'] - 1 if base['value'] else 0.0
+        if change < -threshold:
+            status = 'regression'
+        elif change > threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({
+            'name': name, 'unit': cur['unit'], 'baseline': base['value'], 'current': cur['value'],
+            'change': change, 'status': status,
+        })
+    for name, base in baseline['results'].items():
+        if name not in current['results']:
+            rows.append({'name': name, 'unit': base['unit'], 'baseline': base['value'], 'current': None,
+                         'change': None, 'status': 'missing'})
+    return rows
+
+
+def format_value(value: float, unit: str) -> str:
+    if unit == 'bytes/color':
+        return f"{value:8.1f} B"
+    for factor, suffix in ((1e6, 'M'), (1e3, 'k')):
+        if value >= factor:
+            return f"{value / factor:8.2f}{suffix}/s"
+    return f"{value:8.2f} /s"
+
+
+def format_comparison(rows: list[dict]) -> list[str]:
+    lines = []
+    for row in rows:
+        if row['change'] is None:
+            value = row['current'] if row['status'] == 'new' else row['baseline']
+            lines.append(f"{row['name']:40s} {format_value(value, row['unit'])}  {row['status']}")
+            continue
+        mark = {'regression': '  <-- REGRESSION', 'improvement': '  faster' if row['unit'] != 'bytes/color' else '  smaller'}
+        lines.append(
+            f"{row['name']:40s} {format_value(row['baseline'], row['unit'])} -> {format_value(row['current'], row['unit'])}"
+            f" {100 * row['change']:+7.1f}%{mark.get(row['status'], '')}"
+        )
+    return lines
@@ -1,51 +1,63 @@
-from .models import RGB, RGBDisplay, RGBLinear, YIQ, HSV, HLS, Lab, Lab76, Lab2k
-from .convert import (
-    rgbd_to_rgbl,
-    rgbl_to_rgbd,
-    rgb_to_yiq,
-    yiq_to_rgbd,
-    yiq_to_rgbl,
-    rgb_to_hsv,
-    hsv_to_rgbd,
-    hsv_to_rgbl,
-    rgb_to_hls,
-    hls_to_rgbd,
-    hls_to_rgbl,
-    rgb_to_lab76,
-    lab76_to_rgbd,
-    lab76_to_rgbl,
-    rgb_to_lab2k,
-    lab2k_to_rgbd,
-    lab2k_to_rgbl,
+"""
+Color models, conversions and distances.
+
+The public names are imported on first access (module __getattr__), so that
+`import colors` is fast: NumPy is only imported with colors.bulk, and with the
+batch, metrics, image and palette modules.
+"""
+import importlib
+import os
+
+
+_MODELS = (
+    'RGB', 'RGBDisplay', 'RGBLinear', 'YIQ', 'HSV',
+    'HLS', 'Lab', 'Lab76', 'Lab2k', 'Lab2kTextiles', 'PreparedLab2k',
+    'Lab94', 'LabCMC', 'Oklab', 'CAM16UCS',
+)
+_CONVERT = (
+    'rgbd_to_rgbl', 'rgbl_to_rgbd',
+    'rgb_to_yiq', 'yiq_to_rgbd', 'yiq_to_rgbl',
+    'rgb_to_hsv', 'hsv_to_rgbd', 'hsv_to_rgbl',
+    'rgb_to_hls', 'hls_to_rgbd', 'hls_to_rgbl',
+    'rgb_to_lab76', 'lab76_to_rgbd', 'lab76_to_rgbl',
+    'rgb_to_lab2k', 'lab2k_to_rgbd', 'lab2k_to_rgbl',
+    'rgb_to_lab94', 'lab94_to_rgbd', 'lab94_to_rgbl',
+    'rgb_to_labcmc', 'labcmc_to_rgbd', 'labcmc_to_rgbl',
+    'rgb_to_oklab', 'oklab_to_rgbd', 'oklab_to_rgbl',
+    'rgb_to_cam16ucs', 'cam16ucs_to_rgbd', 'cam16ucs_to_rgbl',
+)
+_SETTINGS = ('set_validation', 'validation_enabled')
+_BULK = (
+    'parse_hex_array', 'to_hex_array',
+    'pack_rgb8', 'unpack_rgb8', 'pack_pairs', 'unpack_pairs',
 )
+# Public name -> module defining it
+_EXPORTS = {
+    **{name: 'models' for name in (*_MODELS, *_SETTINGS)},
+    **{name: 'convert' for name in _CONVERT},
+    **{name: 'bulk' for name in _BULK},
+}
+SUBMODULES = ('models', 'convert', 'bulk', 'batch', 'metrics', 'image', 'palette', 'preview', 'profiling')
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value  # the next access does not get here
+        return value
+    if name in SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS) | set(SUBMODULES))
+
 
+# Opt-in instrumentation, see colors.profiling
+if os.environ.get('COLORS_PROFILE'):
+    from . import profiling
+    profiling.enable(report_at_exit=True)
 
 
-__all__ = [
-    "RGB",
-    "RGBDisplay",
-    "RGBLinear",
-    "YIQ",
-    "HSV",
-    "HLS",
-    "Lab",
-    "Lab76",
-    "Lab2k",
-    "rgbd_to_rgbl",
-    "rgbl_to_rgbd",
-    "rgb_to_yiq",
-    "yiq_to_rgbd",
-    "yiq_to_rgbl",
-    "rgb_to_hsv",
-    "hsv_to_rgbd",
-    "hsv_to_rgbl",
-    "rgb_to_hls",
-    "hls_to_rgbd",
-    "hls_to_rgbl",
-    "rgb_to_lab76",
-    "lab76_to_rgbd",
-    "lab76_to_rgbl",
-    "rgb_to_lab2k",
-    "lab2k_to_rgbd",
-    "lab2k_to_rgbl",
-]
+__all__ = [*_MODELS, *_SETTINGS, *_CONVERT, *_BULK]
@@ -0,0 +1,461 @@
+"""
+Vectorized (NumPy) versions of the conversions and distances.
+
+Colors are arrays of shape (..., 3) with components in the same order and
+ranges as the model classes; distances return arrays of shape (...).
+The formulas mirror colors.convert and the distance methods in colors.models.
+
+Every kernel takes `dtype`: np.float64 or np.float32.  By default float32 input
+stays float32 and anything else is computed in float64.  float32 halves the memory
+traffic; max abs error versus float64 over the 8-bit RGB cube (linear input),
+the round trip error is on top of the float64 one (1.5e-3 for YIQ, its matrices are rounded):
+
+    model       components           distance (0..1)   round trip to RGB
+    RGB         2e-7 (gamma)         1e-7              1e-7
+    YIQ         1e-7                 1e-7              1e-7
+    HSV, HLS    4e-7                 1e-7              1e-6
+    Lab         1e-4 (L in 0..100)   ΔE76 1e-6,        2e-6
+                                     ΔE2000 2e-6,
+                                     ΔE94 1e-6, CMC 2e-6
+    Oklab       1e-6                 1e-6              3e-6
+    CAM16-UCS   2e-4 (J in 0..100)   2e-6              6e-6
+
+all well below DEFAULT_TOLERANCE (1/512) of colors.models, see tests/test_batch.py.
+"""
+import numpy as np
+
+from .convert import CAM16_AW, CAM16_C, CAM16_D_RGB, CAM16_FL, CAM16_M16, CAM16_N, CAM16_NBB, CAM16_NC, CAM16_Z
+from .models import SQRT3, LAB94_MAX, LABCMC_MAX, OKLAB_MAX, CAM16UCS_MAX
+
+
+FLOAT_DTYPES = (np.float32, np.float64)
+
+
+def as_float(values, dtype=None) -> np.ndarray:
+    # Array of the requested float dtype; by default float32 stays float32, anything else is float64
+    values = np.asarray(values)
+    if dtype is None:
+        dtype = values.dtype if values.dtype in FLOAT_DTYPES else np.float64
+    return values.astype(dtype, copy=False)
+
+
+def _matmul(values: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    # values (..., 3) times the transposed 3x3 matrix, in the dtype of values
+    return values @ matrix.T.astype(values.dtype, copy=False)
+
+
+def _clip01(rgb: np.ndarray) -> np.ndarray:
+    return np.clip(rgb, 0.0, 1.0)
+
+
+# --- RGB -----------------------------------------------------------
+def srgb_to_linear(rgb: np.ndarray, dtype=None) -> np.ndarray:
+    # Gamma to linear light, IEC 61966-2-1 sRGB EOTF
+    rgb = as_float(rgb, dtype)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(rgb: np.ndarray, dtype=None) -> np.ndarray:
+    # Linear light to gamma, inverse of IEC 61966-2-1 sRGB EOTF
+    rgb = as_float(rgb, dtype)
+    return np.where(rgb <= 0.0031308, 12.92 * rgb, 1.055 * np.abs(rgb) ** (1 / 2.4) - 0.055)
+
+
+# Linear values of the 8-bit display sRGB codes
+SRGB8_TO_LINEAR = srgb_to_linear(np.arange(256) / 255.0)
+
+
+def srgb8_to_linear(rgb8: np.ndarray, dtype=np.float64) -> np.ndarray:
+    # 8-bit display sRGB (uint8 or integers in [0..255]) to linear RGB, by lookup table
+    return SRGB8_TO_LINEAR.astype(dtype)[rgb8]
+
+
+# --- YIQ -----------------------------------------------------------
+RGB_TO_YIQ = np.array([
+    [0.299, 0.587, 0.114],
+    [0.596, -0.274, -0.322],
+    [0.211, -0.523, 0.312],
+])
+YIQ_TO_RGB = np.array([
+    [1.0, 0.956, 0.621],
+    [1.0, -0.272, -0.647],
+    [1.0, -1.106, 1.703],
+])
+
+
+def rgb_to_yiq(rgb: np.ndarray, dtype=None) -> np.ndarray:
+    return _matmul(as_float(rgb, dtype), RGB_TO_YIQ)
+
+
+def yiq_to_rgb(yiq: np.ndarray, dtype=None) -> np.ndarray:
+    return _clip01(_matmul(as_float(yiq, dtype), YIQ_TO_RGB))
+
+
+# --- HSV, HLS ------------------------------------------------------
+def _hue(r, g, b, mx, d):
+    # Hue in [0..1), 0 for grays; the same branches as colors.convert
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h = np.select(
+            [d == 0, mx == r, mx == g],
+            [0.0, ((g - b) / d) % 6.0, (b - r) / d + 2.0],
+            (r - g) / d + 4.0,
+        )
+    return (h / 6.0) % 1.0
+
+
+def rgb_to_hsv(rgb: np.ndarray, dtype=None) -> np.ndarray:
+    rgb = as_float(rgb, dtype)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    mx = rgb.max(axis=-1)
+    mn = rgb.min(axis=-1)
+    d = mx - mn
+    h = _hue(r, g, b, mx, d)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(mx == 0, 0.0, d / mx)
+    return np.stack([h, s, mx], axis=-1).astype(rgb.dtype, copy=False)
+
+
+def hsv_to_rgb(hsv: np.ndarray, dtype=None) -> np.ndarray:
+    hsv = as_float(hsv, dtype)
+    h = (hsv[..., 0] % 1.0) * 6.0
+    s, v = hsv[..., 1], hsv[..., 2]
+    i = np.floor(h)
+    f = h - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    sector = [i == k for k in range(5)]
+    r = np.select(sector, [v, q, p, p, t], v)
+    g = np.select(sector, [t, v, v, q, p], p)
+    b = np.select(sector, [p, p, t, v, v], q)
+    return np.stack([r, g, b], axis=-1)
+
+
+def rgb_to_hls(rgb: np.ndarray, dtype=None) -> np.ndarray:
+    rgb = as_float(rgb, dtype)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    mx = rgb.max(axis=-1)
+    mn = rgb.min(axis=-1)
+    d = mx - mn
+    l = (mn + mx) / 2.0
+    h = _hue(r, g, b, mx, d)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(d == 0, 0.0, np.where(l <= 0.5, d / (mx + mn), d / (2.0 - mx - mn)))
+    return np.stack([h, l, s], axis=-1).astype(rgb.dtype, copy=False)
+
+
+def _hls_value(m1, m2, hue):
+    # The same as colors.convert._v
+    hue = hue % 1.0
+    return np.select(
+        [hue < 1 / 6, hue < 0.5, hue < 2 / 3],
+        [m1 + (m2 - m1) * hue * 6.0, m2, m1 + (m2 - m1) * (2 / 3 - hue) * 6.0],
+        m1,
+    )
+
+
+def hls_to_rgb(hls: np.ndarray, dtype=None) -> np.ndarray:
+    hls = as_float(hls, dtype)
+    h, l, s = hls[..., 0], hls[..., 1], hls[..., 2]
+    m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - l * s)
+    m1 = 2.0 * l - m2
+    rgb = np.stack([_hls_value(m1, m2, h + 1 / 3), _hls_value(m1, m2, h), _hls_value(m1, m2, h - 1 / 3)], axis=-1)
+    return np.where((s == 0)[..., None], l[..., None], rgb)
+
+
+# --- Lab -----------------------------------------------------------
+RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+XYZ_TO_RGB = np.array([
+    [3.2404542, -1.5371385, -0.4985314],
+    [-0.9692660, 1.8760108, 0.0415560],
+    [0.0556434, -0.2040259, 1.0572252],
+])
+D65_WHITE = np.array([0.95047, 1.00000, 1.08883])
+
+
+def _lab_f(t):
+    return np.where(t > (6/29) ** 3, np.cbrt(t), (t / (3 * (6/29) ** 2)) + (4/29))
+
+
+def _lab_f_inv(t):
+    return np.where(t > 6/29, t ** 3, 3 * (6/29) ** 2 * (t - 4/29))
+
+
+def rgb_to_lab(rgb: np.ndarray, dtype=None) -> np.ndarray:
+    rgb = as_float(rgb, dtype)
+    xyz = _matmul(rgb, RGB_TO_XYZ) / D65_WHITE.astype(rgb.dtype)
+    f = _lab_f(xyz)
+    fx, fy, fz = f[..., 0], f[..., 1], f[..., 2]
+    return np.stack([116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)], axis=-1)
+
+
+def lab_to_rgb(lab: np.ndarray, dtype=None) -> np.ndarray:
+    lab = as_float(lab, dtype)
+    fy = (lab[..., 0] + 16) / 116
+    f = np.stack([lab[..., 1] / 500 + fy, fy, fy - lab[..., 2] / 200], axis=-1)
+    xyz = _lab_f_inv(f) * D65_WHITE.astype(lab.dtype)
+    return _clip01(_matmul(xyz, XYZ_TO_RGB))
+
+
+# --- Oklab ---------------------------------------------------------
+RGB_TO_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+LMS_TO_OKLAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+OKLAB_TO_LMS = np.array([
+    [1.0, 0.3963377774, 0.2158037573],
+    [1.0, -0.1055613458, -0.0638541728],
+    [1.0, -0.0894841775, -1.2914855480],
+])
+LMS_TO_RGB = np.array([
+    [4.0767416621, -3.3077115913, 0.2309699292],
+    [-1.2684380046, 2.6097574011, -0.3413193965],
+    [-0.0041960863, -0.7034186147, 1.7076147010],
+])
+
+
+def rgb_to_oklab(rgb: np.ndarray, dtype=None) -> np.ndarray:
+    # Linear RGB to Oklab; float32 is about twice as fast
+    return _matmul(np.cbrt(_matmul(as_float(rgb, dtype), RGB_TO_LMS)), LMS_TO_OKLAB)
+
+
+def oklab_to_rgb(lab: np.ndarray, dtype=None) -> np.ndarray:
+    return _clip01(_matmul(_matmul(as_float(lab, dtype), OKLAB_TO_LMS) ** 3, LMS_TO_RGB))
+
+
+def srgb8_to_oklab(rgb8: np.ndarray, dtype=np.float32) -> np.ndarray:
+    # The fast path for bulk work: 8-bit display sRGB to Oklab, without a power function
+    return rgb_to_oklab(srgb8_to_linear(rgb8, dtype))
+
+
+# --- CAM16-UCS -----------------------------------------------------
+# The same viewing conditions as colors.convert
+RGB_TO_CAM16 = np.array(CAM16_M16) @ (RGB_TO_XYZ * 100) * np.array(CAM16_D_RGB)[:, None]
+CAM16_TO_RGB = np.linalg.inv(RGB_TO_CAM16)
+
+
+def _cam16_adapt(v):
+    p = (CAM16_FL * np.abs(v) / 100) ** 0.42
+    return np.copysign(400 * p / (p + 27.13), v) + 0.1
+
+
+def _cam16_unadapt(v):
+    v = v - 0.1
+    return np.copysign(100 / CAM16_FL * (27.13 * np.abs(v) / (400 - np.abs(v))) ** (1 / 0.42), v)
+
+
+def rgb_to_cam16ucs(rgb: np.ndarray, dtype=None) -> np.ndarray:
+    adapted = _cam16_adapt(_matmul(as_float(rgb, dtype), RGB_TO_CAM16))
+    ra, ga, ba = adapted[..., 0], adapted[..., 1], adapted[..., 2]
+    a = ra - 12 * ga / 11 + ba / 11
+    b = (ra + ga - 2 * ba) / 9
+    h = np.arctan2(b, a)
+    et = 0.25 * (np.cos(h + 2) + 3.8)
+    achromatic = (2 * ra + ga + 0.05 * ba - 0.305) * CAM16_NBB
+    j = 100 * np.maximum(0.0, achromatic / CAM16_AW) ** (CAM16_C * CAM16_Z)
+    t = (50000 / 13 * CAM16_NC * CAM16_NBB * et * np.hypot(a, b)) / (ra + ga + 21 / 20 * ba)
+    chroma = t ** 0.9 * np.sqrt(j / 100) * (1.64 - 0.29 ** CAM16_N) ** 0.73
+    colorfulness = chroma * CAM16_FL ** 0.25
+    jp = 1.7 * j / (1 + 0.007 * j)
+    mp = np.log1p(0.0228 * colorfulness) / 0.0228
+    return np.stack([jp, mp * np.cos(h), mp * np.sin(h)], axis=-1)
+
+
+def cam16ucs_to_rgb(ucs: np.ndarray, dtype=None) -> np.ndarray:
+    # The same steps as colors.convert._cam16ucs_to_rgb
+    ucs = as_float(ucs, dtype)
+    jp, ap, bp = ucs[..., 0], ucs[..., 1], ucs[..., 2]
+    j = jp / (1.7 - 0.007 * jp)
+    colorfulness = np.expm1(0.0228 * np.hypot(ap, bp)) / 0.0228
+    h = np.arctan2(bp, ap)
+    chroma = colorfulness / CAM16_FL ** 0.25
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(j > 0, (chroma / (np.sqrt(j / 100) * (1.64 - 0.29 ** CAM16_N) ** 0.73)) ** (1 / 0.9), 0.0)
+    et = 0.25 * (np.cos(h + 2) + 3.8)
+    achromatic = CAM16_AW * (j / 100) ** (1 / (CAM16_C * CAM16_Z))
+
+    p2 = achromatic / CAM16_NBB + 0.305
+    p3 = 21 / 20
+    sin_h, cos_h = np.sin(h), np.cos(h)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p1 = 50000 / 13 * CAM16_NC * CAM16_NBB * et / t
+        b_sin = p2 * (2 + p3) * (460 / 1403) / (
+            p1 / sin_h + (2 + p3) * (220 / 1403) * (cos_h / sin_h) - 27 / 1403 + p3 * (6300 / 1403))
+        a_cos = p2 * (2 + p3) * (460 / 1403) / (
+            p1 / cos_h + (2 + p3) * (220 / 1403) - (27 / 1403 - p3 * (6300 / 1403)) * (sin_h / cos_h))
+        use_sin = np.abs(sin_h) >= np.abs(cos_h)
+        a = np.where(use_sin, b_sin * cos_h / sin_h, a_cos)
+        b = np.where(use_sin, b_sin, a_cos * sin_h / cos_h)
+    a = np.where(t == 0, 0.0, a)
+    b = np.where(t == 0, 0.0, b)
+    adapted = np.stack([
+        (460 * p2 + 451 * a + 288 * b) / 1403,
+        (460 * p2 - 891 * a - 261 * b) / 1403,
+        (460 * p2 - 220 * a - 6300 * b) / 1403,
+    ], axis=-1)
+    return _clip01(_matmul(_cam16_unadapt(adapted), CAM16_TO_RGB))
+
+
+# --- Distances -----------------------------------------------------
+def _euclidean(a, b, dtype=None):
+    a = as_float(a, dtype)
+    b = as_float(b, a.dtype)
+    d = a - b
+    return np.sqrt((d * d).sum(axis=-1))
+
+
+def euclidean_distance(a: np.ndarray, b: np.ndarray, dtype=None) -> np.ndarray:
+    # RGB, normalized to 0..1
+    return _euclidean(a, b, dtype) / SQRT3
+
+
+def yiq_distance(a: np.ndarray, b: np.ndarray, dtype=None) -> np.ndarray:
+    return _euclidean(a, b, dtype) / 1.875
+
+
+def cylindrical_distance(a: np.ndarray, b: np.ndarray, dtype=None) -> np.ndarray:
+    # HSV, HLS: the hue wraps around
+    a = as_float(a, dtype)
+    b = as_float(b, a.dtype)
+    dh = np.abs(a[..., 0] - b[..., 0])
+    dh = np.minimum(dh, 1.0 - dh)
+    d = np.sqrt(dh ** 2 + (a[..., 1] - b[..., 1]) ** 2 + (a[..., 2] - b[..., 2]) ** 2)
+    return d / 1.5
+
+
+def delta_e76(a: np.ndarray, b: np.ndarray, dtype=None) -> np.ndarray:
+    return _euclidean(a, b, dtype)
+
+
+def lab76_distance(a: np.ndarray, b: np.ndarray, dtype=None) -> np.ndarray:
+    return np.minimum(delta_e76(a, b, dtype) / 258.0, 1.0)
+
+
+def delta_e2000(lab1: np.ndarray, lab2: np.ndarray,
+                kL: float = 1.0, kC: float = 1.0, kH: float = 1.0, dtype=None) -> np.ndarray:
+    # The same formula as Lab2k._calc_distance; kL, kC, kH are the parametric factors
+    lab1 = as_float(lab1, dtype)
+    lab2 = as_float(lab2, lab1.dtype)
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(a2, b2)
+    avg_C = (C1 + C2) / 2.0
+    avg_C7 = avg_C ** 7
+
+    G = 1 - 0.5 * avg_C7 / (avg_C7 + 25 ** 7)
+    a1p = (1 + G) * a1
+    a2p = (1 + G) * a2
+    C1p = np.hypot(a1p, b1)
+    C2p = np.hypot(a2p, b2)
+
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    delta_Lp = L2 - L1
+    delta_Cp = C2p - C1p
+
+    achromatic = C1p * C2p == 0
+    dhp = h2p - h1p
+    dhp = np.where(dhp > 180, dhp - 360, np.where(dhp < -180, dhp + 360, dhp))
+    dhp = np.where(achromatic, 0.0, dhp)
+    delta_Hp = 2 * np.sqrt(C1p * C2p) * np.sin(np.radians(dhp) / 2)
+
+    avg_Lp = (L1 + L2) / 2.0
+    avg_Cp = (C1p + C2p) / 2.0
+    sum_hp = h1p + h2p
+    avg_hp = np.where(
+        achromatic, sum_hp,
+        np.where(np.abs(h1p - h2p) <= 180, sum_hp / 2.0,
+                 np.where(sum_hp < 360, (sum_hp + 360) / 2.0, (sum_hp - 360) / 2.0)),
+    )
+    T = (1
+         - 0.17 * np.cos(np.radians(avg_hp - 30))
+         + 0.24 * np.cos(np.radians(2 * avg_hp))
+         + 0.32 * np.cos(np.radians(3 * avg_hp + 6))
+         - 0.20 * np.cos(np.radians(4 * avg_hp - 63)))
+    delta_ro = 30 * np.exp(-((avg_hp - 275) / 25) ** 2)
+    avg_Cp7 = avg_Cp ** 7
+    RC = 2 * np.sqrt(avg_Cp7 / (avg_Cp7 + 25 ** 7))
+    SL = kL * (1 + (0.015 * (avg_Lp - 50) ** 2) / np.sqrt(20 + (avg_Lp - 50) ** 2))
+    SC = kC * (1 + 0.045 * avg_Cp)
+    SH = kH * (1 + 0.015 * avg_Cp * T)
+    RT = -np.sin(np.radians(2 * delta_ro)) * RC
+    return np.sqrt(
+        (delta_Lp / SL) ** 2 +
+        (delta_Cp / SC) ** 2 +
+        (delta_Hp / SH) ** 2 +
+        RT * (delta_Cp / SC) * (delta_Hp / SH)
+    )
+
+
+def lab2k_distance(a: np.ndarray, b: np.ndarray,
+                   kL: float = 1.0, kC: float = 1.0, kH: float = 1.0, dtype=None) -> np.ndarray:
+    return np.minimum(delta_e2000(a, b, kL, kC, kH, dtype) / 128.0, 1.0)
+
+
+def delta_e94(lab1: np.ndarray, lab2: np.ndarray,
+              kL: float = 1.0, K1: float = 0.045, K2: float = 0.015, dtype=None) -> np.ndarray:
+    # The same formula as Lab94.distance_not_normalized, lab1 is the reference
+    lab1 = as_float(lab1, dtype)
+    lab2 = as_float(lab2, lab1.dtype)
+    C1 = np.hypot(lab1[..., 1], lab1[..., 2])
+    C2 = np.hypot(lab2[..., 1], lab2[..., 2])
+    d = lab1 - lab2
+    dC = C1 - C2
+    dH2 = np.maximum(0.0, d[..., 1] ** 2 + d[..., 2] ** 2 - dC ** 2)
+    SC = 1 + K1 * C1
+    SH = 1 + K2 * C1
+    return np.sqrt((d[..., 0] / kL) ** 2 + (dC / SC) ** 2 + dH2 / SH ** 2)
+
+
+def lab94_distance(a: np.ndarray, b: np.ndarray, dtype=None) -> np.ndarray:
+    return np.minimum(delta_e94(a, b, dtype=dtype) / LAB94_MAX, 1.0)
+
+
+def delta_e_cmc(lab1: np.ndarray, lab2: np.ndarray, l: float = 2.0, c: float = 1.0, dtype=None) -> np.ndarray:
+    # The same formula as LabCMC.distance_not_normalized, lab1 is the reference
+    lab1 = as_float(lab1, dtype)
+    lab2 = as_float(lab2, lab1.dtype)
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(lab2[..., 1], lab2[..., 2])
+    d = lab1 - lab2
+    dC = C1 - C2
+    dH2 = np.maximum(0.0, d[..., 1] ** 2 + d[..., 2] ** 2 - dC ** 2)
+
+    h1 = np.degrees(np.arctan2(b1, a1)) % 360
+    T = np.where(
+        (164 <= h1) & (h1 <= 345),
+        0.56 + np.abs(0.2 * np.cos(np.radians(h1 + 168))),
+        0.36 + np.abs(0.4 * np.cos(np.radians(h1 + 35))),
+    )
+    C14 = C1 ** 4
+    F = np.sqrt(C14 / (C14 + 1900))
+    SL = np.where(L1 < 16, 0.511, 0.040975 * L1 / (1 + 0.01765 * L1))
+    SC = 0.0638 * C1 / (1 + 0.0131 * C1) + 0.638
+    SH = SC * (F * T + 1 - F)
+    return np.sqrt((d[..., 0] / (l * SL)) ** 2 + (dC / (c * SC)) ** 2 + dH2 / SH ** 2)
+
+
+def labcmc_distance(a: np.ndarray, b: np.ndarray, dtype=None) -> np.ndarray:
+    return np.minimum(delta_e_cmc(a, b, dtype=dtype) / LABCMC_MAX, 1.0)
+
+
+def oklab_distance(a: np.ndarray, b: np.ndarray, dtype=None) -> np.ndarray:
+    return np.minimum(_euclidean(a, b, dtype) / OKLAB_MAX, 1.0)
+
+
+def cam16ucs_distance(a: np.ndarray, b: np.ndarray, dtype=None) -> np.ndarray:
+    return np.minimum(_euclidean(a, b, dtype) / CAM16UCS_MAX, 1.0)
@@ -0,0 +1,127 @@
+"""
+Bulk input and output of 8-bit colors.
+
+parse_hex_array() decodes many "#RRGGBB" strings at once into a uint8 array (colors, 3),
+to_hex_array() is the reverse; both without a Python call per color component.
+
+Packed colors are 0xRRGGBB integers, uint32 arrays (4 bytes per color) or Python ints
+(see RGB.from_packed, RGB.to_packed); they compare in the same order as (r, g, b) tuples.
+A pair of packed colors makes one uint64 key, the smaller color in the high half,
+so that the key does not depend on the order of the colors.
+"""
+import numpy as np
+
+
+# ASCII code -> value of the hex digit, 255 for the other characters
+_HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+for _i, _c in enumerate(b'0123456789abcdef'):
+    _HEX_VALUES[_c] = _i
+    _HEX_VALUES[ord(chr(_c).upper())] = _i
+_HEX_DIGITS = np.frombuffer(b'0123456789ABCDEF', dtype=np.uint8)
+
+
+def parse_hex_array(colors) -> np.ndarray:
+    """
+    8-bit RGB of colors in #RRGGBB format (or RRGGBB, the same for all).
+
+    colors: a sequence of strings, or bytes of the colors separated by newlines
+    Returns a uint8 array (colors, 3); raises ValueError for malformed colors.
+    """
+    if isinstance(colors, (bytes, bytearray, memoryview)):
+        buffer = bytes(colors).replace(b'\r', b'').rstrip(b'\n')
+    else:
+        try:
+            buffer = '\n'.join(colors).encode('ascii')
+        except UnicodeEncodeError:
+            buffer = None
+    if not buffer:
+        # None for non-ASCII strings; [''] joins to nothing too, but it is one malformed color
+        if buffer is None or not isinstance(colors, (bytes, bytearray, memoryview)) and len(colors):
+            _raise_malformed(colors)
+        return np.zeros((0, 3), dtype=np.uint8)
+
+    width = 7 if buffer[:1] == b'#' else 6
+    chars = np.frombuffer(buffer + b'\n', dtype=np.uint8)
+    if len(chars) % (width + 1):
+        _raise_malformed(colors)
+    chars = chars.reshape(-1, width + 1)
+    digits = _HEX_VALUES[chars[:, width - 6:width]]
+    valid = (chars[:, width] == ord('\n')) & (digits != 255).all(axis=1)
+    if width == 7:
+        valid &= chars[:, 0] == ord('#')
+    if not valid.all():
+        _raise_malformed(colors)
+    return (digits[:, 0::2] << 4) | digits[:, 1::2]
+
+
+def _raise_malformed(colors):
+    # Find the first malformed color for the message
+    if isinstance(colors, (bytes, bytearray, memoryview)):
+        colors = bytes(colors).decode('ascii', errors='replace').replace('\r', '').rstrip('\n').split('\n')
+    colors = list(colors)
+    width = 7 if colors and colors[0][:1] == '#' else 6
+    for i, color in enumerate(colors):
+        text = color[1:] if width == 7 and color[:1] == '#' else color
+        if len(color) != width or len(text) != 6 or not all(c in '0123456789abcdefABCDEF' for c in text):
+            raise ValueError(f"Malformed color #{i}: {color!r}, expected {'#' * (width == 7)}RRGGBB")
+    raise ValueError("Malformed colors")
+
+
+def to_hex_array(rgb8, prefix: str = '#') -> list[str]:
+    """
+    Colors in #RRGGBB format (upper case, as RGB.to_hex) of 8-bit RGB, array (colors, 3).
+    """
+    rgb8 = np.asarray(rgb8)
+    if rgb8.dtype != np.uint8:
+        if rgb8.size and (rgb8.min() < 0 or rgb8.max() > 255):
+            raise ValueError("8-bit values must be in [0..255]")
+        rgb8 = rgb8.astype(np.uint8)
+    rgb8 = rgb8.reshape(-1, 3)
+    head = np.frombuffer(prefix.encode('ascii'), dtype=np.uint8)
+    chars = np.empty((len(rgb8), len(head) + 6), dtype=np.uint8)
+    chars[:, :len(head)] = head
+    chars[:, len(head)::2] = _HEX_DIGITS[rgb8 >> 4]
+    chars[:, len(head) + 1::2] = _HEX_DIGITS[rgb8 & 15]
+    text = chars.tobytes().decode('ascii')
+    width = chars.shape[1]
+    return [text[i:i + width] for i in range(0, len(text), width)]
+
+
+def pack_rgb8(rgb8) -> np.ndarray:
+    """
+    Packed 0xRRGGBB colors, uint32 array (...), of 8-bit RGB (..., 3).
+    """
+    rgb8 = np.asarray(rgb8)
+    if rgb8.dtype != np.uint8 and rgb8.size and (rgb8.min() < 0 or rgb8.max() > 255):
+        raise ValueError("8-bit values must be in [0..255]")
+    rgb8 = rgb8.astype(np.uint32)
+    return (rgb8[..., 0] << 16) | (rgb8[..., 1] << 8) | rgb8[..., 2]
+
+
+def unpack_rgb8(packed) -> np.ndarray:
+    """
+    8-bit RGB, uint8 array (..., 3), of packed 0xRRGGBB colors (...).
+    """
+    packed = np.asarray(packed)
+    if packed.dtype != np.uint32 and packed.size and (packed.min() < 0 or packed.max() > 0xFFFFFF):
+        raise ValueError("Packed colors must be in [0..0xFFFFFF]")
+    # The big-endian bytes are 0, R, G, B
+    big_endian = np.ascontiguousarray(packed, dtype='>u4')
+    return big_endian.view(np.uint8).reshape(packed.shape + (4,))[..., 1:]
+
+
+def pack_pairs(packed_a, packed_b) -> np.ndarray:
+    """
+    Order-independent uint64 keys of pairs of packed colors.
+    """
+    a = np.asarray(packed_a, dtype=np.uint64)
+    b = np.asarray(packed_b, dtype=np.uint64)
+    return (np.minimum(a, b) << np.uint64(32)) | np.maximum(a, b)
+
+
+def unpack_pairs(keys) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The packed colors of pair keys, uint32 arrays, the smaller first.
+    """
+    keys = np.asarray(keys, dtype=np.uint64)
+    return (keys >> np.uint64(32)).astype(np.uint32), (keys & np.uint64(0xFFFFFFFF)).astype(np.uint32)
@@ -0,0 +1,328 @@
+"""
+Command-line interface to the analysis and generation scripts.
+
+  python -m colors analysis results/ratings.tsv --bootstrap 500 --workers 4 --format json
+  python -m colors sweeps --passes 10000000 --batch-size 1000000 --workers 4
+  python -m colors gen-random --target 0.7 --tolerance 0.01 --count 5 --format csv
+  python -m colors gen-cards --html cards.html
+  python -m colors gen-cards-to-check --format json
+
+The constants of the scripts (stat.py, distance_range.py, gen-random.py,
+gen-cards.py, gen-cards-to-check.py) are options here; `--format json` or `csv`
+writes machine-readable results to stdout (or --output), the progress and the
+diagnostics of the scripts go to stderr.  Sweeps and the random search run on the
+batch kernels of the registered metrics, in batches of --batch-size pairs.
+"""
+import argparse
+import contextlib
+import csv
+import importlib.util
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+from .bulk import to_hex_array
+from .image import map_tiles
+from .metrics import all_distances, get_metric, registered_metrics
+from .preview import PAGE_SIZE, write_preview
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORMATS = ('text', 'json', 'csv')
+BATCH_SIZE = 100_000
+
+
+def load_script(filename: str):
+    """
+    A top-level script of the repository (the names have hyphens) as a module.
+    """
+    path = os.path.join(ROOT, filename)
+    name = os.path.splitext(filename)[0].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _metric_names(text: str) -> list[str]:
+    if not text:
+        return [metric.name for metric in registered_metrics()]
+    names = [name.strip() for name in text.split(',') if name.strip()]
+    for name in names:
+        get_metric(name)
+    return names
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"not a positive integer: {text}")
+    return value
+
+
+def _non_negative_int(text: str) -> int:
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"not a non-negative integer: {text}")
+    return value
+
+
+def _random_rgbd(seed_sequence, n: int, bits8: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed_sequence)
+    if bits8:
+        values = rng.integers(0, 256, (2, n, 3)) / 255.0
+    else:
+        values = rng.random((2, n, 3))
+    return values[0], values[1]
+
+
+def _batch_seeds(seed: int, n: int, batch_size: int) -> list:
+    # One seed per batch: the results do not depend on the number of workers
+    return np.random.SeedSequence(seed).spawn(max(1, math.ceil(n / batch_size)))
+
+
+# Commands: each returns (result for JSON, rows for CSV, lines for text)
+
+def analysis(args) -> tuple:
+    from study.bootstrap import format_report
+    from study.evaluation import format_table
+
+    stat = load_script('stat.py')
+    workers = stat.BOOTSTRAP_WORKERS if args.workers is None else args.workers or os.cpu_count() or 1
+    report = stat.analyze(
+        input_file=args.input or stat.INPUT_FILE,
+        n_bootstrap=stat.N_BOOTSTRAP if args.bootstrap is None else args.bootstrap,
+        workers=workers,
+        bootstrap_metrics=_metric_names(args.metrics) if args.metrics else stat.BOOTSTRAP_METRICS,
+        fit_metrics=[name for name in args.fit.split(',') if name] if args.fit is not None else stat.FIT_METRICS,
+    )
+    rows = []
+    for row in report['correlations']:
+        row = dict(row)
+        ci = report['bootstrap']['metrics'].get(row['name']) if report['bootstrap'] else None
+        for kind in ('pearson', 'spearman'):
+            row[f'{kind}_lo'], row[f'{kind}_hi'] = ci[kind][1:] if ci else ('', '')
+        rows.append(row)
+
+    lines = [f"{report['n_ratings']} trusted ratings of {report['n_pairs']} pairs in {report['input_file']}"]
+    lines += format_table(report['correlations'])
+    if report['bootstrap'] is not None:
+        labels = {name: get_metric(name).label for name in report['bootstrap']['metrics']}
+        lines += [''] + format_report(report['bootstrap'], labels)
+    for fit in report['fits']:
+        params = ', '.join(f"{k}={v:.3g}" for k, v in fit['params'].items())
+        test, base = fit['cv']['test'], fit['cv']['base']
+        lines.append(f"{fit['label']:13s} | {params}, loss={fit['loss']:.4f}, {fit['cv']['folds']}-fold CV"
+                     f" RMSE {test['rmse']:.3f} (base {base['rmse']:.3f}), Spearman ρ {test['spearman']:.3f}"
+                     f" (base {base['spearman']:.3f})")
+
+    if report['bootstrap'] is not None:
+        # JSON objects have string keys
+        report['bootstrap']['differences'] = {
+            f"{a} - {b}": value for (a, b), value in report['bootstrap']['differences'].items()
+        }
+    return report, rows, lines
+
+
+def sweep_stats(passes: int, names: list[str], batch_size: int = BATCH_SIZE, workers: int = 1, seed: int = 0) -> dict:
+    """
+    Statistics of the distances of `passes` random display sRGB pairs by the `names` metrics:
+    {name: {'min', 'max', 'mean', 'std', 'skew', 'excess_kurtosis'}}.
+    """
+    if passes < 1:
+        raise ValueError(f"No random pairs to sweep: {passes}")
+    seeds = _batch_seeds(seed, passes, batch_size)
+
+    def work(tile):
+        a, b = _random_rgbd(seeds[tile.start // batch_size], tile.stop - tile.start)
+        result = {}
+        for name, d in all_distances(a, b, names).items():
+            # Power sums merge over the batches
+            result[name] = (d.min(), d.max(), [np.sum(d ** k) for k in range(1, 5)])
+        return result
+
+    parts = map_tiles(work, passes, batch_size, workers or None)
+    stats = {}
+    for name in names:
+        sums = np.sum([part[name][2] for part in parts], axis=0) / passes
+        mean = sums[0]
+        var = max(sums[1] - mean ** 2, 0.0)
+        m3 = sums[2] - 3 * mean * sums[1] + 2 * mean ** 3
+        m4 = sums[3] - 4 * mean * sums[2] + 6 * mean ** 2 * sums[1] - 3 * mean ** 4
+        std = math.sqrt(var)
+        stats[name] = {
+            'min': float(min(part[name][0] for part in parts)),
+            'max': float(max(part[name][1] for part in parts)),
+            'mean': float(mean),
+            'std': std,
+            'skew': float(m3 / std ** 3) if std else 0.0,
+            'excess_kurtosis': float(m4 / var ** 2 - 3) if var else 0.0,
+        }
+    return stats
+
+
+def sweeps(args) -> tuple:
+    names = _metric_names(args.metrics)
+    stats = sweep_stats(args.passes, names, args.batch_size, args.workers, args.seed)
+    result = {'passes': args.passes, 'seed': args.seed, 'metrics': stats}
+    rows = [{'name': name, 'label': get_metric(name).label, **s} for name, s in stats.items()]
+    lines = [
+        f"{row['label']:13s} | Min: {row['min']:.3f}, Max: {row['max']:.3f}, Mean: {row['mean']:.3f},"
+        f" StdDev: {row['std']:.3f}, Skew: {row['skew']:.3f}, ExcessKurtosis: {row['excess_kurtosis']:.3f}"
+        for row in rows
+    ]
+    return result, rows, [f"{args.passes} random pairs"] + lines
+
+
+def random_pairs(target: float, tolerance: float, metric: str = 'lab76-d', count: int = 1,
+                 max_iter: int = 1_000_000, batch_size: int = BATCH_SIZE, workers: int = 1, seed: int = 0) -> dict:
+    """
+    Random pairs of 8-bit colors at the distance `target` ± `tolerance` by `metric`.
+    Returns {'pairs': [(hex a, hex b, distance, try number)], 'tries'}; fewer than
+    `count` pairs if `max_iter` random pairs have not found them.
+    """
+    seeds = _batch_seeds(seed, max_iter, batch_size)
+    workers = workers or os.cpu_count() or 1
+    found = []
+    tries = 0
+    # Search `workers` batches at a time, in order
+    for start in range(0, max_iter, batch_size * workers):
+        stop = min(start + batch_size * workers, max_iter)
+
+        def work(tile):
+            a, b = _random_rgbd(seeds[tile.start // batch_size], tile.stop - tile.start, bits8=True)
+            d = get_metric(metric).pair_distances(a, b)
+            hits = np.flatnonzero(np.abs(d - target) <= tolerance)
+            return tile.start, a[hits], b[hits], d[hits], hits
+
+        for offset, a, b, d, hits in map_tiles(lambda tile: work(slice(start + tile.start, start + tile.stop)),
+                                               stop - start, batch_size, workers):
+            hex_a = to_hex_array(np.rint(a * 255))
+            hex_b = to_hex_array(np.rint(b * 255))
+            for i in range(len(hits)):
+                if len(found) < count:
+                    found.append((hex_a[i], hex_b[i], float(d[i]), int(offset + hits[i] + 1)))
+        tries = stop
+        if len(found) >= count:
+            tries = found[-1][3]
+            break
+    return {'pairs': found, 'tries': tries}
+
+
+def gen_random(args) -> tuple:
+    get_metric(args.metric)
+    result = random_pairs(args.target, args.tolerance, args.metric, args.count,
+                          args.max_iter, args.batch_size, args.workers, args.seed)
+    result.update(metric=args.metric, target=args.target, tolerance=args.tolerance, seed=args.seed)
+    rows = [{'a': a, 'b': b, 'distance': d, 'try': n} for a, b, d, n in result['pairs']]
+    lines = [f"Found {len(rows)} of {args.count} pairs after {result['tries']} tries"]
+    lines += [f"{row['a']} {row['b']}  distance {row['distance']:.4f}" for row in rows]
+    return result, rows, lines
+
+
+def _cards(filename: str):
+    def command(args) -> tuple:
+        script = load_script(filename)
+        cards = script.card_pairs()
+        names = _metric_names(args.metrics)
+        a = np.array([color.components() for color, _ in cards])
+        b = np.array([color.components() for _, color in cards])
+        distances = all_distances(a, b, names)
+        rows = []
+        for i, (color_a, color_b) in enumerate(cards):
+            row = {'a': color_a.to_hex(), 'b': color_b.to_hex()}
+            row.update((name, float(distances[name][i])) for name in names)
+            rows.append(row)
+        if args.html:
+            write_preview(args.html, [(row['a'], row['b']) for row in rows], names, args.page_size)
+        lines = [f"Total cards: {len(rows)}"]
+        lines += [f"{row['a']} {row['b']}  " + ' '.join(f"{name}={row[name]:.3f}" for name in names) for row in rows]
+        return {'metrics': names, 'pairs': rows}, rows, lines
+    return command
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Not serializable: {type(value).__name__}")
+
+
+def write_output(stream, fmt: str, result, rows: list[dict], lines: list[str]):
+    if fmt == 'json':
+        json.dump(result, stream, indent=2, ensure_ascii=False, default=_json_default)
+        stream.write('\n')
+    elif fmt == 'csv':
+        fields = list(dict.fromkeys(key for row in rows for key in row))
+        writer = csv.DictWriter(stream, fieldnames=fields, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for line in lines:
+            stream.write(line + '\n')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m colors', description='Color distance analysis and generation')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add(name, func, help, batch=False):
+        sub = commands.add_parser(name, help=help, description=help)
+        sub.set_defaults(func=func)
+        sub.add_argument('--format', choices=FORMATS, default='text', help='output format (default %(default)s)')
+        sub.add_argument('--output', '-o', metavar='PATH', help='write the output to a file instead of stdout')
+        if batch:
+            sub.add_argument('--workers', type=_non_negative_int, default=1,
+                             help='threads; 0 for one per CPU (default %(default)s)')
+            sub.add_argument('--batch-size', type=_positive_int, default=BATCH_SIZE,
+                             help='color pairs per batch (default %(default)s)')
+            sub.add_argument('--seed', type=int, default=0, help='random seed (default %(default)s)')
+        return sub
+
+    stat = add('analysis', analysis, 'correlations of the metrics with human ratings (stat.py)')
+    stat.add_argument('input', nargs='?', help='ratings log (default: INPUT_FILE of stat.py)')
+    stat.add_argument('--bootstrap', type=_non_negative_int, metavar='N',
+                      help='bootstrap replicates, 0 to skip (default: stat.py)')
+    stat.add_argument('--workers', type=_non_negative_int,
+                      help='bootstrap processes; 0 for one per CPU (default: stat.py)')
+    stat.add_argument('--metrics', help='comma-separated metrics to bootstrap (default: those of stat.py)')
+    stat.add_argument('--fit', help='comma-separated parametric metrics to fit, empty to skip')
+
+    sweep = add('sweeps', sweeps, 'distance statistics of random color pairs (distance_range.py)', batch=True)
+    sweep.add_argument('--passes', type=_positive_int, default=100_000, help='random pairs (default %(default)s)')
+    sweep.add_argument('--metrics', help='comma-separated metrics (default: all registered)')
+
+    rand = add('gen-random', gen_random, 'random pairs at a given distance (gen-random.py)', batch=True)
+    rand.add_argument('--target', type=float, default=0.7, help='distance (default %(default)s)')
+    rand.add_argument('--tolerance', type=float, default=0.01, help='(default %(default)s)')
+    rand.add_argument('--metric', default='lab76-d', help='registered metric (default %(default)s)')
+    rand.add_argument('--count', type=_positive_int, default=1, help='pairs to find (default %(default)s)')
+    rand.add_argument('--max-iter', type=_positive_int, default=1_000_000, help='random pairs to try (default %(default)s)')
+
+    for name, filename in (('gen-cards', 'gen-cards.py'), ('gen-cards-to-check', 'gen-cards-to-check.py')):
+        cards = add(name, _cards(filename), f'the predefined card pairs with their distances ({filename})')
+        cards.add_argument('--metrics', help='comma-separated metrics (default: all registered)')
+        cards.add_argument('--html', metavar='PATH', help='also write the preview pages')
+        cards.add_argument('--page-size', type=_positive_int, default=PAGE_SIZE, help='pairs per page (default %(default)s)')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        # The scripts print their progress and diagnostics: stdout is for the results
+        with contextlib.redirect_stdout(sys.stderr):
+            result, rows, lines = args.func(args)
+    except (KeyError, ValueError, OSError) as e:
+        print(f"error: {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        return 2
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            write_output(f, args.format, result, rows, lines)
+    else:
+        write_output(sys.stdout, args.format, result, rows, lines)
+    return 0
@@ -1,4 +1,8 @@
-from .models import RGB, RGBDisplay, RGBLinear, YIQ, HSV, HLS, Lab, Lab76, Lab2k
+import collections
+import functools
+import math
+
+from .models import AbstractColor, RGB, RGBDisplay, RGBLinear, YIQ, HSV, HLS, Lab, Lab76, Lab2k, Lab94, LabCMC, Oklab, CAM16UCS
 
 # --- RGB -----------------------------------------------------------
 def _srgb_to_linear(c: float) -> float:
@@ -17,14 +21,14 @@ def rgbd_to_rgbl(rgb: RGBDisplay) -> RGBLinear:
     r_lin = _srgb_to_linear(rgb.r)
     g_lin = _srgb_to_linear(rgb.g)
     b_lin = _srgb_to_linear(rgb.b)
-    return RGBLinear(r_lin, g_lin, b_lin)
+    return RGBLinear._trusted(r_lin, g_lin, b_lin)
 
 
 def rgbl_to_rgbd(rgb: RGBLinear) -> RGBDisplay:
     r_srgb = _linear_to_srgb(rgb.r)
     g_srgb = _linear_to_srgb(rgb.g)
     b_srgb = _linear_to_srgb(rgb.b)
-    return RGBDisplay(r_srgb, g_srgb, b_srgb)
+    return RGBDisplay._trusted(r_srgb, g_srgb, b_srgb)
 
 
 # --- YIQ -----------------------------------------------------------
@@ -33,7 +37,7 @@ def rgb_to_yiq(rgb: RGB) -> YIQ:
     y = 0.299 * r + 0.587 * g + 0.114 * b
     i = 0.596 * r - 0.274 * g - 0.322 * b
     q = 0.211 * r - 0.523 * g + 0.312 * b
-    return YIQ(y, i, q)
+    return YIQ._trusted(y, i, q)
 
 
 def _yiq_to_rgb(yiq: YIQ) -> tuple[float, float, float]:
@@ -48,11 +52,11 @@ def _yiq_to_rgb(yiq: YIQ) -> tuple[float, float, float]:
 
 
 def yiq_to_rgbd(yiq: YIQ) -> RGBDisplay:
-    return RGBDisplay(*_yiq_to_rgb(yiq))
+    return RGBDisplay._trusted(*_yiq_to_rgb(yiq))
 
 
 def yiq_to_rgbl(yiq: YIQ) -> RGBLinear:
-    return RGBLinear(*_yiq_to_rgb(yiq))
+    return RGBLinear._trusted(*_yiq_to_rgb(yiq))
 
 
 # --- HSV -----------------------------------------------------------
@@ -73,7 +77,7 @@ def rgb_to_hsv(rgb: RGB) -> HSV:
     # S
     s = 0.0 if mx == 0 else d / mx
     v = mx
-    return HSV(h, s, v)
+    return HSV._trusted(h, s, v)
 
 
 def _hsv_to_rgb(hsv: HSV) -> tuple[float, float, float]:
@@ -99,11 +103,11 @@ def _hsv_to_rgb(hsv: HSV) -> tuple[float, float, float]:
 
 
 def hsv_to_rgbd(hsv: HSV) -> RGBDisplay:
-    return RGBDisplay(*_hsv_to_rgb(hsv))
+    return RGBDisplay._trusted(*_hsv_to_rgb(hsv))
 
 
 def hsv_to_rgbl(hsv: HSV) -> RGBLinear:
-    return RGBLinear(*_hsv_to_rgb(hsv))
+    return RGBLinear._trusted(*_hsv_to_rgb(hsv))
 
 
 # --- HLS -----------------------------------------------------------
@@ -128,7 +132,7 @@ def rgb_to_hls(rgb: RGB) -> HLS:
     mx, mn = max(r, g, b), min(r, g, b)
     l = (mn + mx) / 2.0
     if mn == mx:
-        return HLS(0.0, l, 0.0)
+        return HLS._trusted(0.0, l, 0.0)
     if l <= 0.5:
         s = (mx - mn) / (mx + mn)
     else:
@@ -142,7 +146,7 @@ def rgb_to_hls(rgb: RGB) -> HLS:
     else:
         h = (r - g) / d + 4.0
     h = (h / 6.0) % 1.0
-    return HLS(h, l, s)
+    return HLS._trusted(h, l, s)
 
 
 def _hls_to_rgb(hls: HLS) -> tuple[float, float, float]:
@@ -162,11 +166,11 @@ def _hls_to_rgb(hls: HLS) -> tuple[float, float, float]:
 
 
 def hls_to_rgbd(hls: HLS) -> RGBDisplay:
-    return RGBDisplay(*_hls_to_rgb(hls))
+    return RGBDisplay._trusted(*_hls_to_rgb(hls))
 
 
 def hls_to_rgbl(hls: HLS) -> RGBLinear:
-    return RGBLinear(*_hls_to_rgb(hls))
+    return RGBLinear._trusted(*_hls_to_rgb(hls))
 
 
 # --- Lab -----------------------------------------------------------
@@ -231,16 +235,358 @@ def rgb_to_lab2k(rgb: RGB) -> Lab2k:
 
 
 def lab76_to_rgbd(lab: Lab76) -> RGBDisplay:
-    return RGBDisplay(*_lab_to_rgb(lab))
+    return RGBDisplay._trusted(*_lab_to_rgb(lab))
 
 
 def lab76_to_rgbl(lab: Lab76) -> RGBLinear:
-    return RGBLinear(*_lab_to_rgb(lab))
+    return RGBLinear._trusted(*_lab_to_rgb(lab))
 
 
 def lab2k_to_rgbd(lab: Lab2k) -> RGBDisplay:
-    return RGBDisplay(*_lab_to_rgb(lab))
+    return RGBDisplay._trusted(*_lab_to_rgb(lab))
 
 
 def lab2k_to_rgbl(lab: Lab2k) -> RGBLinear:
-    return RGBLinear(*_lab_to_rgb(lab))
+    return RGBLinear._trusted(*_lab_to_rgb(lab))
+
+
+def rgb_to_lab94(rgb: RGB) -> Lab94:
+    return Lab94(*_rgb_to_lab(rgb))
+
+
+def rgb_to_labcmc(rgb: RGB) -> LabCMC:
+    return LabCMC(*_rgb_to_lab(rgb))
+
+
+def lab94_to_rgbd(lab: Lab94) -> RGBDisplay:
+    return RGBDisplay._trusted(*_lab_to_rgb(lab))
+
+
+def lab94_to_rgbl(lab: Lab94) -> RGBLinear:
+    return RGBLinear._trusted(*_lab_to_rgb(lab))
+
+
+def labcmc_to_rgbd(lab: LabCMC) -> RGBDisplay:
+    return RGBDisplay._trusted(*_lab_to_rgb(lab))
+
+
+def labcmc_to_rgbl(lab: LabCMC) -> RGBLinear:
+    return RGBLinear._trusted(*_lab_to_rgb(lab))
+
+
+# --- Oklab ---------------------------------------------------------
+# See https://bottosson.github.io/posts/oklab/
+def _cbrt(t: float) -> float:
+    return t ** (1/3) if t >= 0 else -((-t) ** (1/3))
+
+
+def _rgb_to_oklab(rgb: RGB) -> tuple[float, float, float]:
+    r, g, b = rgb.r, rgb.g, rgb.b
+
+    # Linear RGB to LMS cone responses, then cube root
+    l = _cbrt(0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b)
+    m = _cbrt(0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b)
+    s = _cbrt(0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b)
+
+    return (
+        0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+        1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+        0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s,
+    )
+
+
+def _oklab_to_rgb(lab: Oklab) -> tuple[float, float, float]:
+    L, a, b = lab.l, lab.a, lab.b
+
+    l = (L + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (L - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (L - 0.0894841775 * a - 1.2914855480 * b) ** 3
+
+    r = 4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s
+    g = -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s
+    b = -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s
+
+    r = max(0.0, min(1.0, r))
+    g = max(0.0, min(1.0, g))
+    b = max(0.0, min(1.0, b))
+
+    return r, g, b
+
+
+def rgb_to_oklab(rgb: RGB) -> Oklab:
+    return Oklab(*_rgb_to_oklab(rgb))
+
+
+def oklab_to_rgbd(lab: Oklab) -> RGBDisplay:
+    return RGBDisplay._trusted(*_oklab_to_rgb(lab))
+
+
+def oklab_to_rgbl(lab: Oklab) -> RGBLinear:
+    return RGBLinear._trusted(*_oklab_to_rgb(lab))
+
+
+# --- CAM16-UCS -----------------------------------------------------
+# CAM16 (Li et al., 2017) with the uniform color space of Luo et al., 2006.
+# Viewing conditions of sRGB: D65 white, adapting luminance 64/pi * 0.2 cd/m2,
+# background Y_b = 20, average surround.
+CAM16_M16 = (
+    (0.401288, 0.650173, -0.051461),
+    (-0.250268, 1.204414, 0.045854),
+    (-0.002079, 0.048952, 0.953127),
+)
+CAM16_M16_INV = (
+    (1.8620678551, -1.0112546305, 0.1491867754),
+    (0.3875265432, 0.6214474419, -0.0089739852),
+    (-0.0158414988, -0.0341229380, 1.0499644369),
+)
+
+
+def _cam16_viewing_conditions():
+    xw, yw, zw = 95.047, 100.0, 108.883
+    la = 64 / math.pi * 0.2
+    yb = 20.0
+    f, c, nc = 1.0, 0.69, 1.0
+
+    rgb_w = [row[0] * xw + row[1] * yw + row[2] * zw for row in CAM16_M16]
+    d = min(1.0, max(0.0, f * (1 - (1 / 3.6) * math.exp((-la - 42) / 92))))
+    d_rgb = [d * yw / v + 1 - d for v in rgb_w]
+    k = 1 / (5 * la + 1)
+    fl = 0.2 * k ** 4 * (5 * la) + 0.1 * (1 - k ** 4) ** 2 * (5 * la) ** (1/3)
+    n = yb / yw
+    z = 1.48 + math.sqrt(n)
+    nbb = 0.725 * n ** -0.2
+    rgb_aw = [_cam16_adapt(fl, dr * v) for dr, v in zip(d_rgb, rgb_w)]
+    aw = (2 * rgb_aw[0] + rgb_aw[1] + 0.05 * rgb_aw[2] - 0.305) * nbb
+    return d_rgb, fl, n, z, nbb, aw, c, nc
+
+
+def _cam16_adapt(fl: float, v: float) -> float:
+    # Post-adaptation nonlinear compression
+    p = (fl * abs(v) / 100) ** 0.42
+    return math.copysign(400 * p / (p + 27.13), v) + 0.1
+
+
+def _cam16_unadapt(fl: float, v: float) -> float:
+    v -= 0.1
+    return math.copysign(100 / fl * (27.13 * abs(v) / (400 - abs(v))) ** (1 / 0.42), v)
+
+
+CAM16_D_RGB, CAM16_FL, CAM16_N, CAM16_Z, CAM16_NBB, CAM16_AW, CAM16_C, CAM16_NC = _cam16_viewing_conditions()
+
+
+def _rgb_to_cam16ucs(rgb: RGB) -> tuple[float, float, float]:
+    r, g, b = rgb.r, rgb.g, rgb.b
+
+    # Linear RGB to XYZ (Y in 0..100), then to the CAM16 sharpened space
+    x = (r * 0.4124564 + g * 0.3575761 + b * 0.1804375) * 100
+    y = (r * 0.2126729 + g * 0.7151522 + b * 0.0721750) * 100
+    z = (r * 0.0193339 + g * 0.1191920 + b * 0.9503041) * 100
+    ra, ga, ba = (
+        _cam16_adapt(CAM16_FL, dr * (row[0] * x + row[1] * y + row[2] * z))
+        for dr, row in zip(CAM16_D_RGB, CAM16_M16)
+    )
+
+    # Opponent dimensions, hue, lightness J, colorfulness M
+    a = ra - 12 * ga / 11 + ba / 11
+    b = (ra + ga - 2 * ba) / 9
+    h = math.atan2(b, a)
+    et = 0.25 * (math.cos(h + 2) + 3.8)
+    achromatic = (2 * ra + ga + 0.05 * ba - 0.305) * CAM16_NBB
+    j = 100 * max(0.0, achromatic / CAM16_AW) ** (CAM16_C * CAM16_Z)
+    t = (50000 / 13 * CAM16_NC * CAM16_NBB * et * math.hypot(a, b)) / (ra + ga + 21 / 20 * ba)
+    chroma = t ** 0.9 * math.sqrt(j / 100) * (1.64 - 0.29 ** CAM16_N) ** 0.73
+    colorfulness = chroma * CAM16_FL ** 0.25
+
+    # Uniform color space
+    jp = 1.7 * j / (1 + 0.007 * j)
+    mp = math.log(1 + 0.0228 * colorfulness) / 0.0228
+    return jp, mp * math.cos(h), mp * math.sin(h)
+
+
+def _cam16ucs_to_rgb(ucs: CAM16UCS) -> tuple[float, float, float]:
+    jp, ap, bp = ucs.j, ucs.a, ucs.b
+
+    j = jp / (1.7 - 0.007 * jp)
+    colorfulness = (math.exp(0.0228 * math.hypot(ap, bp)) - 1) / 0.0228
+    h = math.atan2(bp, ap)
+    chroma = colorfulness / CAM16_FL ** 0.25
+    if j > 0:
+        t = (chroma / (math.sqrt(j / 100) * (1.64 - 0.29 ** CAM16_N) ** 0.73)) ** (1 / 0.9)
+    else:
+        t = 0.0
+    et = 0.25 * (math.cos(h + 2) + 3.8)
+    achromatic = CAM16_AW * (j / 100) ** (1 / (CAM16_C * CAM16_Z))
+
+    # Opponent dimensions back from t, see CIECAM02 inverse model
+    p2 = achromatic / CAM16_NBB + 0.305
+    p3 = 21 / 20
+    if t == 0:
+        a = b = 0.0
+    else:
+        p1 = 50000 / 13 * CAM16_NC * CAM16_NBB * et / t
+        sin_h, cos_h = math.sin(h), math.cos(h)
+        if abs(sin_h) >= abs(cos_h):
+            p4 = p1 / sin_h
+            b = p2 * (2 + p3) * (460 / 1403) / (
+                p4 + (2 + p3) * (220 / 1403) * (cos_h / sin_h) - 27 / 1403 + p3 * (6300 / 1403))
+            a = b * cos_h / sin_h
+        else:
+            p5 = p1 / cos_h
+            a = p2 * (2 + p3) * (460 / 1403) / (
+                p5 + (2 + p3) * (220 / 1403) - (27 / 1403 - p3 * (6300 / 1403)) * (sin_h / cos_h))
+            b = a * sin_h / cos_h
+    ra = (460 * p2 + 451 * a + 288 * b) / 1403
+    ga = (460 * p2 - 891 * a - 261 * b) / 1403
+    ba = (460 * p2 - 220 * a - 6300 * b) / 1403
+
+    # Sharpened space to XYZ, then to linear RGB
+    rc, gc, bc = (_cam16_unadapt(CAM16_FL, v) / dr for v, dr in zip((ra, ga, ba), CAM16_D_RGB))
+    x, y, z = (row[0] * rc + row[1] * gc + row[2] * bc for row in CAM16_M16_INV)
+    x /= 100
+    y /= 100
+    z /= 100
+    r = x *  3.2404542 + y * -1.5371385 + z * -0.4985314
+    g = x * -0.9692660 + y *  1.8760108 + z *  0.0415560
+    b = x *  0.0556434 + y * -0.2040259 + z *  1.0572252
+
+    r = max(0.0, min(1.0, r))
+    g = max(0.0, min(1.0, g))
+    b = max(0.0, min(1.0, b))
+
+    return r, g, b
+
+
+def rgb_to_cam16ucs(rgb: RGB) -> CAM16UCS:
+    return CAM16UCS(*_rgb_to_cam16ucs(rgb))
+
+
+def cam16ucs_to_rgbd(ucs: CAM16UCS) -> RGBDisplay:
+    return RGBDisplay._trusted(*_cam16ucs_to_rgb(ucs))
+
+
+def cam16ucs_to_rgbl(ucs: CAM16UCS) -> RGBLinear:
+    return RGBLinear._trusted(*_cam16ucs_to_rgb(ucs))
+
+
+# --- Conversion graph ----------------------------------------------
+@functools.lru_cache(maxsize=None)
+def _relabel(model):
+    # The same components in another model of the family, like Lab76 -> Lab2k
+    def relabel(color):
+        return model(*color.components())
+    relabel.__name__ = relabel.__qualname__ = f"to_{model.__name__.lower()}"
+    return relabel
+
+
+_LAB_FAMILY = (Lab, Lab76, Lab2k, Lab94, LabCMC)
+
+# (source model, target model) -> conversion of a color.  All the models are
+# connected through linear RGB, as in stat.py and colors.image.  The functions of
+# this module are looked up by name when a path is built, see _step.
+EDGES = {
+    (RGBDisplay, RGBLinear): rgbd_to_rgbl,
+    (RGBLinear, RGBDisplay): rgbl_to_rgbd,
+    (RGBLinear, YIQ): rgb_to_yiq,
+    (YIQ, RGBLinear): yiq_to_rgbl,
+    (RGBLinear, HSV): rgb_to_hsv,
+    (HSV, RGBLinear): hsv_to_rgbl,
+    (RGBLinear, HLS): rgb_to_hls,
+    (HLS, RGBLinear): hls_to_rgbl,
+    (RGBLinear, Lab76): rgb_to_lab76,
+    (Lab76, RGBLinear): lab76_to_rgbl,
+    (RGBLinear, Lab2k): rgb_to_lab2k,
+    (Lab2k, RGBLinear): lab2k_to_rgbl,
+    (RGBLinear, Lab94): rgb_to_lab94,
+    (Lab94, RGBLinear): lab94_to_rgbl,
+    (RGBLinear, LabCMC): rgb_to_labcmc,
+    (LabCMC, RGBLinear): labcmc_to_rgbl,
+    (RGBLinear, Oklab): rgb_to_oklab,
+    (Oklab, RGBLinear): oklab_to_rgbl,
+    (RGBLinear, CAM16UCS): rgb_to_cam16ucs,
+    (CAM16UCS, RGBLinear): cam16ucs_to_rgbl,
+    **{(a, b): _relabel(b) for a in _LAB_FAMILY for b in _LAB_FAMILY if a is not b},
+}
+_NEIGHBOURS = collections.defaultdict(list)
+for _a, _b in EDGES:
+    _NEIGHBOURS[_a].append(_b)
+
+
+def _step(func):
+    # The function of this module bound to the name of `func` now, as colors.profiling
+    # replaces them, or `func` itself for the relabelings
+    return globals().get(func.__name__, func)
+
+
+def _node(model):
+    # Subclasses, like Lab2kTextiles, convert as their nearest base in the graph
+    for cls in model.__mro__:
+        if cls in _NEIGHBOURS:
+            return cls
+    raise ValueError(f"Unsupported color model: {model.__name__}")
+
+
+@functools.lru_cache(maxsize=None)
+def conversion_path(source, target) -> tuple:
+    """
+    The conversions of a color of the `source` model to the `target` one, in order,
+    along a shortest path of EDGES.
+    """
+    start, end = _node(source), _node(target)
+    previous = {start: None}
+    queue = collections.deque([start])
+    while queue and end not in previous:
+        node = queue.popleft()
+        for neighbour in _NEIGHBOURS[node]:
+            if neighbour not in previous:
+                previous[neighbour] = node
+                queue.append(neighbour)
+    if end not in previous:
+        raise ValueError(f"No conversion from {source.__name__} to {target.__name__}")
+    path = []
+    node = end
+    while previous[node] is not None:
+        path.append(_step(EDGES[previous[node], node]))
+        node = previous[node]
+    path.reverse()
+    if target is not end or (not path and source is not target):
+        path.append(_relabel(target))
+    return tuple(path)
+
+
+@functools.lru_cache(maxsize=None)
+def converter(source, target):
+    """
+    The conversion of a color of the `source` model to the `target` one, as one
+    function; cached per pair of models.
+    """
+    steps = conversion_path(source, target)
+    if not steps:
+        return lambda color: color
+    if len(steps) == 1:
+        return steps[0]
+    if len(steps) == 2:
+        first, second = steps
+        return lambda color: second(first(color))
+
+    def composed(color):
+        for step in steps:
+            color = step(color)
+        return color
+    return composed
+
+
+def convert(color, to, source=RGBDisplay, dtype=None):
+    """
+    Convert a color to the `to` model, like convert(hsv, to=Lab2k).
+
+    color: a color object, or an array (..., 3) of colors of the `source` model
+    (uint8 or packed uint32 0xRRGGBB for 8-bit RGB), converted by colors.image.convert_image
+    with the batch kernels composed per pair of models, without objects per color.
+    dtype: of the result for arrays, np.float64 by default
+    """
+    if isinstance(color, AbstractColor):
+        return converter(type(color), to)(color)
+    from .image import convert_image  # NumPy only for arrays
+    if dtype is None:
+        return convert_image(color, to, source=source)
+    return convert_image(color, to, source=source, dtype=dtype)
@@ -0,0 +1,193 @@
+"""
+Conversion of whole images between the color models.
+
+Images are arrays (H, W, 3), or any (..., 3): uint8 8-bit RGB, or floats in the
+component ranges of the model classes; or packed uint32 0xRRGGBB arrays (H, W).
+Pixels are processed in tiles of at most `tile_pixels`, which bounds the memory
+of the intermediate arrays, and optionally by a pool of threads: the NumPy
+kernels release the GIL.
+All models but RGBDisplay are reached through linear RGB, as in stat.py.
+delta_e_map() compares two images pixel by pixel, the same way.
+"""
+import concurrent.futures
+import functools
+import os
+
+import numpy as np
+
+from . import batch
+from .bulk import unpack_rgb8
+from .models import RGB, RGBDisplay, RGBLinear, YIQ, HSV, HLS, Lab, Lab76, Lab2k, Lab94, LabCMC, Oklab, CAM16UCS
+
+
+TILE_PIXELS = 1 << 18  # 6 MB per float64 (..., 3) array
+
+# Model -> (batch conversion from linear RGB, batch conversion to linear RGB); subclasses share them
+KERNELS = {
+    RGBDisplay: (batch.linear_to_srgb, batch.srgb_to_linear),
+    RGBLinear: (None, None),
+    YIQ: (batch.rgb_to_yiq, batch.yiq_to_rgb),
+    HSV: (batch.rgb_to_hsv, batch.hsv_to_rgb),
+    HLS: (batch.rgb_to_hls, batch.hls_to_rgb),
+    Lab: (batch.rgb_to_lab, batch.lab_to_rgb),
+    Oklab: (batch.rgb_to_oklab, batch.oklab_to_rgb),
+    CAM16UCS: (batch.rgb_to_cam16ucs, batch.cam16ucs_to_rgb),
+}
+
+
+def _kernels(model) -> tuple:
+    for cls in model.__mro__:
+        if cls in KERNELS:
+            return KERNELS[cls]
+    raise ValueError(f"Unsupported color model: {model.__name__}")
+
+
+def conversion_steps(source, target) -> list:
+    """
+    Batch functions converting arrays of the `source` model to the `target` one, in order.
+    """
+    if _kernels(source) is _kernels(target):
+        return []
+    return [step for step in (_kernels(source)[1], _kernels(target)[0]) if step is not None]
+
+
+@functools.lru_cache(maxsize=None)
+def converter(source, target):
+    """
+    The conversion of arrays (..., 3) of the `source` model to the `target` one,
+    f(values, dtype=np.float64): the batch kernels of conversion_steps composed, cached per pair of models.
+    uint8 input is 8-bit RGB, linearized by a lookup table.
+    """
+    steps = conversion_steps(source, target)
+
+    def convert(values: np.ndarray, dtype=np.float64) -> np.ndarray:
+        return _convert_pixels(values, steps, dtype)
+
+    convert.__qualname__ = f"converter({source.__name__}, {target.__name__})"
+    return convert
+
+
+def tiles(n_pixels: int, tile_pixels: int = TILE_PIXELS) -> list[slice]:
+    return [slice(start, min(start + tile_pixels, n_pixels)) for start in range(0, n_pixels, tile_pixels)]
+
+
+def map_tiles(func, n_pixels: int, tile_pixels: int = TILE_PIXELS, workers: int = 1) -> list:
+    """
+    func(tile) for the tiles of n_pixels, by a pool of `workers` threads (None: one per CPU).
+    Returns the results in the order of the tiles.
+    """
+    slices = tiles(n_pixels, tile_pixels)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(slices) <= 1:
+        return [func(tile) for tile in slices]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, slices))
+
+
+def to_uint8(image) -> np.ndarray:
+    # RGB in [0..1] to 8-bit
+    return np.rint(np.clip(image, 0.0, 1.0) * 255).astype(np.uint8)
+
+
+def convert_image(image, to, source=RGBDisplay, dtype=np.float64,
+                  tile_pixels: int = TILE_PIXELS, workers: int = 1) -> np.ndarray:
+    """
+    Convert an image of the `source` model to the `to` model.
+
+    image: array (..., 3); uint8, or packed uint32 0xRRGGBB (...), only for the RGB models
+    to, source: color classes, like Lab2k or RGBDisplay
+    dtype: np.float64 or np.float32, of the computation and of the result
+    Returns an array (..., 3).
+    """
+    image = _check_image(image, source)
+
+    convert = converter(source, to)
+    pixels = image.reshape(-1, 3)
+    out = np.empty(pixels.shape, dtype=dtype)
+
+    def work(tile):
+        out[tile] = convert(pixels[tile], dtype)
+
+    map_tiles(work, len(pixels), tile_pixels, workers)
+    return out.reshape(image.shape)
+
+
+def _check_image(image, source) -> np.ndarray:
+    image = np.asarray(image)
+    if image.dtype == np.uint32:
+        image = unpack_rgb8(image)
+    if image.shape[-1:] != (3,):
+        raise ValueError(f"Expected an array of shape (..., 3), got {image.shape}")
+    if image.dtype == np.uint8 and not issubclass(source, RGB):
+        raise ValueError(f"8-bit images must be RGB, not {source.__name__}")
+    return image
+
+
+def _convert_pixels(values: np.ndarray, steps: list, dtype) -> np.ndarray:
+    if values.dtype == np.uint8 and steps[:1] == [batch.srgb_to_linear]:
+        values = batch.srgb8_to_linear(values, dtype)
+        steps = steps[1:]
+    elif values.dtype == np.uint8:
+        values = values.astype(dtype) / 255
+    else:
+        values = values.astype(dtype, copy=False)
+    for step in steps:
+        values = step(values)
+    return values
+
+
+# Metric -> (model, batch color difference, just noticeable difference) of delta_e_map
+DELTA_E = {
+    'lab76': (Lab76, batch.delta_e76, 2.3),
+    'lab2k': (Lab2k, batch.delta_e2000, 1.0),
+    'lab94': (Lab94, batch.delta_e94, 1.0),
+    'cmc': (LabCMC, batch.delta_e_cmc, 1.0),
+    'oklab': (Oklab, batch.delta_e76, 0.02),  # Euclidean, as ΔE76
+    'cam16': (CAM16UCS, batch.delta_e76, 1.0),
+}
+
+
+def delta_e_map(image_a, image_b, metric: str = 'lab2k', threshold: float = None, source=RGBDisplay,
+                dtype=np.float64, tile_pixels: int = TILE_PIXELS, workers: int = 1) -> tuple[np.ndarray, dict]:
+    """
+    Per-pixel color difference of two images of the same shape.
+
+    metric: a key of DELTA_E; the differences are not normalized (ΔE units)
+    threshold: the just noticeable difference, by default the one of the metric
+    Returns the (H, W) map of the differences, and {'mean', 'p95', 'max',
+    'above': the fraction of pixels over the threshold, 'threshold'}.
+    """
+    if metric not in DELTA_E:
+        raise ValueError(f"Unknown metric: {metric}, one of {', '.join(DELTA_E)}")
+    model, distance, jnd = DELTA_E[metric]
+    threshold = jnd if threshold is None else threshold
+    image_a = _check_image(image_a, source)
+    image_b = _check_image(image_b, source)
+    if image_a.shape != image_b.shape:
+        raise ValueError(f"Images differ in shape: {image_a.shape} and {image_b.shape}")
+
+    convert = converter(source, model)
+    pixels_a = image_a.reshape(-1, 3)
+    pixels_b = image_b.reshape(-1, 3)
+    out = np.empty(len(pixels_a), dtype=dtype)
+
+    def work(tile):
+        a = convert(pixels_a[tile], dtype)
+        b = convert(pixels_b[tile], dtype)
+        out[tile] = distance(a, b)
+
+    map_tiles(work, len(out), tile_pixels, workers)
+    return out.reshape(image_a.shape[:-1]), summarize(out, threshold)
+
+
+def summarize(differences: np.ndarray, threshold: float) -> dict:
+    if not differences.size:
+        return {'mean': 0.0, 'p95': 0.0, 'max': 0.0, 'above': 0.0, 'threshold': threshold}
+    return {
+        'mean': float(differences.mean()),
+        'p95': float(np.percentile(differences, 95)),
+        'max': float(differences.max()),
+        'above': float(np.mean(differences > threshold)),
+        'threshold': threshold,
+    }
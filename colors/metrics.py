@@ -0,0 +1,111 @@
+"""
+Registry of color distance metrics.
+
+Every metric declares how to get from display sRGB (components in [0..1]) to its
+color model, as a path of batch conversion steps, and a batch distance function.
+all_distances() runs every metric over arrays of color pairs, converting each
+shared prefix of the paths only once.
+"""
+import functools
+
+import numpy as np
+
+from . import batch
+from .models import RGBDisplay, RGBLinear, YIQ, HSV, HLS, Lab76, Lab2k, Lab2kTextiles, Lab94, LabCMC, Oklab, CAM16UCS
+
+
+class Metric:
+    """
+    A color distance metric.
+    name: short identifier, label: human-readable name,
+    path: batch conversion steps from display sRGB, distance: batch distance function,
+    model: the color class whose `distance` the metric reproduces.
+    """
+    def __init__(self, name: str, label: str, path, distance, model=None):
+        self.name = name
+        self.label = label
+        self.path = tuple(path)
+        self.distance = distance
+        self.model = model
+
+    def convert(self, rgbd: np.ndarray, dtype=None) -> np.ndarray:
+        values = batch.as_float(rgbd, dtype)
+        for step in self.path:
+            values = step(values)
+        return values
+
+    def pair_distances(self, rgbd_a: np.ndarray, rgbd_b: np.ndarray, dtype=None) -> np.ndarray:
+        a = self.convert(rgbd_a, dtype)
+        return self.distance(a, self.convert(rgbd_b, a.dtype))
+
+    def __repr__(self) -> str:
+        return f"Metric({self.name!r})"
+
+
+_REGISTRY = {}
+
+
+def register_metric(metric: Metric) -> Metric:
+    if metric.name in _REGISTRY:
+        raise ValueError(f"Metric already registered: {metric.name}")
+    _REGISTRY[metric.name] = metric
+    return metric
+
+
+def get_metric(name: str) -> Metric:
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"Unknown metric: {name}") from None
+
+
+def registered_metrics() -> list[Metric]:
+    return list(_REGISTRY.values())
+
+
+def all_distances(rgbd_a: np.ndarray, rgbd_b: np.ndarray, names=None, dtype=None) -> dict[str, np.ndarray]:
+    """
+    Distances of color pairs by every registered metric (or by the `names` ones).
+    rgbd_a, rgbd_b: display sRGB arrays of shape (..., 3).
+    dtype: np.float64 or np.float32, the precision of all conversions and distances;
+        by default float32 arrays stay float32, anything else is float64.
+    """
+    metrics = registered_metrics() if names is None else [get_metric(name) for name in names]
+    a = batch.as_float(rgbd_a, dtype)
+    cache = {(): (a, batch.as_float(rgbd_b, a.dtype))}
+
+    def converted(path):
+        if path not in cache:
+            a, b = converted(path[:-1])
+            step = path[-1]
+            cache[path] = (step(a), step(b))
+        return cache[path]
+
+    result = {}
+    for metric in metrics:
+        a, b = converted(metric.path)
+        result[metric.name] = metric.distance(a, b)
+    return result
+
+
+# Linear variants convert display sRGB to linear light first, as stat.py does
+_LINEAR = (batch.srgb_to_linear,)
+
+register_metric(Metric('rgbd', 'RGBD', (), batch.euclidean_distance, RGBDisplay))
+register_metric(Metric('rgbl', 'RGBL', _LINEAR, batch.euclidean_distance, RGBLinear))
+register_metric(Metric('yiq', 'YIQ', _LINEAR + (batch.rgb_to_yiq,), batch.yiq_distance, YIQ))
+register_metric(Metric('yiq-d', 'YIQ-D', (batch.rgb_to_yiq,), batch.yiq_distance, YIQ))
+register_metric(Metric('hsv', 'HSV', _LINEAR + (batch.rgb_to_hsv,), batch.cylindrical_distance, HSV))
+register_metric(Metric('hsv-d', 'HSV-D', (batch.rgb_to_hsv,), batch.cylindrical_distance, HSV))
+register_metric(Metric('hls', 'HLS', _LINEAR + (batch.rgb_to_hls,), batch.cylindrical_distance, HLS))
+register_metric(Metric('hls-d', 'HLS-D', (batch.rgb_to_hls,), batch.cylindrical_distance, HLS))
+register_metric(Metric('lab76', 'Lab ΔE76', _LINEAR + (batch.rgb_to_lab,), batch.lab76_distance, Lab76))
+register_metric(Metric('lab76-d', 'Lab ΔE76-D', (batch.rgb_to_lab,), batch.lab76_distance, Lab76))
+register_metric(Metric('lab2k', 'Lab ΔE2000', _LINEAR + (batch.rgb_to_lab,), batch.lab2k_distance, Lab2k))
+register_metric(Metric('lab2k-d', 'Lab ΔE2000-D', (batch.rgb_to_lab,), batch.lab2k_distance, Lab2k))
+register_metric(Metric('lab2k-t', 'Lab ΔE2000-T', _LINEAR + (batch.rgb_to_lab,),
+                       functools.partial(batch.lab2k_distance, kL=Lab2kTextiles.kL), Lab2kTextiles))
+register_metric(Metric('lab94', 'Lab ΔE94', _LINEAR + (batch.rgb_to_lab,), batch.lab94_distance, Lab94))
+register_metric(Metric('cmc', 'Lab CMC 2:1', _LINEAR + (batch.rgb_to_lab,), batch.labcmc_distance, LabCMC))
+register_metric(Metric('oklab', 'Oklab', _LINEAR + (batch.rgb_to_oklab,), batch.oklab_distance, Oklab))
+register_metric(Metric('cam16', 'CAM16-UCS', _LINEAR + (batch.rgb_to_cam16ucs,), batch.cam16ucs_distance, CAM16UCS))
@@ -7,11 +7,40 @@ def check01(value: float) -> float:
     return value
 
 
+# Range checks of the public constructors, see set_validation
+_validation = True
+
+
+def set_validation(enabled: bool) -> bool:
+    """
+    Turn the range checks of the color constructors off, for hot loops over values
+    known to be valid, or back on (the default).  Returns the previous setting.
+    """
+    global _validation
+    previous = _validation
+    _validation = bool(enabled)
+    return previous
+
+
+def validation_enabled() -> bool:
+    return _validation
+
+
 # Tolerance for "almost equal" comparisons
 DEFAULT_TOLERANCE = 1 / 512.0
 
 # Precomputed constants
 SQRT3 = math.sqrt(3.0)
+POW25_7 = 25 ** 7
+RAD_6 = math.radians(6)
+RAD_30 = math.radians(30)
+RAD_63 = math.radians(63)
+
+# Normalization of the distances to 0..1, maximum over the RGB cube rounded up
+LAB94_MAX = 150.0  # max ~ 149.96, white vs blue
+LABCMC_MAX = 213.0  # max ~ 212.1, black vs blue
+OKLAB_MAX = 1.0  # max ~ 1.0, black vs white
+CAM16UCS_MAX = 105.6  # max ~ 105.55, dark blue #000020 vs yellow
 
 
 class AbstractColor:
@@ -94,13 +123,26 @@ class RGB(CubeModel):
     RGB, components in [0..1].
     """
     def __init__(self, r: float, g: float, b: float):
-        self.r = check01(r)
-        self.g = check01(g)
-        self.b = check01(b)
+        if _validation:
+            check01(r)
+            check01(g)
+            check01(b)
+        self.r = r
+        self.g = g
+        self.b = b
 
     def components(self) -> tuple:
         return self.r, self.g, self.b
 
+    @classmethod
+    def _trusted(cls, r: float, g: float, b: float):
+        # Without the range checks, for results of the conversions of valid colors
+        color = object.__new__(cls)
+        color.r = r
+        color.g = g
+        color.b = b
+        return color
+
     @classmethod
     def from_8bit(cls, r: int, g: int, b: int) -> "RGB":
         return cls(r / 255.0, g / 255.0, b / 255.0)
@@ -116,6 +158,13 @@ class RGB(CubeModel):
         b = int(hex_str[4:6], 16)
         return cls.from_8bit(r, g, b)
 
+    @classmethod
+    def from_packed(cls, value: int) -> "RGB":
+        # 0xRRGGBB
+        if not 0 <= value <= 0xFFFFFF:
+            raise ValueError("Packed color must be in [0..0xFFFFFF], got: {}".format(value))
+        return cls.from_8bit(value >> 16, (value >> 8) & 255, value & 255)
+
     def to_8bit(self) -> tuple[int, int, int]:
         return int(self.r * 255), int(self.g * 255), int(self.b * 255)
 
@@ -123,6 +172,10 @@ class RGB(CubeModel):
         r, g, b = self.to_8bit()
         return f"#{r:02X}{g:02X}{b:02X}"
 
+    def to_packed(self) -> int:
+        r, g, b = self.to_8bit()
+        return (r << 16) | (g << 8) | b
+
     def distance(self, other: "RGB") -> float:
         if type(other) is not type(self):
             raise TypeError(f"Type mismatch: {type(self)} vs {type(other)}")
@@ -201,21 +254,32 @@ class YIQ(CubeModel):
     See https://en.wikipedia.org/wiki/YIQ
     """
     def __init__(self, y: float, i: float, q: float):
-        self.y = check01(y)
-        # if i < -0.5957 or i > 0.5957:
-        #     raise ValueError("I component must be in [-0.5957..0.5957], got: {}".format(i))
-        if i < -0.5961 or i > 0.5961:
-            raise ValueError("I component must be in [-0.5961..0.5961], got: {}".format(i))
-        # if q < -0.5226 or q > 0.5226:
-        #     raise ValueError("Q component must be in [-0.5226..0.5226], got: {}".format(q))
-        if q < -0.523 or q > 0.523:
-            raise ValueError("Q component must be in [-0.523..0.523], got: {}".format(q))
+        if _validation:
+            check01(y)
+            # if i < -0.5957 or i > 0.5957:
+            #     raise ValueError("I component must be in [-0.5957..0.5957], got: {}".format(i))
+            if i < -0.5961 or i > 0.5961:
+                raise ValueError("I component must be in [-0.5961..0.5961], got: {}".format(i))
+            # if q < -0.5226 or q > 0.5226:
+            #     raise ValueError("Q component must be in [-0.5226..0.5226], got: {}".format(q))
+            if q < -0.523 or q > 0.523:
+                raise ValueError("Q component must be in [-0.523..0.523], got: {}".format(q))
+        self.y = y
         self.i = i
         self.q = q
 
     def components(self) -> tuple:
         return self.y, self.i, self.q
 
+    @classmethod
+    def _trusted(cls, y: float, i: float, q: float):
+        # Without the range checks, for results of the conversions of valid colors
+        color = object.__new__(cls)
+        color.y = y
+        color.i = i
+        color.q = q
+        return color
+
     def distance(self, other: "YIQ") -> float:
         if type(other) is not type(self):
             raise TypeError(f"Type mismatch: {type(self)} vs {type(other)}")
@@ -238,13 +302,26 @@ class HSV(CylindricalModel):
     H: Hue, S: Saturation, V: Value (Brightness)
     """
     def __init__(self, h: float, s: float, v: float):
-        self.h = check01(h)
-        self.s = check01(s)
-        self.v = check01(v)
+        if _validation:
+            check01(h)
+            check01(s)
+            check01(v)
+        self.h = h
+        self.s = s
+        self.v = v
 
     def components(self) -> tuple:
         return self.h, self.s, self.v
 
+    @classmethod
+    def _trusted(cls, h: float, s: float, v: float):
+        # Without the range checks, for results of the conversions of valid colors
+        color = object.__new__(cls)
+        color.h = h
+        color.s = s
+        color.v = v
+        return color
+
     @classmethod
     def from_degrees(cls, h_deg: float, s: float, v: float) -> "HSV":
         """
@@ -279,13 +356,26 @@ class HLS(CylindricalModel):
     H: Hue, L: Luminance, S: Saturation
     """
     def __init__(self, h: float, l: float, s: float):
-        self.h = check01(h)
-        self.l = check01(l)
-        self.s = check01(s)
+        if _validation:
+            check01(h)
+            check01(l)
+            check01(s)
+        self.h = h
+        self.l = l
+        self.s = s
 
     def components(self) -> tuple:
         return self.h, self.l, self.s
 
+    @classmethod
+    def _trusted(cls, h: float, l: float, s: float):
+        # Without the range checks, for results of the conversions of valid colors
+        color = object.__new__(cls)
+        color.h = h
+        color.l = l
+        color.s = s
+        return color
+
     def distance(self, other: "HLS") -> float:
         if type(other) is not type(self):
             raise TypeError(f"Type mismatch: {type(self)} vs {type(other)}")
@@ -325,88 +415,275 @@ class Lab76(Lab):
         return check01(dn)
 
 
+def _ciede2000(L1: float, a1: float, b1: float, a1s: float, b1s: float, C1: float,
+               other, kL: float, kC: float, kH: float) -> float:
+    # ΔE2000 metric, with the terms of the first color (a*², b*², C*) given
+    # Implementation of the CIEDE2000 formula
+    # Reference: https://en.wikipedia.org/wiki/Color_difference#CIEDE2000
+    L2, a2, b2 = other.l, other.a, other.b
+    a2s = a2 * a2
+    b2s = b2 * b2
+    C2 = math.sqrt(a2s + b2s)
+
+    avg_C = (C1 + C2) / 2.0
+    avg_C7 = avg_C ** 7
+
+    G = 1 - 0.5 * avg_C7 / (avg_C7 + POW25_7)
+    G1 = (1 + G) * (1 + G)
+    a1p = (1 + G) * a1
+    a2p = (1 + G) * a2
+    C1p = math.sqrt(G1 * a1s + b1s)
+    C2p = math.sqrt(G1 * a2s + b2s)
+
+    h1p = math.degrees(math.atan2(b1, a1p)) % 360
+    h2p = math.degrees(math.atan2(b2, a2p)) % 360
+
+    delta_Lp = L2 - L1
+    delta_Cp = C2p - C1p
+
+    if C1p * C2p == 0:
+        delta_hp = 0.0
+    else:
+        dhp = h2p - h1p
+        if abs(dhp) <= 180:
+            delta_hp = dhp
+        elif dhp > 180:
+            delta_hp = dhp - 360
+        else:
+            delta_hp = dhp + 360
+
+    delta_Hp = 2 * math.sqrt(C1p * C2p) * math.sin(math.radians(delta_hp) / 2)
+    avg_Lp = (L1 + L2) / 2.0
+    avg_Cp = (C1p + C2p) / 2.0
+    if C1p * C2p == 0:
+        avg_hp = h1p + h2p
+    else:
+        dhp = abs(h1p - h2p)
+        if dhp <= 180:
+            avg_hp = (h1p + h2p) / 2.0
+        elif (h1p + h2p) < 360:
+            avg_hp = (h1p + h2p + 360) / 2.0
+        else:
+            avg_hp = (h1p + h2p - 360) / 2.0
+    hr = math.radians(avg_hp)
+    T = (1
+            - 0.17 * math.cos(hr - RAD_30)
+            + 0.24 * math.cos(2 * hr)
+            + 0.32 * math.cos(3 * hr + RAD_6)
+            - 0.20 * math.cos(4 * hr - RAD_63))
+    delta_ro = 30 * math.exp(-((avg_hp - 275) /
+                                25) ** 2)
+    avg_Cp7 = avg_Cp ** 7
+    RC = 2 * math.sqrt(avg_Cp7 / (avg_Cp7 + POW25_7))
+    dL50 = (avg_Lp - 50) * (avg_Lp - 50)
+    SL = kL * (1 + 0.015 * dL50 / math.sqrt(20 + dL50))
+    SC = kC * (1 + 0.045 * avg_Cp)
+    SH = kH * (1 + 0.015 * avg_Cp * T)
+    RT = -math.sin(math.radians(2 * delta_ro)) * RC
+    dL = delta_Lp / SL
+    dC = delta_Cp / SC
+    dH = delta_Hp / SH
+    delta_E = math.sqrt(dL * dL + dC * dC + dH * dH + RT * dC * dH)
+    return delta_E
+
+
 class Lab2k(Lab):
     """
     CIE L*a*b* color model with CIEDE2000 distance metric.
+    kL, kC, kH are the parametric factors of lightness, chroma and hue:
+    1, 1, 1 for graphic arts (default), see Lab2kTextiles.
     """
+    kL = 1.0
+    kC = 1.0
+    kH = 1.0
+
     def _calc_distance(self, other: "Lab2k") -> float:
-        # ΔE2000 metric
-        # Implementation of the CIEDE2000 formula
-        # Reference: https://en.wikipedia.org/wiki/Color_difference#CIEDE2000
+        a1s = self.a * self.a
+        b1s = self.b * self.b
+        return _ciede2000(self.l, self.a, self.b, a1s, b1s, math.sqrt(a1s + b1s), other, self.kL, self.kC, self.kH)
+
+    def distance_not_normalized(self, other: "Lab2k") -> float:
+        return self._calc_distance(other)
+
+    def distance(self, other: "Lab2k") -> float:
+        if type(other) is not type(self):
+            raise TypeError(f"Type mismatch: {type(self)} vs {type(other)}")
+
+        d = self._calc_distance(other)
+        dn = min(d / 128.0, 1.0)  # Normalize to 0..1, max ~ 128-129
+        return check01(dn)
+
+    def prepared(self) -> "PreparedLab2k":
+        # This color, fixed as it is now, for comparisons with many others
+        return PreparedLab2k(self)
+
+
+class PreparedLab2k:
+    """
+    A Lab2k color fixed for comparisons with many others of its class: the per-color terms
+    (a*², b*² and C*) are computed once, when it is built, and the components are read-only.
+    G, and so a', C' and h', depends on the mean chroma of both colors and stays pairwise.
+    """
+    __slots__ = ('color_type', 'l', 'a', 'b', '_terms')
+
+    def __init__(self, color: Lab2k):
+        a2 = color.a * color.a
+        b2 = color.b * color.b
+        for name, value in (('color_type', type(color)), ('l', color.l), ('a', color.a), ('b', color.b),
+                            ('_terms', (a2, b2, math.sqrt(a2 + b2)))):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.color_type.__name__}({self.l}, {self.a}, {self.b}))"
+
+    def distances_not_normalized(self, others) -> list[float]:
         L1, a1, b1 = self.l, self.a, self.b
-        L2, a2, b2 = other.l, other.a, other.b
+        a1s, b1s, C1 = self._terms
+        cls = self.color_type
+        kL, kC, kH = cls.kL, cls.kC, cls.kH
+        return [_ciede2000(L1, a1, b1, a1s, b1s, C1, other, kL, kC, kH) for other in others]
+
+    def distances(self, others) -> list[float]:
+        # Lab2k.distance() of this color and each of the others
+        others = list(others)
+        for other in others:
+            if type(other) is not self.color_type:
+                raise TypeError(f"Type mismatch: {self.color_type} vs {type(other)}")
+        return [check01(min(d / 128.0, 1.0)) for d in self.distances_not_normalized(others)]
 
-        avg_L = (L1 + L2) / 2.0
-        C1 = math.sqrt(a1 ** 2 + b1 ** 2)
-        C2 = math.sqrt(a2 ** 2 + b2 ** 2)
-        avg_C = (C1 + C2) / 2.0
 
-        G = 1 - 0.5 * (avg_C ** 7) / (avg_C ** 7 + 25 ** 7)
-        a1p = (1 + G) * a1
-        a2p = (1 + G) * a2
-        C1p = math.sqrt(a1p ** 2 + b1 ** 2)
-        C2p = math.sqrt(a2p ** 2 + b2 ** 2)
+class Lab2kTextiles(Lab2k):
+    """
+    CIE L*a*b* color model with CIEDE2000 distance metric, textiles factors (kL = 2).
+    """
+    kL = 2.0
 
-        h1p = math.degrees(math.atan2(b1, a1p)) % 360
-        h2p = math.degrees(math.atan2(b2, a2p)) % 360
 
-        delta_Lp = L2 - L1
-        delta_Cp = C2p - C1p
+class Lab94(Lab):
+    """
+    CIE L*a*b* color model with CIE94 distance metric.
+    Graphic arts factors by default (kL = 1, K1 = 0.045, K2 = 0.015);
+    textiles use kL = 2, K1 = 0.048, K2 = 0.014.
+    The metric is not symmetric: this color is the reference.
+    """
+    kL = 1.0
+    K1 = 0.045
+    K2 = 0.015
+
+    def distance_not_normalized(self, other: "Lab94") -> float:
+        # ΔE94 metric
+        # Reference: https://en.wikipedia.org/wiki/Color_difference#CIE94
+        C1 = math.sqrt(self.a * self.a + self.b * self.b)
+        C2 = math.sqrt(other.a * other.a + other.b * other.b)
+        dL = self.l - other.l
+        dC = C1 - C2
+        da = self.a - other.a
+        db = self.b - other.b
+        dH2 = max(0.0, da * da + db * db - dC * dC)
+        SC = 1 + self.K1 * C1
+        SH = 1 + self.K2 * C1
+        dL /= self.kL
+        dC /= SC
+        return math.sqrt(dL * dL + dC * dC + dH2 / (SH * SH))
+
+    def distance(self, other: "Lab94") -> float:
+        if type(other) is not type(self):
+            raise TypeError(f"Type mismatch: {type(self)} vs {type(other)}")
+        d = self.distance_not_normalized(other)
+        dn = min(d / LAB94_MAX, 1.0)  # Normalize to 0..1
+        return check01(dn)
 
-        if C1p * C2p == 0:
-            delta_hp = 0.0
-        else:
-            dhp = h2p - h1p
-            if abs(dhp) <= 180:
-                delta_hp = dhp
-            elif dhp > 180:
-                delta_hp = dhp - 360
-            else:
-                delta_hp = dhp + 360
-
-        delta_Hp = 2 * math.sqrt(C1p * C2p) * math.sin(math.radians(delta_hp) / 2)
-        avg_Lp = (L1 + L2) / 2.0
-        avg_Cp = (C1p + C2p) / 2.0
-        if C1p * C2p == 0:
-            avg_hp = h1p + h2p
+
+class LabCMC(Lab):
+    """
+    CIE L*a*b* color model with CMC l:c distance metric.
+    The ratio is 2:1 (acceptability) by default, 1:1 is used for perceptibility.
+    The metric is not symmetric: this color is the reference.
+    """
+    cmc_l = 2.0
+    cmc_c = 1.0
+
+    def distance_not_normalized(self, other: "LabCMC") -> float:
+        # ΔE CMC l:c metric
+        # Reference: https://en.wikipedia.org/wiki/Color_difference#CMC_l:c_(1984)
+        L1, a1, b1 = self.l, self.a, self.b
+        C1 = math.sqrt(a1 * a1 + b1 * b1)
+        C2 = math.sqrt(other.a * other.a + other.b * other.b)
+        dL = L1 - other.l
+        dC = C1 - C2
+        da = a1 - other.a
+        db = b1 - other.b
+        dH2 = max(0.0, da * da + db * db - dC * dC)
+
+        h1 = math.degrees(math.atan2(b1, a1)) % 360
+        if 164 <= h1 <= 345:
+            T = 0.56 + abs(0.2 * math.cos(math.radians(h1 + 168)))
         else:
-            dhp = abs(h1p - h2p)
-            if dhp <= 180:
-                avg_hp = (h1p + h2p) / 2.0
-            elif (h1p + h2p) < 360:
-                avg_hp = (h1p + h2p + 360) / 2.0
-            else:
-                avg_hp = (h1p + h2p - 360) / 2.0
-        T = (1
-                - 0.17 * math.cos(math.radians(avg_hp - 30))
-                + 0.24 * math.cos(math.radians(2 * avg_hp))
-                + 0.32 * math.cos(math.radians(3 * avg_hp +
-                                             6))
-                - 0.20 * math.cos(math.radians(4 * avg_hp - 63)))
-        delta_ro = 30 * math.exp(-((avg_hp - 275) /
-                                    25) ** 2)
-        RC = 2 * math.sqrt((avg_Cp ** 7) /
-                            (avg_Cp ** 7 + 25 ** 7))
-        SL = 1 + ((0.015 * ((avg_Lp - 50) ** 2)) /
-                    math.sqrt(20 + ((avg_Lp - 50) ** 2)))
-        SC = 1 + 0.045 * avg_Cp
-        SH = 1 + 0.015 * avg_Cp * T
-        RT = -math.sin(math.radians(2 * delta_ro)) * RC
-        delta_E = math.sqrt(
-            (delta_Lp / SL) ** 2 +
-            (delta_Cp / SC) ** 2 +
-            (delta_Hp / SH) ** 2 +
-            RT * (delta_Cp / SC) * (delta_Hp / SH)
-        )
-        return delta_E
+            T = 0.36 + abs(0.4 * math.cos(math.radians(h1 + 35)))
+        C14 = C1 ** 4
+        F = math.sqrt(C14 / (C14 + 1900))
+        SL = 0.511 if L1 < 16 else 0.040975 * L1 / (1 + 0.01765 * L1)
+        SC = 0.0638 * C1 / (1 + 0.0131 * C1) + 0.638
+        SH = SC * (F * T + 1 - F)
+        dL /= self.cmc_l * SL
+        dC /= self.cmc_c * SC
+        return math.sqrt(dL * dL + dC * dC + dH2 / (SH * SH))
+
+    def distance(self, other: "LabCMC") -> float:
+        if type(other) is not type(self):
+            raise TypeError(f"Type mismatch: {type(self)} vs {type(other)}")
+        d = self.distance_not_normalized(other)
+        dn = min(d / LABCMC_MAX, 1.0)  # Normalize to 0..1
+        return check01(dn)
 
-    def distance_not_normalized(self, other: "Lab2k") -> float:
-        return self._calc_distance(other)
 
-    def distance(self, other: "Lab2k") -> float:
+class Oklab(CubeModel):
+    """
+    Oklab color model with Euclidean distance.
+    L: Lightness in [0..1], a, b: about [-0.4..0.4] within the sRGB gamut.
+    See https://bottosson.github.io/posts/oklab/
+    """
+    def __init__(self, l: float, a: float, b: float):
+        self.l = l
+        self.a = a
+        self.b = b
+
+    def components(self) -> tuple:
+        return self.l, self.a, self.b
+
+    def distance_not_normalized(self, other: "Oklab") -> float:
+        return math.sqrt((self.l - other.l) ** 2 + (self.a - other.a) ** 2 + (self.b - other.b) ** 2)
+
+    def distance(self, other: "Oklab") -> float:
         if type(other) is not type(self):
             raise TypeError(f"Type mismatch: {type(self)} vs {type(other)}")
+        d = self.distance_not_normalized(other)
+        dn = min(d / OKLAB_MAX, 1.0)  # Normalize to 0..1
+        return check01(dn)
 
-        d = self._calc_distance(other)
-        dn = min(d / 128.0, 1.0)  # Normalize to 0..1, max ~ 128-129
+
+class CAM16UCS(CubeModel):
+    """
+    CAM16-UCS color model with Euclidean distance.
+    J: Lightness J' in [0..100], a, b: a', b' colorfulness coordinates.
+    """
+    def __init__(self, j: float, a: float, b: float):
+        self.j = j
+        self.a = a
+        self.b = b
+
+    def components(self) -> tuple:
+        return self.j, self.a, self.b
+
+    def distance_not_normalized(self, other: "CAM16UCS") -> float:
+        return math.sqrt((self.j - other.j) ** 2 + (self.a - other.a) ** 2 + (self.b - other.b) ** 2)
+
+    def distance(self, other: "CAM16UCS") -> float:
+        if type(other) is not type(self):
+            raise TypeError(f"Type mismatch: {type(self)} vs {type(other)}")
+        d = self.distance_not_normalized(other)
+        dn = min(d / CAM16UCS_MAX, 1.0)  # Normalize to 0..1
         return check01(dn)
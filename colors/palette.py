@@ -0,0 +1,493 @@
+"""
+Palette quantization: the dominant colors of an image.
+
+The pixels of a display sRGB image are first reduced to the occupied cells of a
+5 bits per channel histogram (at most 32768 weighted points), which are clustered
+in Lab or Oklab by mini-batch k-means or by median cut.  The clustering is Euclidean
+in the chosen space, i.e. ΔE76 for Lab.
+
+PaletteMapper maps images to the nearest colors of a palette by any metric of
+colors.image.DELTA_E (ΔE2000 by default) through a lookup table of 8-bit RGB,
+built once per palette and optionally cached on disk.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+from .bulk import unpack_rgb8
+from .image import DELTA_E, TILE_PIXELS, convert_image, map_tiles, to_uint8
+from .models import AbstractColor, Lab, Lab2k, Oklab, CAM16UCS, RGBDisplay
+
+
+HISTOGRAM_BITS = 5
+SPACES = (Lab, Oklab, CAM16UCS)
+
+
+def histogram(image, bits: int = HISTOGRAM_BITS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Occupied cells of a 2^bits per channel grid over the pixels of an image.
+
+    image: display sRGB, uint8 or floats in [0..1], of shape (..., 3), or packed uint32 (...)
+    Returns the mean display RGB of the pixels of every cell, array (cells, 3) in [0..1],
+    and the number of the pixels, array (cells,).
+    """
+    image = np.asarray(image)
+    if image.dtype == np.uint32:
+        image = unpack_rgb8(image)
+    rgb8 = (image if image.dtype == np.uint8 else to_uint8(image)).reshape(-1, 3)
+    values = image.reshape(-1, 3) / 255.0 if image.dtype == np.uint8 else image.reshape(-1, 3)
+    cells = (rgb8 >> (8 - bits)).astype(np.int64)
+    codes = (cells[:, 0] << (2 * bits)) | (cells[:, 1] << bits) | cells[:, 2]
+    size = 1 << (3 * bits)
+    counts = np.bincount(codes, minlength=size)
+    occupied = np.flatnonzero(counts)
+    sums = np.stack([np.bincount(codes, weights=values[:, i], minlength=size)[occupied] for i in range(3)], axis=-1)
+    weights = counts[occupied].astype(np.float64)
+    return sums / weights[:, None], weights
+
+
+def nearest(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    # Index of the nearest center (Euclidean) of every point
+    d2 = (centers ** 2).sum(axis=1)[None, :] - 2 * points @ centers.T
+    return d2.argmin(axis=1)
+
+
+def _split_errors(points: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    # Weighted squared error of points[:i] plus the one of points[i:], for i in 1..len-1
+    w = np.cumsum(weights)
+    s = np.cumsum(weights[:, None] * points, axis=0)
+    q = np.cumsum(weights * (points ** 2).sum(axis=1))
+    left = q[:-1] - (s[:-1] ** 2).sum(axis=1) / w[:-1]
+    right_w = w[-1] - w[:-1]
+    right_s = s[-1] - s[:-1]
+    right = (q[-1] - q[:-1]) - (right_s ** 2).sum(axis=1) / right_w
+    return left + right
+
+
+def median_cut(points: np.ndarray, weights: np.ndarray, n_colors: int) -> np.ndarray:
+    """
+    Split the box of the largest weighted squared error in two along one of the axes,
+    until there are n_colors boxes. Returns their weighted means.
+    The cut is not at the median but where it leaves the least squared error (Wu, 1991),
+    so it does not halve a large cluster.
+    """
+    def error(box):
+        mean = np.average(points[box], axis=0, weights=weights[box])
+        return float((weights[box] * ((points[box] - mean) ** 2).sum(axis=1)).sum())
+
+    boxes = [np.arange(len(points))]
+    errors = [error(boxes[0])]
+    while len(boxes) < n_colors:
+        i = int(np.argmax(errors))
+        if errors[i] <= 0 or len(boxes[i]) < 2:
+            break
+        box = boxes.pop(i)
+        errors.pop(i)
+        best = None
+        for axis in range(3):
+            ordered = box[np.argsort(points[box, axis], kind='stable')]
+            split = _split_errors(points[ordered], weights[ordered])
+            cut = int(split.argmin())
+            if best is None or split[cut] < best[0]:
+                best = (split[cut], ordered[:cut + 1], ordered[cut + 1:])
+        for part in best[1:]:
+            boxes.append(part)
+            errors.append(error(part))
+    return np.array([np.average(points[box], axis=0, weights=weights[box]) for box in boxes])
+
+
+def kmeans(points: np.ndarray, weights: np.ndarray, n_colors: int,
+           batch_size: int = 1024, iterations: int = 100, seed: int = 0) -> np.ndarray:
+    """
+    Mini-batch k-means (Sculley, 2010) of weighted points, with k-means++ initialization.
+    Every batch draws `batch_size` points in proportion to their weights.
+    Returns the centers, at most n_colors.
+    """
+    rng = np.random.default_rng(seed)
+    p = weights / weights.sum()
+
+    # k-means++
+    centers = [points[rng.choice(len(points), p=p)]]
+    d2 = ((points - centers[0]) ** 2).sum(axis=1)
+    while len(centers) < n_colors:
+        w = weights * d2
+        if w.sum() <= 0:
+            break
+        centers.append(points[rng.choice(len(points), p=w / w.sum())])
+        d2 = np.minimum(d2, ((points - centers[-1]) ** 2).sum(axis=1))
+    centers = np.array(centers)
+
+    # Every center moves to the mean of its batch points with the rate 1 / points seen so far
+    seen = np.zeros(len(centers))
+    for _ in range(iterations):
+        sample = points[rng.choice(len(points), batch_size, p=p)]
+        assigned = nearest(sample, centers)
+        n = np.bincount(assigned, minlength=len(centers))
+        sums = np.stack([np.bincount(assigned, weights=sample[:, i], minlength=len(centers)) for i in range(3)], axis=-1)
+        seen += n
+        moved = n > 0
+        rate = n[moved] / seen[moved]
+        centers[moved] += rate[:, None] * (sums[moved] / n[moved, None] - centers[moved])
+    return centers
+
+
+def quantize(image, n_colors: int = 8, space=Lab2k, method: str = 'kmeans', bits: int = HISTOGRAM_BITS,
+             batch_size: int = 1024, iterations: int = 100, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The dominant colors of an image, see dominant_colors().
+    Returns their components in `space`, array (colors, 3), and their shares of the pixels,
+    the largest first.
+    """
+    if not issubclass(space, SPACES):
+        raise ValueError(f"Quantization is in Lab, Oklab or CAM16-UCS, not {space.__name__}")
+    rgb, weights = histogram(image, bits)
+    points = convert_image(rgb, to=space)
+    if method == 'kmeans':
+        centers = kmeans(points, weights, n_colors, batch_size, iterations, seed)
+    elif method == 'median-cut':
+        centers = median_cut(points, weights, n_colors)
+    else:
+        raise ValueError(f"Unknown quantization method: {method}")
+    shares = np.bincount(nearest(points, centers), weights=weights, minlength=len(centers)) / weights.sum()
+    order = np.argsort(-shares, kind='stable')
+    order = order[shares[order] > 0]
+    return centers[order], shares[order]
+
+
+def dominant_colors(image, n_colors: int = 8, space=Lab2k, method: str = 'kmeans', **options) -> list:
+    """
+    Up to n_colors dominant colors of a display sRGB image, objects of `space` (Lab2k, Oklab...),
+    the most frequent first.
+    method: 'kmeans' or 'median-cut'; options: of quantize()
+    """
+    centers, _ = quantize(image, n_colors, space, method, **options)
+    return [space(*c) for c in centers.tolist()]
+
+
+def _box_polar(a0, a1, b0, b1) -> tuple:
+    # Chroma and hue (degrees) ranges of boxes of the ab plane; the full circle for the boxes holding the origin
+    corners = np.stack([a0, a0, a1, a1]), np.stack([b0, b1, b0, b1])
+    c_min = np.hypot(np.clip(0, a0, a1), np.clip(0, b0, b1))
+    c_max = np.hypot(*corners).max(axis=0)
+    middle = np.degrees(np.arctan2((b0 + b1) / 2, (a0 + a1) / 2))
+    turn = (np.degrees(np.arctan2(corners[1], corners[0])) - middle + 180) % 360 - 180
+    h_min = np.where(c_min > 0, middle + turn.min(axis=0), middle - 180)
+    h_max = np.where(c_min > 0, middle + turn.max(axis=0), middle + 180)
+    return c_min, c_max, h_min, h_max
+
+
+def _hue_gaps(d0, d1) -> tuple:
+    # Range of the hue difference |h2 - h1| wrapped to [0, 180] for h2 - h1 in [d0, d1]
+    shift = 360 * np.floor((d0 + 180) / 360)
+    d0, d1 = d0 - shift, d1 - shift
+    ends = np.abs((np.stack([d0, d1]) + 180) % 360 - 180)
+    low = np.where(((d0 <= 0) & (d1 >= 0)) | (d1 >= 360), 0.0, ends.min(axis=0))
+    high = np.where((d1 >= 180) | (d0 <= -180), 180.0, ends.max(axis=0))
+    return low, high
+
+
+def _chord(c1, c2, gap) -> np.ndarray:
+    # ΔH of the colors of chromas c1, c2 `gap` degrees apart
+    return 2 * np.sqrt(c1 * c2) * np.sin(np.radians(gap) / 2)
+
+
+def _gaps(reference: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> tuple:
+    # Ranges of |ΔL|, |ΔC| and ΔH between the reference colors and the colors of the Lab boxes lo..hi, (n, 3) each
+    L, a, b = reference.T
+    L0, a0, b0 = lo.T
+    L1, a1, b1 = hi.T
+    C = np.hypot(a, b)
+    c_min, c_max, h_min, h_max = _box_polar(a0, a1, b0, b1)
+    h = np.degrees(np.arctan2(b, a))
+    gap_min, gap_max = _hue_gaps(h_min - h, h_max - h)
+    return ((np.maximum(0, np.maximum(L0 - L, L - L1)), np.maximum(np.abs(L0 - L), np.abs(L1 - L))),
+            (np.maximum(0, np.maximum(c_min - C, C - c_max)), np.maximum(np.abs(c_min - C), np.abs(c_max - C))),
+            (_chord(C, c_min, gap_min), _chord(C, c_max, gap_max)))
+
+
+def _scaled(*terms) -> tuple:
+    # Range of sqrt(sum (x / s)^2) for the ranges x of the terms (x_min, x_max, s_min, s_max)
+    low = sum((x_min / s_max) ** 2 for x_min, _, _, s_max in terms)
+    high = sum((x_max / s_min) ** 2 for _, x_max, s_min, _ in terms)
+    return np.sqrt(low), np.sqrt(high)
+
+
+def _euclidean_bounds(reference: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> tuple:
+    # Distances from the reference colors to the nearest and the farthest colors of the boxes
+    near = np.clip(reference, lo, hi) - reference
+    far = np.maximum(np.abs(lo - reference), np.abs(hi - reference))
+    return np.sqrt((near ** 2).sum(axis=-1)), np.sqrt((far ** 2).sum(axis=-1))
+
+
+def _delta_e94_bounds(reference: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> tuple:
+    # As batch.delta_e94, the weights are of the reference colors
+    dL, dC, dH = _gaps(reference, lo, hi)
+    C = np.hypot(reference[:, 1], reference[:, 2])
+    SC, SH = 1 + 0.045 * C, 1 + 0.015 * C
+    return _scaled((*dL, 1, 1), (*dC, SC, SC), (*dH, SH, SH))
+
+
+def _delta_e_cmc_bounds(reference: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> tuple:
+    # As batch.delta_e_cmc with l = 2, c = 1, the weights are of the reference colors
+    dL, dC, dH = _gaps(reference, lo, hi)
+    L, a, b = reference.T
+    C = np.hypot(a, b)
+    h = np.degrees(np.arctan2(b, a)) % 360
+    T = np.where((164 <= h) & (h <= 345), 0.56 + np.abs(0.2 * np.cos(np.radians(h + 168))),
+                 0.36 + np.abs(0.4 * np.cos(np.radians(h + 35))))
+    F = np.sqrt(C ** 4 / (C ** 4 + 1900))
+    SL = 2 * np.where(L < 16, 0.511, 0.040975 * L / (1 + 0.01765 * L))
+    SC = 0.0638 * C / (1 + 0.0131 * C) + 0.638
+    SH = SC * (F * T + 1 - F)
+    return _scaled((*dL, SL, SL), (*dC, SC, SC), (*dH, SH, SH))
+
+
+def _hue_weight(h) -> np.ndarray:
+    # T of ΔE2000 at the mean hue h, degrees
+    return (1 - 0.17 * np.cos(np.radians(h - 30)) + 0.24 * np.cos(np.radians(2 * h))
+            + 0.32 * np.cos(np.radians(3 * h + 6)) - 0.20 * np.cos(np.radians(4 * h - 63)))
+
+
+def _rotation(h) -> np.ndarray:
+    # Δθ of ΔE2000 at the mean hue h in [0, 360)
+    return 30 * np.exp(-((h - 275) / 25) ** 2)
+
+
+# T of ΔE2000 is within 1 ± (0.17 + 0.24 + 0.32 + 0.2), its slope within ± (0.17 + 0.48 + 0.96 + 0.8) per radian
+HUE_WEIGHT_RANGE = (0.07, 1.93)
+HUE_WEIGHT_SLOPE = 2.41
+
+
+def _delta_e2000_bounds(reference: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> tuple:
+    # As batch.delta_e2000 with kL = kC = kH = 1, term by term over the ranges of the colors of the boxes
+    L, a, b = reference.T
+    L0, a0, b0 = lo.T
+    L1, a1, b1 = hi.T
+
+    # G decreases with the mean chroma, a' = (1 + G) a
+    C = np.hypot(a, b)
+    c_min, c_max, _, _ = _box_polar(a0, a1, b0, b1)
+    G = [1 - 0.5 * ((C + c) / 2) ** 7 / (((C + c) / 2) ** 7 + 25 ** 7) for c in (c_max, c_min)]
+    g0, g1 = 1 + G[0], 1 + G[1]
+    ap0 = np.where(a0 >= 0, g0 * a0, g1 * a0)
+    ap1 = np.where(a1 >= 0, g1 * a1, g0 * a1)
+    cp_min, cp_max, hp_min, hp_max = _box_polar(ap0, ap1, b0, b1)
+    Cp0, Cp1 = np.hypot(g0 * a, b), np.hypot(g1 * a, b)
+    h0 = np.degrees(np.arctan2(b, g0 * a))
+    h1 = h0 + (np.degrees(np.arctan2(b, g1 * a)) - h0 + 180) % 360 - 180
+    h_min, h_max = np.minimum(h0, h1), np.maximum(h0, h1)
+
+    d0, d1 = hp_min - h_max, hp_max - h_min
+    gap_min, gap_max = _hue_gaps(d0, d1)
+    dL = np.maximum(0, np.maximum(L0 - L, L - L1)), np.maximum(np.abs(L0 - L), np.abs(L1 - L))
+    dC = np.maximum(0, np.maximum(cp_min - Cp1, Cp0 - cp_max)), np.maximum(np.abs(cp_min - Cp1), np.abs(cp_max - Cp0))
+    dH = _chord(Cp0, cp_min, gap_min), _chord(Cp1, cp_max, gap_max)
+
+    ends = (L + L0) / 2 - 50, (L + L1) / 2 - 50
+    distance = np.where(ends[0] * ends[1] <= 0, 0, np.minimum(*np.abs(ends))), np.maximum(*np.abs(ends))
+    SL = [1 + 0.015 * u ** 2 / np.sqrt(20 + u ** 2) for u in distance]
+    avg_C = (Cp0 + cp_min) / 2, (Cp1 + cp_max) / 2
+    SC = [1 + 0.045 * c for c in avg_C]
+
+    # The mean hue h + Δh / 2 is continuous while the hues are less than 180° apart
+    shift = 360 * np.floor((d0 + 180) / 360)
+    continuous = (gap_max < 180) & (C > 0)
+    m0, m1 = h_min + (d0 - shift) / 2, h_max + (d1 - shift) / 2
+    middle, half = (m0 + m1) / 2, np.radians(m1 - m0) / 2
+    T = (np.where(continuous, np.maximum(_hue_weight(middle) - HUE_WEIGHT_SLOPE * half, HUE_WEIGHT_RANGE[0]),
+                  HUE_WEIGHT_RANGE[0]),
+         np.where(continuous, np.minimum(_hue_weight(middle) + HUE_WEIGHT_SLOPE * half, HUE_WEIGHT_RANGE[1]),
+                  HUE_WEIGHT_RANGE[1]))
+    m1, m0 = m1 - 360 * np.floor(m0 / 360), m0 % 360
+    peak = np.where(m1 < 360, _rotation(np.clip(275, m0, m1)),
+                    np.maximum(_rotation(np.clip(275, m0, 360)), _rotation(np.clip(275, 0, m1 - 360))))
+    rotation = np.where(continuous & (m1 - m0 < 360), peak, 30)
+    RC = 2 * np.sqrt(avg_C[1] ** 7 / (avg_C[1] ** 7 + 25 ** 7))
+    RT = np.sin(np.radians(2 * rotation)) * RC
+    SH = [1 + 0.015 * c * t for c, t in zip(avg_C, T)]
+
+    # RT ΔC' ΔH' of either sign
+    x = dL[0] / SL[1], dL[1] / SL[0]
+    y = dC[0] / SC[1], dC[1] / SC[0]
+    z = dH[0] / SH[1], dH[1] / SH[0]
+    low = np.maximum(x[0] ** 2 + y[0] ** 2 + z[0] ** 2 - RT * y[1] * z[1], x[0] ** 2 + (1 - RT / 2) * (y[0] ** 2 + z[0] ** 2))
+    high = x[1] ** 2 + y[1] ** 2 + z[1] ** 2 + RT * y[1] * z[1]
+    return np.sqrt(np.maximum(low, 0)), np.sqrt(high)
+
+
+# Ranges of the distances by the metrics of DELTA_E from colors to the colors of boxes of their spaces,
+# pair by pair
+DISTANCE_BOUNDS = {
+    'lab76': _euclidean_bounds,
+    'lab2k': _delta_e2000_bounds,
+    'lab94': _delta_e94_bounds,
+    'cmc': _delta_e_cmc_bounds,
+    'oklab': _euclidean_bounds,
+    'cam16': _euclidean_bounds,
+}
+
+
+class PaletteMapper:
+    """
+    Nearest palette colors of display sRGB colors by a metric of DELTA_E.
+
+    palette: 8-bit display sRGB array (colors, 3), or color objects of any model
+    bits: per channel of the lookup table, 8 (2^24 entries, 16 MB) or less
+        (2^15 entries for 5 bits, the colors are rounded to the centers of the cells)
+    cache_dir: where to keep the tables, keyed by the hash of the palette, metric and bits
+    The table is exact, equal to nearest().  It is built on a grid of cells, CELL 8-bit values
+    wide, halved down to single colors where needed: the distances from every palette color to
+    the colors of a cell are bounded over the box of the cell in the space of the metric
+    (DISTANCE_BOUNDS, term by term of the formula for ΔE94, CMC and ΔE2000), a palette color
+    nearer to none of them than another one to all of them is dropped, and a cell left with
+    one candidate takes it whole.
+    """
+    CELL = 8
+    VERSION = 2  # of the table format and algorithm, part of the cache key
+
+    def __init__(self, palette, metric: str = 'lab2k', bits: int = 8, cache_dir: str = None, workers: int = 1):
+        self.palette = palette_rgb8(palette)
+        self.metric = metric
+        self.bits = bits
+        self.workers = workers
+        self._model, self._distance, _ = DELTA_E[metric]
+        self._reference = convert_image(self.palette, to=self._model)
+        digest = hashlib.sha256(self.palette.tobytes())
+        digest.update(f"{metric}/{bits}/{self.VERSION}".encode())
+        self.key = digest.hexdigest()
+        self.table = self._load_table(cache_dir)
+
+    def map(self, image) -> np.ndarray:
+        """
+        Palette indices of the pixels of an 8-bit display sRGB image (..., 3),
+        or of a packed uint32 one (...).
+        """
+        image = np.asarray(image)
+        if image.dtype == np.uint32 and self.bits == 8:
+            return self.table[image & 0xFFFFFF]
+        if image.dtype == np.uint32:
+            image = unpack_rgb8(image)
+        elif image.dtype != np.uint8:
+            image = to_uint8(image)
+        shift = 8 - self.bits
+        cells = (image >> shift).astype(np.int32)
+        return self.table[(cells[..., 0] << (2 * self.bits)) | (cells[..., 1] << self.bits) | cells[..., 2]]
+
+    def apply(self, image) -> np.ndarray:
+        # The image with every pixel replaced by its palette color, uint8
+        return self.palette[self.map(image)]
+
+    def nearest(self, rgb8: np.ndarray) -> np.ndarray:
+        """
+        Exact palette indices of 8-bit colors (..., 3), without the table.
+        """
+        points = convert_image(np.asarray(rgb8, dtype=np.uint8), to=self._model)
+        return self._nearest(points, range(len(self.palette)))
+
+    def _nearest(self, points: np.ndarray, candidates) -> np.ndarray:
+        # Index of the nearest of the candidate palette colors of every point
+        best = np.full(points.shape[:-1], np.inf)
+        index = np.zeros(points.shape[:-1], dtype=np.int64)
+        for candidate in candidates:
+            d = self._distance(self._reference[candidate], points)
+            closer = d < best
+            best = np.where(closer, d, best)
+            index = np.where(closer, candidate, index)
+        return index
+
+    def _grid_values(self, codes: np.ndarray) -> np.ndarray:
+        # 8-bit values of grid codes, the centers of the cells for less than 8 bits
+        shift = 8 - self.bits
+        return ((codes << shift) + ((1 << shift) >> 1)).astype(np.uint8)
+
+    def _build_table(self) -> np.ndarray:
+        model = self._model
+        n = 1 << self.bits
+        cell = max(1, self.CELL >> (8 - self.bits))
+        m = n // cell
+        dtype = np.uint8 if len(self.palette) <= 256 else np.uint16
+        if cell == 1 or self.metric not in DISTANCE_BOUNDS:
+            # No bound on the nearest colors of a cell, every color by itself
+            values = self._grid_values(np.arange(n))
+
+            def nearest(tile):
+                codes = np.stack(np.unravel_index(np.arange(tile.start, tile.stop), (n, n, n)), axis=-1)
+                return self._nearest(convert_image(values[codes], to=model), range(len(self.palette)))
+
+            return np.concatenate(map_tiles(nearest, n ** 3, TILE_PIXELS, self.workers)).astype(dtype)
+
+        table = np.empty((n, n, n), dtype=dtype)
+        cells = np.stack(np.meshgrid(*[np.arange(m)] * 3, indexing='ij'), axis=-1).reshape(-1, 3)
+        offsets = np.stack(np.meshgrid(*[np.arange(cell)] * 3, indexing='ij'), axis=-1).reshape(-1, 3)
+        tile_cells = max(1, TILE_PIXELS // cell ** 3)
+
+        def split(values, size):
+            # (cells, size^3, ...) to the (cells * 8, (size / 2)^3, ...) octants of the cells
+            half = size // 2
+            values = values.reshape(len(values), 2, half, 2, half, 2, half, -1)
+            return values.transpose(0, 1, 3, 5, 2, 4, 6, 7).reshape(len(values) * 8, half ** 3, -1)
+
+        bounds = DISTANCE_BOUNDS[self.metric]
+
+        def work(tile):
+            codes = cells[tile, None, :] * cell + offsets[None, :, :]
+            points = convert_image(self._grid_values(codes), to=model)
+            candidate = np.ones((len(codes), len(self.palette)), dtype=bool)
+            results = []
+            size = cell
+            while size > 1:
+                # A color nearer to none of the colors of a cell than another one to all of them
+                # is the nearest of none, with a margin for the rounding of the bounds
+                rows, cols = np.nonzero(candidate)
+                low, high = np.full(candidate.shape, np.inf), np.full(candidate.shape, np.inf)
+                low[rows, cols], high[rows, cols] = bounds(
+                    self._reference[cols], points.min(axis=1)[rows], points.max(axis=1)[rows])
+                nearest = high.min(axis=1)
+                candidate &= low <= (nearest * (1 + 1e-9) + 1e-6)[:, None]
+                done = candidate.sum(axis=1) == 1
+                results.append((codes[done].reshape(-1, 3), np.repeat(candidate[done].argmax(axis=1), size ** 3)))
+                codes, points, candidate = split(codes[~done], size), split(points[~done], size), candidate[~done]
+                candidate = np.repeat(candidate, 8, axis=0)
+                size //= 2
+
+            # The colors left with more candidates, by the metric
+            codes, points = codes[:, 0], points[:, 0]
+            rows, cols = np.nonzero(candidate)
+            d = np.full(candidate.shape, np.inf)
+            d[rows, cols] = self._distance(self._reference[cols], points[rows])
+            results.append((codes, d.argmin(axis=1)))
+            return results
+
+        for results in map_tiles(work, len(cells), tile_cells, self.workers):
+            for codes, index in results:
+                table[codes[:, 0], codes[:, 1], codes[:, 2]] = index
+        return table.reshape(-1)
+
+    def _load_table(self, cache_dir: str) -> np.ndarray:
+        if cache_dir is None:
+            return self._build_table()
+        path = os.path.join(cache_dir, f"palette-{self.key}.npy")
+        if os.path.exists(path):
+            return np.load(path)
+        table = self._build_table()
+        os.makedirs(cache_dir, exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, 'wb') as f:
+            np.save(f, table)
+        os.replace(temp, path)
+        return table
+
+
+def palette_rgb8(palette) -> np.ndarray:
+    """
+    8-bit display sRGB array (colors, 3) of a palette: color objects of any model,
+    or 8-bit, packed uint32 or [0..1] float display sRGB.
+    """
+    palette = list(palette) if not isinstance(palette, np.ndarray) else palette
+    if len(palette) and all(isinstance(c, AbstractColor) for c in palette):
+        return np.array([to_uint8(convert_image(c.components(), to=RGBDisplay, source=type(c))) for c in palette])
+    palette = np.asarray(palette)
+    if palette.dtype == np.uint32:
+        return unpack_rgb8(palette).copy()
+    return to_uint8(palette) if palette.dtype.kind == 'f' else palette.astype(np.uint8)
@@ -0,0 +1,133 @@
+"""
+HTML preview pages of color pairs.
+
+write_preview() streams the pages to files, PAGE_SIZE pairs per page with links
+between the pages, and annotates every pair with its distances by the registered
+metrics, computed for all pairs in one all_distances() call.
+"""
+import html
+import os
+
+import numpy as np
+
+from .bulk import parse_hex_array, to_hex_array
+from .image import map_tiles
+from .metrics import all_distances, get_metric
+
+
+PAGE_SIZE = 500
+
+_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{
+  font-family: sans-serif;
+  background: #f0f0f0;
+  margin: 20px;
+}}
+.pair {{
+  display: flex;
+  align-items: center;
+  margin-bottom: 8px;
+}}
+.swatch {{
+  width: 120px;
+  height: 60px;
+  border: 1px solid #ccc;
+}}
+.hex {{
+  width: 100px;
+  text-align: center;
+  margin: 0 8px;
+  font-family: monospace;
+}}
+.distances {{
+  margin-left: 16px;
+  font-size: 12px;
+  color: #555;
+}}
+</style>
+</head>
+<body>
+<h2>{title}</h2>
+"""
+_TAIL = "</body>\n</html>\n"
+_PAIR = """<div class="pair" id="pair-{n}">
+  <div class="swatch" style="background:{a}"></div>
+  <div class="hex">{a}</div>
+  <div class="swatch" style="background:{b}"></div>
+  <div class="hex">{b}</div>
+  <div class="distances">{distances}</div>
+</div>
+"""
+
+
+def pair_rgb8(pairs) -> np.ndarray:
+    """
+    8-bit RGB, uint8 array (pairs, 2, 3), of pairs of "#RRGGBB" strings or RGB objects,
+    or of an array (pairs, 2, 3).
+    """
+    if isinstance(pairs, np.ndarray):
+        return pairs.astype(np.uint8, copy=False).reshape(-1, 2, 3)
+    colors = [c if isinstance(c, str) else c.to_hex() for pair in pairs for c in pair]
+    return parse_hex_array(colors).reshape(-1, 2, 3)
+
+
+def page_paths(path: str, n_pages: int) -> list[str]:
+    # cards.html, cards-2.html, cards-3.html, ...
+    root, ext = os.path.splitext(path)
+    return [path] + [f"{root}-{page}{ext}" for page in range(2, n_pages + 1)]
+
+
+def write_preview(path: str, pairs, names=None, page_size: int = PAGE_SIZE,
+                  title: str = 'Color pairs', workers: int = 1) -> list[str]:
+    """
+    Write the preview of color pairs to `path`, and to path-2, path-3... for more than one page.
+
+    pairs: see pair_rgb8
+    names: metrics to show (default: all registered), empty for none
+    workers: threads writing the pages
+    Returns the paths of the pages.
+    """
+    if page_size < 1:
+        raise ValueError(f"Page size must be positive: {page_size}")
+    rgb8 = pair_rgb8(pairs)
+    n_pages = max(1, -(-len(rgb8) // page_size))
+    paths = page_paths(path, n_pages)
+
+    hex_a = to_hex_array(rgb8[:, 0])
+    hex_b = to_hex_array(rgb8[:, 1])
+    distances = all_distances(rgb8[:, 0] / 255.0, rgb8[:, 1] / 255.0, names)
+    labels = [html.escape(get_metric(name).label) for name in distances]
+    values = np.column_stack(list(distances.values())) if distances else np.zeros((len(rgb8), 0))
+    title = html.escape(title)
+
+    def navigation(page: int) -> str:
+        if n_pages == 1:
+            return ""
+        links = [f"Page {page + 1} of {n_pages}"]
+        if page > 0:
+            links.append(f'<a href="{html.escape(os.path.basename(paths[page - 1]))}">previous</a>')
+        if page < n_pages - 1:
+            links.append(f'<a href="{html.escape(os.path.basename(paths[page + 1]))}">next</a>')
+        return f"<p>{' | '.join(links)}</p>\n"
+
+    def rows(start: int, stop: int):
+        for i in range(start, stop):
+            text = ', '.join(f"{label} {value:.3f}" for label, value in zip(labels, values[i].tolist()))
+            yield _PAIR.format(n=i + 1, a=hex_a[i], b=hex_b[i], distances=text)
+
+    def write_page(tile):
+        page = tile.start
+        with open(paths[page], 'w', encoding='utf-8') as f:
+            f.write(_HEAD.format(title=title))
+            f.write(navigation(page))
+            f.writelines(rows(page * page_size, min((page + 1) * page_size, len(rgb8))))
+            f.write(navigation(page))
+            f.write(_TAIL)
+
+    map_tiles(write_page, n_pages, 1, workers)
+    return paths
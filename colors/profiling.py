@@ -0,0 +1,140 @@
+"""
+Opt-in instrumentation of colors.convert and colors.models.
+
+enable() replaces the converters (public and private helpers, like _srgb_to_linear),
+check01 and the distance methods of the model classes with wrappers which count calls
+and cumulative time; disable() puts the originals back.  Nothing is wrapped until
+enable() is called, so there is no cost when profiling is off.
+Setting the COLORS_PROFILE environment variable enables it on import of colors
+and prints the report to stderr at exit.
+
+Times are inclusive: a converter's time contains the helpers it calls.
+convert() and converter() go through the wrappers too: the cached conversion paths
+are rebuilt on enable() and disable().
+Functions imported by name before enable() (from colors.convert import rgb_to_lab76)
+keep the original, uninstrumented, function.  Counters are not thread-safe.
+"""
+import atexit
+import functools
+import inspect
+import sys
+import time
+
+from . import convert, models
+
+
+ENV_VAR = 'COLORS_PROFILE'
+METHODS = ('distance', 'distance_not_normalized', '_calc_distance', 'euclidean_distance', 'cylindrical_distance')
+# Helpers of the conversion graph, called once per path: noise in the report
+GRAPH_HELPERS = ('_step', '_node')
+
+_counters = {}  # name -> [calls, total ns]
+_patched = []  # (owner, attribute, original)
+_report_at_exit = False
+
+
+def _wrap(name: str, func):
+    counter = _counters.setdefault(name, [0, 0])
+    clock = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            counter[0] += 1
+            counter[1] += clock() - start
+
+    return wrapper
+
+
+def _patch(owner, attribute: str, name: str):
+    original = owner.__dict__[attribute]
+    _patched.append((owner, attribute, original))
+    setattr(owner, attribute, _wrap(name, original))
+
+
+def _targets():
+    # Functions of colors.convert defined there, and check01
+    for attribute, value in list(vars(convert).items()):
+        if inspect.isfunction(value) and value.__module__ == convert.__name__ and attribute not in GRAPH_HELPERS:
+            yield convert, attribute, f"convert.{attribute}"
+    yield models, 'check01', "models.check01"
+    # Distance methods, where a class defines them
+    for cls in list(vars(models).values()):
+        if inspect.isclass(cls) and issubclass(cls, models.AbstractColor):
+            for attribute in METHODS:
+                if attribute in cls.__dict__:
+                    yield cls, attribute, f"{cls.__name__}.{attribute}"
+
+
+def _clear_paths():
+    # The cached conversion paths hold the functions bound when they were built
+    convert.conversion_path.cache_clear()
+    convert.converter.cache_clear()
+
+
+def enabled() -> bool:
+    return bool(_patched)
+
+
+def enable(report_at_exit: bool = False):
+    """
+    Start counting. Also rebinds the re-exports in the colors package.
+    """
+    global _report_at_exit
+    if not _patched:
+        import colors
+        for owner, attribute, name in _targets():
+            _patch(owner, attribute, name)
+        for owner, attribute, original in _patched:
+            if owner is convert and colors.__dict__.get(attribute) is original:
+                setattr(colors, attribute, getattr(convert, attribute))
+        _clear_paths()
+    if report_at_exit and not _report_at_exit:
+        _report_at_exit = True
+        atexit.register(_print_report)
+
+
+def disable():
+    """
+    Stop counting and restore the original functions. The counters are kept.
+    """
+    import colors
+    for owner, attribute, original in reversed(_patched):
+        wrapper = owner.__dict__[attribute]
+        setattr(owner, attribute, original)
+        if owner is convert and colors.__dict__.get(attribute) is wrapper:
+            setattr(colors, attribute, original)
+    _patched.clear()
+    _clear_paths()
+
+
+def reset():
+    for counter in _counters.values():
+        counter[0] = 0
+        counter[1] = 0
+
+
+def stats() -> dict[str, tuple[int, int]]:
+    """
+    {name: (calls, total ns)} of the functions called at least once.
+    """
+    return {name: (calls, ns) for name, (calls, ns) in _counters.items() if calls}
+
+
+def report() -> list[str]:
+    """
+    Lines of calls, total time and ns per call, the most expensive first.
+    """
+    rows = sorted(stats().items(), key=lambda item: item[1][1], reverse=True)
+    lines = [f"{'function':40s} {'calls':>10s} {'total ms':>10s} {'ns/call':>9s}"]
+    for name, (calls, ns) in rows:
+        lines.append(f"{name:40s} {calls:10d} {ns / 1e6:10.2f} {ns / calls:9.0f}")
+    return lines
+
+
+def _print_report():
+    for line in report():
+        print(line, file=sys.stderr)
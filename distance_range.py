@@ -1,6 +1,5 @@
 import random
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from colors import RGBDisplay, HSV, HLS
@@ -29,7 +28,7 @@ YIQ Distance Stats:Min: 0.000, Max: 0.726, Avg: 0.258, StdDev: 0.106, Mean: 0.25
 """
 
 
-def generate():
+def generate(passes: int = 100_000, plot: bool = True):
     rgbd_values = []
     rgbl_values = []
     lab76_values = []
@@ -103,7 +102,6 @@ def generate():
     measure(RGBDisplay(0.2, 0.3, 0.4), RGBDisplay(0.2001, 0.3001, 0.4001))
 
     # And random
-    passes = 100_000
     for npass in range(passes):
         if npass % 10_000 == 0:
             print(f"Percent complete: {npass / passes:.2%}", end='\r')
@@ -143,6 +141,11 @@ def generate():
     # print("HLS-L:" + stats(hlsl_values))
     # print("YIQ Distance Stats:" + stats(yiq_values))
 
+    if not plot:
+        return
+
+    import matplotlib.pyplot as plt  # slow to import, only for the plot
+
     plt.figure(figsize=(8,4))
     # plt.hist(rgbd_values, bins=200, alpha=0.5, label='RGBD', density=True)
     # plt.hist(rgbl_values, bins=200, alpha=0.5, label='RGBL', density=True)
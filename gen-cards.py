@@ -6,7 +6,6 @@ import webbrowser
 import tempfile
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from colors import RGBDisplay, HSV, HLS
@@ -22,58 +21,11 @@ from colors import (
     rgb_to_lab76,
     rgb_to_lab2k,
 )
+from colors.preview import write_preview
 
 
-def create_html(pairs) -> str:
-    html = """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-    <meta charset="utf-8">
-    <title>Color pairs preview</title>
-    <style>
-    body {
-      font-family: sans-serif;
-      background: #f0f0f0;
-      margin: 20px;
-    }
-    .pair {
-      display: flex;
-      align-items: center;
-      margin-bottom: 8px;
-    }
-    .swatch {
-      width: 120px;
-      height: 60px;
-      border: 1px solid #ccc;
-    }
-    .hex {
-      width: 100px;
-      text-align: center;
-      margin: 0 8px;
-      font-family: monospace;
-    }
-    </style>
-    </head>
-    <body>
-    <h2>Color pairs</h2>
-    """
-
-    for i, (c1, c2) in enumerate(pairs, 1):
-        html += f"""
-    <div class="pair">
-      <div class="swatch" style="background:{c1}"></div>
-      <div class="hex">{c1}</div>
-      <div class="swatch" style="background:{c2}"></div>
-      <div class="hex">{c2}</div>
-    </div>
-    """
-    html += "</body></html>"
-    return html
-
-
-def generate():
-    cards = [
+def card_pairs() -> list[tuple[RGBDisplay, RGBDisplay]]:
+    return [
         # Identical yellow
         (RGBDisplay.from_8bit(255, 215, 0), RGBDisplay.from_8bit(255, 215, 0)),
         # Identical brown
@@ -186,6 +138,10 @@ def generate():
         # Lab76 distance 0.7
         (RGBDisplay.from_8bit(185, 134, 2), RGBDisplay.from_8bit(73, 4, 228)),
     ]
+
+
+def generate():
+    cards = card_pairs()
     print("Total cards:", len(cards))
     # for idx, (color1, color2) in enumerate(cards):
     #     print("%02d: %s  <->  %s" % (idx + 1, color1.to_hex(), color2.to_hex()))
@@ -223,13 +179,12 @@ def generate():
 
     # Write to temporary HTML and open in browser
     def write_to_html():
-        html = create_html([(c1.to_hex(), c2.to_hex()) for c1, c2 in cards])
         with tempfile.NamedTemporaryFile(
             "w", delete=False, suffix=".html", encoding="utf-8"
         ) as f:
-            f.write(html)
             temp_html_path = Path(f.name)
-            webbrowser.open_new_tab(temp_html_path.as_uri())
+        write_preview(str(temp_html_path), cards)
+        webbrowser.open_new_tab(temp_html_path.as_uri())
     write_to_html()
 
     def write_to_js():
@@ -21,13 +21,9 @@ from colors import (
 )
 
 
-def generate():
-    target_distance = 0.7
-    tolerance = 0.01
+def generate(target_distance: float = 0.7, tolerance: float = 0.01, max_iter: int = 1_000_000):
     found = None
 
-
-    max_iter = 1_000_000
     for ps in range(max_iter):
         c1 = RGBDisplay(
             random.random(),
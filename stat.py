@@ -1,21 +1,15 @@
 import math
-import matplotlib.pyplot as plt
+import sys
+
 import numpy as np
-from scipy.stats import pearsonr, spearmanr
-
-from colors import RGBDisplay, HSV, HLS
-from colors import (
-    rgbd_to_rgbl,
-    rgb_to_yiq,
-    rgb_to_hsv,
-    hsv_to_rgbd,
-    hsv_to_rgbl,
-    rgb_to_hls,
-    hls_to_rgbd,
-    hls_to_rgbl,
-    rgb_to_lab76,
-    rgb_to_lab2k,
-)
+
+from colors.bulk import unpack_pairs, unpack_rgb8
+from colors.metrics import all_distances, get_metric
+from study import PREDEFINED_PAIRS, packed_pair_key, parse_packed_color
+from study.bootstrap import bootstrap_correlations, format_report
+from study.evaluation import correlation_table, format_table
+from study.filtering import BLACKLISTED_SESSIONS, REASONS, session_verdicts
+from study.fitting import cross_validate, fit_metric, format_fit
 
 
 """
@@ -44,85 +38,40 @@ Lab ΔE2000 | Pearson r =  0.871 (p=1.82e-15),  Spearman ρ =  0.909 (p=1.11e-18
 
 INPUT_FILE = 'results/ratings-2025-11-06-15-33.tsv'
 
-MIN_SESSION_LENGTH = 15
-
-PREDEFINED_PAIRS = [
-    ['#FFD700', '#FFD700'],
-    ['#964600', '#964600'],
-    ['#14960A', '#14960A'],
-    ['#000000', '#FFFFFF'],
-    ['#FF0000', '#00FFFF'],
-    ['#0057B7', '#FFD700'],
-    ['#191919', '#E5E5E5'],
-    ['#333333', '#CCCCCC'],
-    ['#4C4C4C', '#B2B2B2'],
-    ['#666666', '#999999'],
-    ['#002FA7', '#00005C'],
-    ['#FF00FF', '#DF00FF'],
-    ['#C41E3A', '#DF73FF'],
-    ['#C3B091', '#BDB76B'],
-    ['#808000', '#9AB973'],
-    ['#40E0D0', '#99FF99'],
-    ['#FF7F50', '#B7410E'],
-    ['#964B00', '#D2B48C'],
-    ['#000080', '#0F52BA'],
-    ['#FFF8E7', '#FFFDD0'],
-    ['#BDFCC9', '#F5FFFA'],
-    ['#E6E6FA', '#D8BFD8'],
-    ['#FA8072', '#FFA07A'],
-    ['#FFD700', '#CC7722'],
-    ['#C0FF00', '#FFBA00'],
-    ['#FF7F7F', '#99FF7F'],
-    ['#2D77E5', '#E52D9C'],
-    ['#CBFF00', '#F4FFCC'],
-    ['#2800CC', '#9B8ECC'],
-    ['#11B252', '#6BB287'],
-    ['#A3BFCC', '#008ECC'],
-    ['#B2A0AB', '#B22379'],
-    ['#00FF66', '#004C1E'],
-    ['#E52D9C', '#661445'],
-    ['#CC923D', '#33240F'],
-    ['#E59C2D', '#7F5619'],
-    ['#5B92E5', '#284166'],
-    ['#CC8214', '#5B994C'],
-    ['#4C607F', '#E52D9C'],
-    ['#787878', '#828282'],
-    ['#F0F0E6', '#FAFAF0'],
-    ['#001900', '#E5FFE5'],
-    ['#111110', '#4016E5'],
-    ['#494854', '#ABF60D'],
-    ['#1AF000', '#0B09F2'],
-    ['#CB00D6', '#07EB1D'],
-    ['#B98602', '#4904E4'],
-]
+# Bootstrap of correlations: metrics, number of replicates and worker processes
+BOOTSTRAP_METRICS = ('rgbd', 'rgbl', 'hsv', 'lab76', 'lab2k')
+N_BOOTSTRAP = 2000
+BOOTSTRAP_WORKERS = 4
+
+# Parametric metrics fitted to the ratings, cross-validated by session
+FIT_METRICS = ('lab-weighted', 'yiq-weighted', 'hsv-weighted', 'lab2k-k')
 
 
 def predefined_set():
+    # Packed pair keys, see colors.bulk
     result = set()
     for pair in PREDEFINED_PAIRS:
-        a_rgb = parse_hex_color(pair[0])
-        b_rgb = parse_hex_color(pair[1])
-        if a_rgb > b_rgb:
-            a_rgb, b_rgb = b_rgb, a_rgb
-        if (a_rgb, b_rgb) in result:
+        key = packed_pair_key(parse_packed_color(pair[0]), parse_packed_color(pair[1]))
+        if key in result:
             print(f"Duplicate predefined pair: {pair[0]}, {pair[1]}")
-        result.add((a_rgb, b_rgb))
+        result.add(key)
     # print(f"Predefined orig pairs count: {len(PREDEFINED_PAIRS)}")
     # print(f"Predefined uniq pairs count: {len(result)}")
     return result
 
 
-def error_in_record(line, msg):
-    print(f"Error {msg} in line: {line}")
+def hex_color(packed: int) -> str:
+    return f"#{packed:06X}"
 
 
-def parse_hex_color(color) -> tuple[int, int, int]:
-    if len(color) != 7 or color[0] != '#':
-        raise ValueError("color must be in #RRGGBB format")
-    r = int(color[1:3], 16)
-    g = int(color[3:5], 16)
-    b = int(color[5:7], 16)
-    return r, g, b
+def pair_rgbd(keys) -> tuple[np.ndarray, np.ndarray]:
+    # Display sRGB arrays of the colors of packed pair keys
+    packed_a, packed_b = unpack_pairs(np.array(keys, dtype=np.uint64))
+    return unpack_rgb8(packed_a) / 255.0, unpack_rgb8(packed_b) / 255.0
+
+
+def error_in_record(line, msg):
+    print(f"Error {msg} in line: {line}")
 
 
 def row_stat(row):
@@ -147,7 +96,13 @@ def row_stat(row):
     return n, mean, stddev, t_n, t_mean, t_stddev
 
 
-def analyze():
+def analyze(input_file: str = INPUT_FILE, n_bootstrap: int = N_BOOTSTRAP, workers: int = BOOTSTRAP_WORKERS,
+            bootstrap_metrics=BOOTSTRAP_METRICS, fit_metrics=FIT_METRICS) -> dict:
+    """
+    Print the analysis of a ratings log, and return its results:
+    {'input_file', 'n_ratings', 'n_pairs', 'correlations': rows of correlation_table,
+     'bootstrap': the result of bootstrap_correlations or None, 'fits': [{'name', 'label', 'params', 'loss', 'cv'}]}.
+    """
     data = {}
     uniq_names = set()
     uniq_sessions = set()
@@ -155,9 +110,17 @@ def analyze():
 
     predefined = predefined_set()
 
+    # Columnar copy of the ratings for the session filter
+    session_codes = {}
+    pair_codes = {}
+    col_session = []
+    col_ts = []
+    col_pair = []
+    col_score = []
+
     n_lines = 0
     n_incorrect = 0
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+    with open(input_file, 'r', encoding='utf-8') as f:
         for line in f:
             n_lines += 1
             line = line.strip()
@@ -174,8 +137,8 @@ def analyze():
                 score = int(score_str)
                 if not (0 <= score <= 100):
                     raise ValueError("score out of range")
-                colorA_rgb = parse_hex_color(colorA)
-                colorB_rgb = parse_hex_color(colorB)
+                colorA_rgb = parse_packed_color(colorA)
+                colorB_rgb = parse_packed_color(colorB)
                 # Order colors consistently
                 if colorA_rgb > colorB_rgb:
                     colorA_rgb, colorB_rgb = colorB_rgb, colorA_rgb
@@ -199,6 +162,11 @@ def analyze():
             if session_length > longest_session_length:
                 longest_session_length = session_length
 
+            col_session.append(session_codes.setdefault(session_id, len(session_codes)))
+            col_ts.append(ts)
+            col_pair.append(pair_codes.setdefault(packed_pair_key(colorA_rgb, colorB_rgb), len(pair_codes)))
+            col_score.append(score)
+
     print(f"Total lines processed: {n_lines}")
     if n_incorrect > 0:
         print(f"Total incorrect lines: {n_incorrect}")
@@ -206,129 +174,60 @@ def analyze():
     print(f"Unique sessions (IP + name): {len(uniq_sessions)}")
     print(f"Longest session length (number of ratings): {longest_session_length}")
 
-    # Filter sessions, determined as untrusted
-    for session_id in data:
-        if session_id in (
-            ("Alex", "185.44.87.128"),  # low score for identical colors
-            ("nermosh", "31.146.201.207"),  # low score for identical colors
-            ("Andrew", "194.19.228.171"),  # low score for identical colors
-            ("FR", "89.248.83.23"),  # high score for different colors
-            ("Богдан Мазницький", "185.209.57.133"),  # high score for different colors
-        ):
-            # print(f"Session {session_id} is blacklisted: {data[session_id]}")
-            data[session_id] = []
-
-    # People with several sessions
-    # for name in data:
-    #     n_sessions = len(data[name])
-    #     if n_sessions > 1:
-    #         print(f"Participant '{name}' has {n_sessions} sessions.")
-
-    # Show very short sessions (less than MIN_SESSION_LENGTH ratings), and remove them
-    for session_id in data:
-        n_ratings = len(data[session_id])
-        if n_ratings and n_ratings < MIN_SESSION_LENGTH:
-            # print(f"Session {session_id} is too short with {n_ratings} ratings.")
-            # Remove short sessions
-            data[session_id] = []
-
-    # Show untrusted sessions, and remove them
-    for session_id in data:
-        if len(data[session_id]) == 0:
-            continue
-
-        scores = [record['score'] for record in data[session_id]]
-        assert len(scores) > 1
-
-        # First case: all scores are identical
-        if len(set(scores)) == 1:
-            print(f"Session {session_id} is untrusted with identical scores: {scores[0]}.")
-            data[session_id] = []
-            continue
-
-        # Second case: standard deviation of scores is very low
-        mean_score = sum(scores) / len(scores)
-        variance = sum((s - mean_score) ** 2 for s in scores) / (len(scores) - 1)
-        stddev = math.sqrt(variance)
-        # TODO: stddev > 50 is too high?
-        if stddev < 10.0:
-            print(f"Session {session_id} is untrusted with low score stddev: {stddev:.2f}.")
-            data[session_id] = []
-            continue
-
-        # Case 3: Frequency of clicks
-        timestamps = [x['ts'] for x in data[session_id]]
-        min_ts = min(timestamps)
-        max_ts = max(timestamps)
-        duration_sec = max_ts - min_ts
-        if duration_sec < 10:
-            print(f"Session {session_id} is untrusted with too short duration: {duration_sec} sec for {len(timestamps)} ratings.")
-            data[session_id] = []
-            continue
-
-        rate = len(timestamps) / duration_sec
-        if rate > 0.5:
-            print(f"Session {session_id} is untrusted with too high rate: {rate:.2f} ratings/sec, duration {duration_sec} sec for {len(timestamps)} ratings.")
-            data[session_id] = []
-            continue
-
-        # Case 4: too many neutral scores
-        count_50 = sum(1 for record in data[session_id] if record['score'] == 50)
-        if count_50 > len(data[session_id]) * 0.5:
-            print(f"Session {session_id} is untrusted with too many 50 scores: {count_50} out of {len(data[session_id])}.")
-            data[session_id] = []
+    # Filter sessions, determined as untrusted: blacklisted, very short (less than
+    # MIN_SESSION_LENGTH ratings), identical scores, low stddev, too short or too fast,
+    # too many neutral scores, the same pair rated very differently
+    session_ids = list(session_codes)
+    verdicts = session_verdicts(
+        col_session, col_ts, col_pair, col_score,
+        n_sessions=len(session_ids),
+        blacklisted=np.array([sid in BLACKLISTED_SESSIONS for sid in session_ids], dtype=bool),
+    )
+    for code, session_id in enumerate(session_ids):
+        if verdicts['trusted'][code]:
             continue
+        reason = REASONS[verdicts['reason'][code]]
+        n_ratings = verdicts['n'][code]
+        if reason == 'identical':
+            print(f"Session {session_id} is untrusted with identical scores: {verdicts['score_min'][code]:.0f}.")
+        elif reason == 'low_stddev':
+            print(f"Session {session_id} is untrusted with low score stddev: {verdicts['stddev'][code]:.2f}.")
+        elif reason == 'short_duration':
+            print(f"Session {session_id} is untrusted with too short duration: {verdicts['duration'][code]} sec for {n_ratings} ratings.")
+        elif reason == 'high_rate':
+            print(f"Session {session_id} is untrusted with too high rate: {verdicts['rate'][code]:.2f} ratings/sec, duration {verdicts['duration'][code]} sec for {n_ratings} ratings.")
+        elif reason == 'neutral':
+            print(f"Session {session_id} is untrusted with too many 50 scores: {verdicts['count_50'][code]} out of {n_ratings}.")
+        data[session_id] = []
 
     # Search for strange records
     close_pairs = {
-        ((120, 120, 120), (130, 130, 130)),
-        ((223, 0, 255), (255, 0, 255)),
-        ((240, 240, 230), (250, 250, 240)),
+        packed_pair_key(0x787878, 0x828282),
+        packed_pair_key(0xDF00FF, 0xFF00FF),
+        packed_pair_key(0xF0F0E6, 0xFAFAF0),
     }
 
     for session_id in data:
         for r in data[session_id]:
-            pair = (r['a'], r['b'])
+            pair = packed_pair_key(r['a'], r['b'])
             a = r['a']
             b = r['b']
             score = r['score']
 
             # Color pairs outside predefined set
             if pair not in predefined:
-                print(f"[!] Session {session_id} has non-predefined color pair: {pair[0]}, {pair[1]}")
+                print(f"[!] Session {session_id} has non-predefined color pair: {hex_color(a)}, {hex_color(b)}")
 
             # Identical colors but low score
             if a == b and score < 75:
-                print(f"SUSP - Session {session_id} has low score for identical colors: {a}, score: {score}")
+                print(f"SUSP - Session {session_id} has low score for identical colors: {hex_color(a)}, score: {score}")
                 continue
 
             # Different colors but high score
             if a != b and score == 100 and pair not in close_pairs:
-                print(f"SUSP - Session {session_id} has high score for different colors: {a}, {b}, score: {score}")
+                print(f"SUSP - Session {session_id} has high score for different colors: {hex_color(a)}, {hex_color(b)}, score: {score}")
                 continue
 
-    # Search when within session the same pair was rated very differently
-    for session_id in data:
-        pair_scores = {}
-        for r in data[session_id]:
-            pair = (r['a'], r['b'])
-            score = r['score']
-            if pair not in pair_scores:
-                pair_scores[pair] = []
-            pair_scores[pair].append(score)
-
-        badly_rated_n = 0
-        for pair in pair_scores:
-            scores = pair_scores[pair]
-            # If min and max differ more than by 50
-            if max(scores) - min(scores) >= 50:
-                # print(f"SUSP - Session {session_id} has inconsistent scores for pair {pair[0]}, {pair[1]}: scores = {scores}")
-                badly_rated_n += 1
-
-        # TODO: consider allowing one badly rated pair
-        if badly_rated_n > 1:
-            data[session_id] = []
-
     # print(data)
 
     # # Remove scores for identical colors
@@ -392,7 +291,7 @@ def analyze():
     pair_scores = {}
     for session_id in data:
         for r in data[session_id]:
-            pair = (r['a'], r['b'])
+            pair = packed_pair_key(r['a'], r['b'])
             score = r['score']
             if pair not in pair_scores:
                 pair_scores[pair] = []
@@ -410,36 +309,16 @@ def analyze():
         #     print(f"SUSP - Pair {pair[0]}, {pair[1]} has high t_stddev: {t_stddev:.2f} (mean={t_mean:.2f})")
         distances[pair] = {'human': t_mean}
 
-    # Calculate distances
-    for pair in distances:
-        a_rgbd = RGBDisplay.from_8bit(pair[0][0], pair[0][1], pair[0][2])
-        b_rgbd = RGBDisplay.from_8bit(pair[1][0], pair[1][1], pair[1][2])
-        rgbd_dist = a_rgbd.distance(b_rgbd)
-
-        a_rgbl = rgbd_to_rgbl(a_rgbd)
-        b_rgbl = rgbd_to_rgbl(b_rgbd)
-        rgbl_dist = a_rgbl.distance(b_rgbl)
-
-        a_hsv = rgb_to_hsv(a_rgbl)
-        b_hsv = rgb_to_hsv(b_rgbl)
-        hsv_dist = a_hsv.distance(b_hsv)
-
-        a_lab76 = rgb_to_lab76(a_rgbl)
-        b_lab76 = rgb_to_lab76(b_rgbl)
-        lab76_dist = a_lab76.distance(b_lab76)
-
-        a_lab2k = rgb_to_lab2k(a_rgbl)
-        b_lab2k = rgb_to_lab2k(b_rgbl)
-        lab2k_dist = a_lab2k.distance(b_lab2k)
-
-        distances[pair]['rgbd'] = rgbd_dist
-        distances[pair]['rgbl'] = rgbl_dist
-        distances[pair]['hsv'] = hsv_dist
-        distances[pair]['lab76'] = lab76_dist
-        distances[pair]['lab2k'] = lab2k_dist
+    # Calculate distances by every registered metric, in one batch pass
+    pairs = list(distances)
+    rgbd_a, rgbd_b = pair_rgbd(pairs)
+    human = np.array([distances[pair]['human'] for pair in pairs])
+    metric_distances = all_distances(rgbd_a, rgbd_b)
 
     # Show correlation
     def show_correlation(x_values, y_values, x_label, y_label):
+        import matplotlib.pyplot as plt  # slow to import, only for the plots
+
         plt.figure(figsize=(6,6))
         plt.scatter(x_values, y_values, alpha=0.5)
         plt.xlabel(x_label)
@@ -449,55 +328,72 @@ def analyze():
         plt.tight_layout()
         plt.show()
 
-    rgbd_x = []
-    rgbd_y = []
-    rgbl_x = []
-    rgbl_y = []
-    hsv_x = []
-    hsv_y = []
-    lab76_x = []
-    lab76_y = []
-    lab2k_x = []
-    lab2k_y = []
-    for pair in distances:
-        human_dist = distances[pair]['human']
-        rgbd_dist = distances[pair]['rgbd']
-        rgbl_dist = distances[pair]['rgbl']
-        hsv_dist = distances[pair]['hsv']
-        lab76_dist = distances[pair]['lab76']
-        lab2k_dist = distances[pair]['lab2k']
-
-        rgbd_x.append(rgbd_dist)
-        rgbd_y.append(human_dist)
-
-        rgbl_x.append(rgbl_dist)
-        rgbl_y.append(human_dist)
-
-        hsv_x.append(hsv_dist)
-        hsv_y.append(human_dist)
-
-        lab76_x.append(lab76_dist)
-        lab76_y.append(human_dist)
-
-        lab2k_x.append(lab2k_dist)
-        lab2k_y.append(human_dist)
-    # show_correlation(rgbd_x, rgbd_y, "RGBD Distance", "Human Perceived Distance")
-    # show_correlation(rgbl_x, rgbl_y, "RGBL Distance", "Human Perceived Distance")
-    # show_correlation(hsv_x, hsv_y, "HSV Distance", "Human Perceived Distance")
-    # show_correlation(lab76_x, lab76_y, "ΔE76 Distance", "Human Perceived Distance")
-    # show_correlation(lab2k_x, lab2k_y, "ΔE2000 Distance", "Human Perceived Distance")
-
-    def corr_summary(name, x, y):
-        pearson_r, pearson_p = pearsonr(x, y)
-        spearman_r, spearman_p = spearmanr(x, y)
-        print(f"{name:10s} | Pearson r = {pearson_r:6.3f} (p={pearson_p:.2e}),  Spearman ρ = {spearman_r:6.3f} (p={spearman_p:.2e})")
-
-    corr_summary("RGBD", rgbd_x, rgbd_y)
-    corr_summary("RGBL", rgbl_x, rgbl_y)
-    corr_summary("HSV", hsv_x, hsv_y)
-    corr_summary("Lab ΔE76", lab76_x, lab76_y)
-    corr_summary("Lab ΔE2000", lab2k_x, lab2k_y)
+    # show_correlation(metric_distances['rgbd'], human, "RGBD Distance", "Human Perceived Distance")
+    # show_correlation(metric_distances['lab2k'], human, "ΔE2000 Distance", "Human Perceived Distance")
+
+    # All registered metrics, best first
+    report = {
+        'input_file': input_file,
+        'n_ratings': len(just_scores),
+        'n_pairs': len(pairs),
+        'correlations': correlation_table(metric_distances, human),
+        'bootstrap': None,
+        'fits': [],
+    }
+    for line in format_table(report['correlations']):
+        print(line)
+
+    # Confidence intervals: resample sessions, recompute per-pair trimmed means and correlations
+    trusted = verdicts['trusted'][np.asarray(col_session)]
+    pair_index = [pair_codes[pair] for pair in pairs]
+    boot_distances = {}
+    for name in bootstrap_metrics if n_bootstrap else ():
+        values = np.zeros(len(pair_codes))
+        values[pair_index] = metric_distances[name]
+        boot_distances[name] = values
+    if boot_distances:
+        report['bootstrap'] = bootstrap_correlations(
+            np.asarray(col_session)[trusted],
+            np.asarray(col_pair)[trusted],
+            np.asarray(col_score)[trusted],
+            boot_distances,
+            n_boot=n_bootstrap,
+            workers=workers,
+        )
+        labels = {name: get_metric(name).label for name in boot_distances}
+        print()
+        for line in format_report(report['bootstrap'], labels):
+            print(line)
+
+    # Fit parametric metrics to all trusted ratings, and check them on held-out sessions
+    all_pairs = list(pair_codes)
+    all_a, all_b = pair_rgbd(all_pairs)
+    all_human = np.full(len(all_pairs), np.nan)
+    all_human[pair_index] = human
+    counts = np.zeros(len(all_pairs))
+    counts[pair_index] = [len(pair_scores[pair]) for pair in pairs]
+    if fit_metrics:
+        print()
+    for name in fit_metrics:
+        fitted = fit_metric(name, all_a, all_b, all_human, weights=counts)
+        cv = cross_validate(
+            name,
+            np.asarray(col_session)[trusted],
+            np.asarray(col_pair)[trusted],
+            np.asarray(col_score)[trusted],
+            all_a, all_b,
+        )
+        for line in format_fit(fitted, cv):
+            print(line)
+        report['fits'].append({
+            'name': name,
+            'label': fitted.metric.label,
+            'params': fitted.params,
+            'loss': fitted.loss,
+            'cv': {'folds': len(cv['folds']), 'test': cv['test'], 'base': cv['base']},
+        })
+    return report
 
 
 if __name__ == "__main__":
-    analyze()
+    analyze(*sys.argv[1:2])
@@ -0,0 +1,23 @@
+from .pairs import PREDEFINED_PAIRS, parse_hex_color, parse_packed_color, pair_key, packed_pair_key, read_ratings
+from .aggregate import PairStat, LiveStats, model_distances
+from .scheduler import PairScheduler
+from .metrics import Metrics
+from .sessions import SessionState, SessionMonitor
+
+
+
+__all__ = [
+    "PREDEFINED_PAIRS",
+    "parse_hex_color",
+    "parse_packed_color",
+    "pair_key",
+    "packed_pair_key",
+    "read_ratings",
+    "PairStat",
+    "LiveStats",
+    "model_distances",
+    "PairScheduler",
+    "Metrics",
+    "SessionState",
+    "SessionMonitor",
+]
@@ -0,0 +1,215 @@
+"""
+Running per-pair aggregates of ratings, and their correlation with the color models.
+"""
+import math
+import threading
+
+from colors import RGBDisplay
+from colors import (
+    rgbd_to_rgbl,
+    rgb_to_hsv,
+    rgb_to_lab76,
+    rgb_to_lab2k,
+)
+from .pairs import pair_key, parse_hex_color, read_ratings
+
+
+# Pairs with fewer ratings are not used for correlations
+MIN_PAIR_RATINGS = 5
+
+
+class PairStat:
+    """
+    Running count, mean and variance of the scores of one pair (Welford's algorithm),
+    plus the histogram of scores, which gives trimmed statistics without keeping the scores.
+    Scores are integers in [0..100].
+    """
+    __slots__ = ("count", "mean", "m2", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.histogram = [0] * 101
+
+    def add(self, score: int):
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+        self.histogram[score] += 1
+
+    def variance(self) -> float:
+        """
+        Sample variance, 0.0 for less than two scores.
+        """
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    def trimmed(self) -> tuple[int, float, float]:
+        """
+        Count, mean and stddev with the top and bottom 10% of scores removed
+        (the same trimming as stat.row_stat).
+        """
+        lo = self.count // 10
+        hi = self.count - self.count // 10
+        t_n = 0
+        t_sum = 0.0
+        t_sum2 = 0.0
+        pos = 0
+        for score, c in enumerate(self.histogram):
+            if c == 0:
+                continue
+            kept = min(pos + c, hi) - max(pos, lo)
+            pos += c
+            if kept <= 0:
+                if pos >= hi:
+                    break
+                continue
+            t_n += kept
+            t_sum += kept * score
+            t_sum2 += kept * score * score
+        if t_n == 0:
+            return 0, 0.0, 0.0
+        t_mean = t_sum / t_n
+        t_variance = max(t_sum2 / t_n - t_mean ** 2, 0.0)
+        return t_n, t_mean, math.sqrt(t_variance)
+
+
+# Distances of a pair by every color model, the same ones as in stat.py
+def model_distances(color_a: str, color_b: str) -> dict[str, float]:
+    a_rgbd = RGBDisplay.from_8bit(*parse_hex_color(color_a))
+    b_rgbd = RGBDisplay.from_8bit(*parse_hex_color(color_b))
+    a_rgbl = rgbd_to_rgbl(a_rgbd)
+    b_rgbl = rgbd_to_rgbl(b_rgbd)
+    return {
+        'rgbd': a_rgbd.distance(b_rgbd),
+        'rgbl': a_rgbl.distance(b_rgbl),
+        'hsv': rgb_to_hsv(a_rgbl).distance(rgb_to_hsv(b_rgbl)),
+        'lab76': rgb_to_lab76(a_rgbl).distance(rgb_to_lab76(b_rgbl)),
+        'lab2k': rgb_to_lab2k(a_rgbl).distance(rgb_to_lab2k(b_rgbl)),
+    }
+
+
+def pearson(x: list[float], y: list[float]) -> float:
+    n = len(x)
+    if n < 2:
+        return math.nan
+    mx = sum(x) / n
+    my = sum(y) / n
+    sxy = sum((a - mx) * (b - my) for a, b in zip(x, y))
+    sxx = sum((a - mx) ** 2 for a in x)
+    syy = sum((b - my) ** 2 for b in y)
+    if sxx == 0 or syy == 0:
+        return math.nan
+    return sxy / math.sqrt(sxx * syy)
+
+
+def ranks(values: list[float]) -> list[float]:
+    # Average ranks for ties, like scipy.stats.rankdata
+    order = sorted(range(len(values)), key=values.__getitem__)
+    result = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            result[order[k]] = (i + j) / 2.0 + 1
+        i = j + 1
+    return result
+
+
+def spearman(x: list[float], y: list[float]) -> float:
+    return pearson(ranks(x), ranks(y))
+
+
+class LiveStats:
+    """
+    In-memory aggregate of all ratings, updated on every submit.
+    `summary()` touches only the per-pair aggregates, not the ratings log.
+    """
+    def __init__(self, min_pair_ratings: int = MIN_PAIR_RATINGS):
+        self.min_pair_ratings = min_pair_ratings
+        self.n_ratings = 0
+        self.stats = {}
+        self.distances = {}
+        self._lock = threading.Lock()
+
+    def seed(self, path: str) -> int:
+        """
+        Load scores from a ratings log.  Returns the number of used records.
+        """
+        n = 0
+        for _ip, _ts, _name, colorA, colorB, score in read_ratings(path):
+            if self.add(colorA, colorB, score):
+                n += 1
+        return n
+
+    def add(self, color_a: str, color_b: str, score: int) -> bool:
+        """
+        Register a rating.  Returns False if the colors are malformed.
+        """
+        try:
+            key = pair_key(color_a, color_b)
+        except ValueError:
+            return False
+        with self._lock:
+            stat = self.stats.get(key)
+            if stat is None:
+                # Model distances are computed once, when the pair is seen first
+                stat = self.stats[key] = PairStat()
+                self.distances[key] = model_distances(*key)
+            stat.add(score)
+            self.n_ratings += 1
+        return True
+
+    def summary(self) -> dict:
+        """
+        Per-pair aggregates and the correlation of every model with human distances.
+        Human distance of a pair is its trimmed mean score mapped from [100, 0] to 0..1.
+        """
+        with self._lock:
+            pairs = []
+            human = []
+            models = {}
+            for key, stat in self.stats.items():
+                t_n, t_mean, t_stddev = stat.trimmed()
+                hist = stat.histogram
+                pairs.append({
+                    'a': key[0],
+                    'b': key[1],
+                    'n': stat.count,
+                    'mean': stat.mean,
+                    'variance': stat.variance(),
+                    'trimmed_n': t_n,
+                    'trimmed_mean': t_mean,
+                    'trimmed_stddev': t_stddev,
+                    # Scores in bins of 10, the last bin includes 100
+                    'histogram': [sum(hist[i:i + 10]) for i in range(0, 90, 10)] + [sum(hist[90:])],
+                    'distances': self.distances[key],
+                })
+                if stat.count < self.min_pair_ratings:
+                    continue
+                human.append((100 - t_mean) / 100.0)
+                for name, d in self.distances[key].items():
+                    models.setdefault(name, []).append(d)
+            n_ratings = self.n_ratings
+
+        correlation = {}
+        for name, x in models.items():
+            r = pearson(x, human)
+            rho = spearman(x, human)
+            # NaN is not valid JSON
+            correlation[name] = {
+                'pearson': None if math.isnan(r) else r,
+                'spearman': None if math.isnan(rho) else rho,
+            }
+        return {
+            'n_ratings': n_ratings,
+            'n_pairs': len(pairs),
+            'n_correlated_pairs': len(human),
+            'pairs': pairs,
+            'correlation': correlation,
+        }
@@ -0,0 +1,182 @@
+"""
+Bootstrap confidence intervals for the correlation of color metrics with human ratings.
+
+Sessions (not individual ratings) are resampled with replacement: ratings of one
+participant are correlated, so a session is the independent unit.  Scores are
+integers, so every session is reduced to a (pairs, 101) histogram once; a bootstrap
+replicate is then a weighted sum of session histograms, and per-pair trimmed means
+(the same trimming as stat.row_stat) come from cumulative histogram counts.
+Replicates are processed in chunks, optionally in a process pool.
+"""
+import concurrent.futures
+import itertools
+
+import numpy as np
+from scipy.stats import rankdata
+
+
+N_BOOTSTRAP = 2000
+CHUNK_SIZE = 250
+SCORE_VALUES = np.arange(101, dtype=np.float64)
+
+
+def session_histograms(sessions, pairs, scores, n_pairs: int) -> np.ndarray:
+    """
+    Counts of every score per session and pair, shape (sessions, pairs, 101).
+    Session codes are compacted, so they do not need to be contiguous.
+    """
+    _, sessions = np.unique(np.asarray(sessions), return_inverse=True)
+    n_sessions = int(sessions.max()) + 1 if len(sessions) else 0
+    flat = (sessions * n_pairs + np.asarray(pairs)) * 101 + np.asarray(scores)
+    hist = np.bincount(flat, minlength=n_sessions * n_pairs * 101)
+    return hist.reshape(n_sessions, n_pairs, 101).astype(np.float64)
+
+
+def trimmed_human_distance(hist: np.ndarray) -> np.ndarray:
+    """
+    Human distance of every pair from score histograms (..., pairs, 101):
+    the trimmed mean score (top and bottom 10% removed), mapped from [100, 0] to 0..1.
+    NaN where a pair has less than two scores left after trimming.
+    """
+    n = hist.sum(axis=-1, keepdims=True)
+    lo = np.floor(n / 10)
+    hi = n - lo
+    upto = np.cumsum(hist, axis=-1)
+    before = upto - hist
+    kept = np.clip(np.minimum(upto, hi) - np.maximum(before, lo), 0, None)
+    t_n = kept.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_mean = (kept * SCORE_VALUES).sum(axis=-1) / t_n
+    t_mean[t_n < 2] = np.nan
+    return (100 - t_mean) / 100.0
+
+
+def _masked_pearson(x: np.ndarray, y: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # Pearson r along the last axis, only where mask is set
+    k = mask.sum(axis=-1)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+    mx = x.sum(axis=-1, keepdims=True) / k[..., None]
+    my = y.sum(axis=-1, keepdims=True) / k[..., None]
+    dx = np.where(mask, x - mx, 0.0)
+    dy = np.where(mask, y - my, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (dx * dy).sum(axis=-1) / np.sqrt((dx * dx).sum(axis=-1) * (dy * dy).sum(axis=-1))
+
+
+def _masked_ranks(x: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # Average ranks along the last axis among the masked values; the others go last
+    return rankdata(np.where(mask, x, np.inf), axis=-1)
+
+
+def correlations(human: np.ndarray, distances: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pearson and Spearman correlation of every metric with human distances.
+    human: (replicates, pairs), NaN for missing pairs
+    distances: (metrics, pairs)
+    Returns two arrays (replicates, metrics).
+    """
+    mask = ~np.isnan(human)
+    human_ranks = _masked_ranks(human, mask)
+    pearson = np.empty((human.shape[0], distances.shape[0]))
+    spearman = np.empty_like(pearson)
+    for m, d in enumerate(distances):
+        d = np.broadcast_to(d, human.shape)
+        pearson[:, m] = _masked_pearson(d, human, mask)
+        spearman[:, m] = _masked_pearson(_masked_ranks(d, mask), human_ranks, mask)
+    return pearson, spearman
+
+
+# Per-process state of the pool workers, set once by the initializer
+_worker_hist = None
+_worker_distances = None
+
+
+def _init_worker(hist, distances):
+    global _worker_hist, _worker_distances
+    _worker_hist = hist
+    _worker_distances = distances
+
+
+def _bootstrap_chunk(args):
+    n_boot, seed = args
+    rng = np.random.default_rng(seed)
+    n_sessions, n_pairs, _ = _worker_hist.shape
+    weights = rng.multinomial(n_sessions, np.full(n_sessions, 1.0 / n_sessions), size=n_boot)
+    pair_hist = (weights @ _worker_hist.reshape(n_sessions, -1)).reshape(n_boot, n_pairs, 101)
+    return correlations(trimmed_human_distance(pair_hist), _worker_distances)
+
+
+def bootstrap_correlations(sessions, pairs, scores, distances: dict,
+                           n_boot: int = N_BOOTSTRAP, workers: int = 1, seed: int = 0,
+                           alpha: float = 0.05, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Bootstrap the correlation of every metric with human distances.
+
+    sessions, pairs, scores: one entry per (trusted) rating; pair codes index the
+    distance arrays; scores are raw [0..100].
+    distances: metric name -> array of distances, indexed by pair code.
+    workers: number of processes, 1 runs in this process.
+
+    Returns {'metrics': {name: {'pearson': (r, lo, hi), 'spearman': (rho, lo, hi)}},
+             'differences': {(a, b): {'pearson': (diff, lo, hi, p), 'spearman': ...}}},
+    with (1 - alpha) percentile intervals and two-sided bootstrap p-values of a - b.
+    """
+    names = list(distances)
+    dist = np.array([np.asarray(distances[name], dtype=np.float64) for name in names])
+    hist = session_histograms(sessions, pairs, scores, dist.shape[1])
+
+    point_pearson, point_spearman = correlations(trimmed_human_distance(hist.sum(axis=0))[None, :], dist)
+
+    chunks = []
+    seeds = np.random.SeedSequence(seed).spawn((n_boot + chunk_size - 1) // chunk_size)
+    for i, ss in enumerate(seeds):
+        chunks.append((min(chunk_size, n_boot - i * chunk_size), ss))
+    if workers == 1:
+        _init_worker(hist, dist)
+        results = [_bootstrap_chunk(chunk) for chunk in chunks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(hist, dist),
+        ) as pool:
+            results = list(pool.map(_bootstrap_chunk, chunks))
+    boot = {
+        'pearson': np.concatenate([r[0] for r in results]),
+        'spearman': np.concatenate([r[1] for r in results]),
+    }
+    point = {'pearson': point_pearson[0], 'spearman': point_spearman[0]}
+
+    q = (100 * alpha / 2, 100 * (1 - alpha / 2))
+    result = {'n_boot': n_boot, 'alpha': alpha, 'metrics': {}, 'differences': {}}
+    for m, name in enumerate(names):
+        result['metrics'][name] = {}
+        for kind in ('pearson', 'spearman'):
+            lo, hi = np.nanpercentile(boot[kind][:, m], q)
+            result['metrics'][name][kind] = (float(point[kind][m]), float(lo), float(hi))
+    for (i, a), (j, b) in itertools.combinations(enumerate(names), 2):
+        result['differences'][(a, b)] = {}
+        for kind in ('pearson', 'spearman'):
+            diff = boot[kind][:, i] - boot[kind][:, j]
+            diff = diff[~np.isnan(diff)]
+            lo, hi = np.percentile(diff, q)
+            p = min(1.0, 2 * min(np.mean(diff <= 0), np.mean(diff >= 0)))
+            result['differences'][(a, b)][kind] = (
+                float(point[kind][i] - point[kind][j]), float(lo), float(hi), float(p),
+            )
+    return result
+
+
+def format_report(result: dict, labels: dict = None) -> list[str]:
+    """
+    Human-readable lines: CIs per metric, then metric differences.
+    """
+    labels = labels or {}
+    lines = [f"Bootstrap over sessions, {result['n_boot']} replicates, {100 * (1 - result['alpha']):.0f}% CI"]
+    for name, r in result['metrics'].items():
+        p, s = r['pearson'], r['spearman']
+        lines.append(f"{labels.get(name, name):10s} | Pearson r = {p[0]:6.3f} [{p[1]:6.3f}, {p[2]:6.3f}],  Spearman ρ = {s[0]:6.3f} [{s[1]:6.3f}, {s[2]:6.3f}]")
+    for (a, b), r in result['differences'].items():
+        p, s = r['pearson'], r['spearman']
+        label = f"{labels.get(a, a)} - {labels.get(b, b)}"
+        lines.append(f"{label:23s} | Δr = {p[0]:6.3f} [{p[1]:6.3f}, {p[2]:6.3f}] p={p[3]:.3f},  Δρ = {s[0]:6.3f} [{s[1]:6.3f}, {s[2]:6.3f}] p={s[3]:.3f}")
+    return lines
@@ -0,0 +1,98 @@
+"""
+Comparative evaluation of the registered color metrics against human ratings.
+"""
+import numpy as np
+from scipy.stats import pearsonr, spearmanr
+
+from colors.bulk import unpack_pairs, unpack_rgb8
+from colors.metrics import all_distances, get_metric
+from study.bootstrap import trimmed_human_distance
+from study.filtering import BLACKLISTED_SESSIONS, session_verdicts
+from study.pairs import packed_pair_key, parse_packed_color, read_ratings
+
+
+def load_pair_table(path: str, blacklisted=BLACKLISTED_SESSIONS) -> dict:
+    """
+    Read a ratings log, drop untrusted sessions and aggregate the scores per pair,
+    the same way as stat.py.
+
+    Returns {'rgbd_a', 'rgbd_b': display sRGB arrays (pairs, 3) in [0..1],
+             'human': trimmed human distance per pair (NaN with less than two scores left),
+             'counts': trusted ratings per pair,
+             'sessions', 'pairs', 'scores': the trusted ratings, pair codes index the pair arrays}.
+    """
+    session_codes = {}
+    pair_codes = {}
+    rows = []
+    for ip, ts, name, color_a, color_b, score in read_ratings(path):
+        pair = packed_pair_key(parse_packed_color(color_a), parse_packed_color(color_b))
+        rows.append((
+            session_codes.setdefault((name, ip), len(session_codes)),
+            ts,
+            pair_codes.setdefault(pair, len(pair_codes)),
+            score,
+        ))
+    sessions, ts, pairs, scores = np.array(rows, dtype=np.int64).reshape(-1, 4).T
+    verdicts = session_verdicts(
+        sessions, ts, pairs, scores,
+        n_sessions=len(session_codes),
+        blacklisted=np.array([sid in blacklisted for sid in session_codes], dtype=bool),
+    )
+    trusted = verdicts['trusted'][sessions]
+    sessions, pairs, scores = sessions[trusted], pairs[trusted], scores[trusted]
+
+    n_pairs = len(pair_codes)
+    hist = np.bincount(pairs * 101 + scores, minlength=n_pairs * 101).reshape(n_pairs, 101).astype(np.float64)
+    packed_a, packed_b = unpack_pairs(np.array(list(pair_codes), dtype=np.uint64))
+    return {
+        'rgbd_a': unpack_rgb8(packed_a) / 255.0,
+        'rgbd_b': unpack_rgb8(packed_b) / 255.0,
+        'human': trimmed_human_distance(hist),
+        'counts': hist.sum(axis=1),
+        'sessions': sessions,
+        'pairs': pairs,
+        'scores': scores,
+    }
+
+
+def evaluate_metrics(rgbd_a, rgbd_b, human, names=None, rank_by: str = 'spearman') -> list[dict]:
+    """
+    Correlate every registered metric (or the `names` ones) with human distances.
+
+    rgbd_a, rgbd_b: display sRGB of the pairs, arrays (pairs, 3) in [0..1]
+    human: human distance of every pair, 0..1
+    Returns rows {name, label, pearson, pearson_p, spearman, spearman_p},
+    best first by `rank_by`.
+    """
+    return correlation_table(all_distances(rgbd_a, rgbd_b, names), human, rank_by)
+
+
+def correlation_table(distances: dict, human, rank_by: str = 'spearman') -> list[dict]:
+    """
+    The same as evaluate_metrics, for already computed distances {metric name: array}.
+    """
+    human = np.asarray(human, dtype=np.float64)
+    rows = []
+    for name, d in distances.items():
+        pearson_r, pearson_p = pearsonr(d, human)
+        spearman_r, spearman_p = spearmanr(d, human)
+        rows.append({
+            'name': name,
+            'label': get_metric(name).label,
+            'pearson': float(pearson_r),
+            'pearson_p': float(pearson_p),
+            'spearman': float(spearman_r),
+            'spearman_p': float(spearman_p),
+        })
+    rows.sort(key=lambda row: row[rank_by], reverse=True)
+    return rows
+
+
+def format_table(rows: list[dict]) -> list[str]:
+    lines = []
+    for rank, row in enumerate(rows, 1):
+        lines.append(
+            f"{rank:2d}. {row['label']:13s} | Pearson r = {row['pearson']:6.3f} (p={row['pearson_p']:.2e}),"
+            f"  Spearman ρ = {row['spearman']:6.3f} (p={row['spearman_p']:.2e})"
+        )
+    return lines
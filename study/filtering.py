@@ -0,0 +1,132 @@
+"""
+Vectorized filter of untrusted sessions for offline analysis (stat.py).
+
+All heuristics are evaluated in one grouped computation over columnar arrays:
+rows are sorted by session once, and per-session aggregates come from
+np.*.reduceat over the session boundaries.
+"""
+import numpy as np
+
+from .sessions import (
+    MIN_SESSION_LENGTH,
+    MIN_SCORE_STDDEV,
+    MIN_SESSION_DURATION,
+    MAX_RATING_RATE,
+    MAX_NEUTRAL_SHARE,
+    INCONSISTENT_SCORE_RANGE,
+    MAX_INCONSISTENT_PAIRS,
+)
+
+
+# Reasons, in the order they are checked.  A session gets the first one which applies.
+BLACKLISTED = "blacklisted"
+SHORT = "short"
+IDENTICAL = "identical"
+LOW_STDDEV = "low_stddev"
+SHORT_DURATION = "short_duration"
+HIGH_RATE = "high_rate"
+NEUTRAL = "neutral"
+INCONSISTENT = "inconsistent"
+REASONS = (BLACKLISTED, SHORT, IDENTICAL, LOW_STDDEV, SHORT_DURATION, HIGH_RATE, NEUTRAL, INCONSISTENT)
+
+# Sessions, determined as untrusted manually
+BLACKLISTED_SESSIONS = (
+    ("Alex", "185.44.87.128"),  # low score for identical colors
+    ("nermosh", "31.146.201.207"),  # low score for identical colors
+    ("Andrew", "194.19.228.171"),  # low score for identical colors
+    ("FR", "89.248.83.23"),  # high score for different colors
+    ("Богдан Мазницький", "185.209.57.133"),  # high score for different colors
+)
+
+
+def session_verdicts(sessions, ts, pairs, scores, n_sessions: int, blacklisted=None) -> dict:
+    """
+    Judge every session.
+
+    sessions: session code of each rating, integers in [0..n_sessions)
+    ts: timestamp of each rating, seconds
+    pairs: pair code of each rating (any non-negative integers)
+    scores: raw score of each rating, [0..100]
+    blacklisted: optional boolean array (n_sessions,)
+
+    Returns a table of per-session arrays (indexed by session code):
+    n, score_min, score_max, stddev, duration, rate, count_50, n_inconsistent,
+    reason (index into REASONS, -1 if trusted) and trusted.
+    """
+    sessions = np.asarray(sessions, dtype=np.int64)
+    ts = np.asarray(ts, dtype=np.int64)
+    pairs = np.asarray(pairs, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.float64)
+
+    n = np.bincount(sessions, minlength=n_sessions)
+    present = n > 0
+
+    # Group rows by session
+    order = np.argsort(sessions, kind='stable')
+    s_scores = scores[order]
+    s_ts = ts[order]
+    starts = np.concatenate(([0], np.cumsum(n)[:-1]))[present]
+
+    def per_session(values, ufunc, fill):
+        out = np.full(n_sessions, fill, dtype=values.dtype)
+        if len(values):
+            out[present] = ufunc.reduceat(values, starts)
+        return out
+
+    score_min = per_session(s_scores, np.minimum, 0.0)
+    score_max = per_session(s_scores, np.maximum, 0.0)
+    score_sum = per_session(s_scores, np.add, 0.0)
+    score_sum2 = per_session(s_scores * s_scores, np.add, 0.0)
+    ts_min = per_session(s_ts, np.minimum, 0)
+    ts_max = per_session(s_ts, np.maximum, 0)
+    count_50 = per_session((s_scores == 50).astype(np.int64), np.add, 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = (score_sum2 - score_sum ** 2 / n) / (n - 1)
+        stddev = np.sqrt(np.maximum(variance, 0.0))
+        duration = ts_max - ts_min
+        rate = n / duration
+
+    # Inconsistent pairs: group rows by (session, pair)
+    n_pairs = int(pairs.max()) + 1 if len(pairs) else 1
+    group = sessions * n_pairs + pairs
+    g_order = np.argsort(group, kind='stable')
+    g_sorted = group[g_order]
+    g_scores = scores[g_order]
+    g_starts = np.flatnonzero(np.concatenate(([True], g_sorted[1:] != g_sorted[:-1]))) if len(group) else np.zeros(0, dtype=np.int64)
+    n_inconsistent = np.zeros(n_sessions, dtype=np.int64)
+    if len(g_starts):
+        g_range = np.maximum.reduceat(g_scores, g_starts) - np.minimum.reduceat(g_scores, g_starts)
+        g_session = g_sorted[g_starts] // n_pairs
+        n_inconsistent = np.bincount(
+            g_session, weights=g_range >= INCONSISTENT_SCORE_RANGE, minlength=n_sessions,
+        ).astype(np.int64)
+
+    if blacklisted is None:
+        blacklisted = np.zeros(n_sessions, dtype=bool)
+    checks = (
+        np.asarray(blacklisted, dtype=bool),
+        present & (n < MIN_SESSION_LENGTH),
+        score_min == score_max,
+        stddev < MIN_SCORE_STDDEV,
+        duration < MIN_SESSION_DURATION,
+        rate > MAX_RATING_RATE,
+        count_50 > n * MAX_NEUTRAL_SHARE,
+        n_inconsistent > MAX_INCONSISTENT_PAIRS,
+    )
+    reason = np.full(n_sessions, -1, dtype=np.int64)
+    for i in reversed(range(len(checks))):
+        reason[checks[i] & present] = i
+
+    return {
+        'n': n,
+        'score_min': score_min,
+        'score_max': score_max,
+        'stddev': stddev,
+        'duration': duration,
+        'rate': rate,
+        'count_50': count_50,
+        'n_inconsistent': n_inconsistent,
+        'reason': reason,
+        'trusted': present & (reason < 0),
+    }
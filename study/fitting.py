@@ -0,0 +1,270 @@
+"""
+Fitting parametrized color metrics to human ratings.
+
+A parametric metric is a registered metric (its conversion path from display sRGB)
+with free parameters in the distance: weights of the model axes, or the kL, kC, kH
+factors of ΔE2000.  The raw distance d is mapped to the human scale 0..1 by a
+saturating curve 1 - exp(-(d / scale) ** gamma), which is fitted too.
+
+Conversions and per-pair terms are computed once; the loss (weighted squared error
+against the per-pair human distances) is evaluated on whole arrays.  All parameters
+are positive and are optimized in log space.  One parameter of every metric is fixed
+at 1: scaling all weights (or all k factors) is the same as changing `scale`.
+
+Cross-validation splits sessions, not ratings, into folds: the metric is fitted on
+the trimmed per-pair means of the training sessions and scored against those of the
+held-out sessions.
+"""
+import math
+
+import numpy as np
+from scipy.optimize import minimize
+from scipy.stats import pearsonr, spearmanr
+
+from colors import batch
+from colors.metrics import get_metric
+from colors.models import YIQ, HSV, Lab
+from study.bootstrap import session_histograms, trimmed_human_distance
+
+
+CV_FOLDS = 5
+NORMALIZATION_PARAMS = ('scale', 'gamma')
+LOG_BOUND = math.log(1e3)
+
+
+def _axes_prepare(a, b):
+    return (a - b) ** 2
+
+
+def _cylinder_prepare(a, b):
+    d = np.abs(a - b)
+    d[..., 0] = np.minimum(d[..., 0], 1.0 - d[..., 0])
+    return d ** 2
+
+
+def _weighted_axes(params, prepared):
+    w0, w1, w2 = params
+    return np.sqrt(prepared[..., 0] * w0 + prepared[..., 1] * w1 + prepared[..., 2] * w2)
+
+
+def _delta_e2000_k(params, prepared):
+    kL, kC, kH = params
+    return batch.delta_e2000(prepared[0], prepared[1], kL, kC, kH)
+
+
+class ParametricMetric:
+    """
+    A metric with free parameters.
+    base: name of the registered metric whose conversion path is reused,
+    params: parameter names, initial: their starting values, fixed: names kept at the initial value,
+    prepare(a, b): per-pair terms from converted colors, raw(params, prepared): distances,
+    model: the color class the exported class derives from.
+    """
+    def __init__(self, name: str, label: str, base: str, params, initial, prepare, raw, model, fixed=()):
+        self.name = name
+        self.label = label
+        self.base = base
+        self.params = tuple(params)
+        self.initial = tuple(float(x) for x in initial)
+        self.prepare = prepare
+        self.raw = raw
+        self.model = model
+        self.fixed = tuple(fixed)
+
+    @property
+    def free(self) -> tuple:
+        return tuple(p for p in self.params if p not in self.fixed)
+
+    def convert(self, rgbd):
+        return get_metric(self.base).convert(rgbd)
+
+    def __repr__(self) -> str:
+        return f"ParametricMetric({self.name!r})"
+
+
+PARAMETRIC_METRICS = {
+    metric.name: metric for metric in (
+        ParametricMetric('lab-weighted', 'Lab weighted', 'lab76', ('wL', 'wa', 'wb'), (1, 1, 1),
+                         _axes_prepare, _weighted_axes, Lab, fixed=('wL',)),
+        ParametricMetric('yiq-weighted', 'YIQ weighted', 'yiq', ('wY', 'wI', 'wQ'), (1, 1, 1),
+                         _axes_prepare, _weighted_axes, YIQ, fixed=('wY',)),
+        ParametricMetric('hsv-weighted', 'HSV weighted', 'hsv', ('wH', 'wS', 'wV'), (1, 1, 1),
+                         _cylinder_prepare, _weighted_axes, HSV, fixed=('wV',)),
+        ParametricMetric('lab2k-k', 'Lab ΔE2000 k', 'lab2k', ('kL', 'kC', 'kH'), (1, 1, 1),
+                         lambda a, b: (a, b), _delta_e2000_k, Lab, fixed=('kC',)),
+    )
+}
+
+
+def normalize(raw, scale: float, gamma: float):
+    # Saturating map of a raw distance to the human scale 0..1
+    return 1.0 - np.exp(-(np.asarray(raw) / scale) ** gamma)
+
+
+def _initial_scale(metric: ParametricMetric, prepared) -> float:
+    # Start from the median raw distance, so the curve is not flat at the start
+    raw = metric.raw(metric.initial, prepared)
+    positive = raw[raw > 0]
+    return float(np.median(positive)) if len(positive) else 1.0
+
+
+class FittedMetric:
+    """
+    A parametric metric with fitted parameters.
+    params: {name: value}, including `scale` and `gamma` of the normalization.
+    """
+    def __init__(self, metric: ParametricMetric, params: dict, loss: float = math.nan, n_pairs: int = 0):
+        self.metric = metric
+        self.params = dict(params)
+        self.loss = loss
+        self.n_pairs = n_pairs
+
+    def _model_params(self) -> tuple:
+        return tuple(self.params[p] for p in self.metric.params)
+
+    def raw_converted(self, a, b):
+        # Raw distance of colors already converted to the metric's model
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        return self.metric.raw(self._model_params(), self.metric.prepare(a, b))
+
+    def distance_converted(self, a, b):
+        return normalize(self.raw_converted(a, b), self.params['scale'], self.params['gamma'])
+
+    def pair_distances(self, rgbd_a, rgbd_b):
+        # Predicted human distances of display sRGB pairs, arrays (..., 3)
+        return self.distance_converted(self.metric.convert(rgbd_a), self.metric.convert(rgbd_b))
+
+    def color_class(self, name: str = None) -> type:
+        return fitted_color_class(self.metric.name, self.params, name)
+
+    def __repr__(self) -> str:
+        params = ', '.join(f"{k}={v:.4g}" for k, v in self.params.items())
+        return f"FittedMetric({self.metric.name!r}, {params})"
+
+
+def fitted_color_class(metric_name: str, params: dict, name: str = None) -> type:
+    """
+    A color class with the fitted distance, derived from the metric's model class
+    (Lab, YIQ or HSV), for example:
+        LabFit = fitted_color_class('lab2k-k', {'kL': 1.6, 'kC': 1.0, 'kH': 1.3, 'scale': 20, 'gamma': 1.1})
+        LabFit(*rgb_to_lab2k(c1).components()).distance(LabFit(*rgb_to_lab2k(c2).components()))
+    """
+    fitted = FittedMetric(PARAMETRIC_METRICS[metric_name], params)
+    model = fitted.metric.model
+
+    def distance_not_normalized(self, other) -> float:
+        if type(other) is not type(self):
+            raise TypeError(f"Type mismatch: {type(self)} vs {type(other)}")
+        return float(fitted.raw_converted(self.components(), other.components()))
+
+    def distance(self, other) -> float:
+        if type(other) is not type(self):
+            raise TypeError(f"Type mismatch: {type(self)} vs {type(other)}")
+        return float(fitted.distance_converted(self.components(), other.components()))
+
+    class_name = name or 'Fitted' + ''.join(part.capitalize() for part in metric_name.split('-'))
+    return type(class_name, (model,), {
+        '__doc__': f"{model.__name__} with the distance fitted to human ratings: {fitted!r}",
+        'PARAMS': dict(params),
+        'distance_not_normalized': distance_not_normalized,
+        'distance': distance,
+    })
+
+
+def fit_metric(metric_name: str, rgbd_a, rgbd_b, human, weights=None) -> FittedMetric:
+    """
+    Fit a parametric metric to human distances of color pairs.
+    rgbd_a, rgbd_b: display sRGB of the pairs, arrays (pairs, 3) in [0..1]
+    human: human distance of every pair, 0..1, NaN for pairs without enough ratings
+    weights: per-pair weights of the squared error, e.g. numbers of ratings
+    """
+    metric = PARAMETRIC_METRICS[metric_name]
+    human = np.asarray(human, dtype=np.float64)
+    mask = ~np.isnan(human)
+    a = metric.convert(np.asarray(rgbd_a, dtype=np.float64)[mask])
+    b = metric.convert(np.asarray(rgbd_b, dtype=np.float64)[mask])
+    prepared = metric.prepare(a, b)
+    target = human[mask]
+    w = np.ones(len(target)) if weights is None else np.asarray(weights, dtype=np.float64)[mask]
+    w = w / w.sum()
+
+    names = metric.free + NORMALIZATION_PARAMS
+    start = dict(zip(metric.params, metric.initial), scale=_initial_scale(metric, prepared), gamma=1.0)
+    x0 = np.log([start[p] for p in names])
+
+    def unpack(x):
+        values = dict(start)
+        values.update(zip(names, np.exp(x)))
+        return values
+
+    def loss(x):
+        values = unpack(x)
+        raw = metric.raw(tuple(values[p] for p in metric.params), prepared)
+        return float(w @ (normalize(raw, values['scale'], values['gamma']) - target) ** 2)
+
+    bounds = [(v - LOG_BOUND, v + LOG_BOUND) for v in x0]
+    result = minimize(loss, x0, method='L-BFGS-B', bounds=bounds)
+    return FittedMetric(metric, unpack(result.x), float(result.fun), int(mask.sum()))
+
+
+def _scores(predicted, human) -> dict:
+    mask = ~np.isnan(human)
+    predicted = predicted[mask]
+    human = human[mask]
+    return {
+        'rmse': float(np.sqrt(np.mean((predicted - human) ** 2))),
+        'pearson': float(pearsonr(predicted, human)[0]),
+        'spearman': float(spearmanr(predicted, human)[0]),
+    }
+
+
+def cross_validate(metric_name: str, sessions, pairs, scores, rgbd_a, rgbd_b,
+                   folds: int = CV_FOLDS, seed: int = 0) -> dict:
+    """
+    Cross-validate a parametric metric by session.
+
+    sessions, pairs, scores: one entry per (trusted) rating, scores are raw [0..100];
+    pair codes index rgbd_a and rgbd_b, display sRGB arrays (pairs, 3).
+    Returns {'folds': [{'fitted', 'train', 'test', 'base'}], 'test': mean scores, 'base': mean scores},
+    where scores are rmse, pearson and spearman; 'base' is the unfitted registered
+    metric the parametric one starts from, scored on the same held-out sessions.
+    """
+    metric = PARAMETRIC_METRICS[metric_name]
+    rgbd_a = np.asarray(rgbd_a, dtype=np.float64)
+    rgbd_b = np.asarray(rgbd_b, dtype=np.float64)
+    hist = session_histograms(sessions, pairs, scores, len(rgbd_a))
+    fold_of = np.random.default_rng(seed).permutation(len(hist)) % folds
+    base = get_metric(metric.base).pair_distances(rgbd_a, rgbd_b)
+
+    result = {'folds': []}
+    for k in range(folds):
+        train = trimmed_human_distance(hist[fold_of != k].sum(axis=0))
+        test = trimmed_human_distance(hist[fold_of == k].sum(axis=0))
+        counts = hist[fold_of != k].sum(axis=(0, 2))
+        fitted = fit_metric(metric_name, rgbd_a, rgbd_b, train, weights=counts)
+        predicted = fitted.pair_distances(rgbd_a, rgbd_b)
+        result['folds'].append({
+            'fitted': fitted,
+            'train': _scores(predicted, train),
+            'test': _scores(predicted, test),
+            'base': _scores(base, test),
+        })
+    for part in ('test', 'base'):
+        result[part] = {
+            key: float(np.mean([fold[part][key] for fold in result['folds']]))
+            for key in ('rmse', 'pearson', 'spearman')
+        }
+    return result
+
+
+def format_fit(fitted: FittedMetric, cv: dict = None) -> list[str]:
+    params = ', '.join(f"{k}={v:.3g}" for k, v in fitted.params.items())
+    lines = [f"{fitted.metric.label:13s} | {params}, loss={fitted.loss:.4f}"]
+    if cv is not None:
+        t, b = cv['test'], cv['base']
+        lines.append(
+            f"{'':13s} | {len(cv['folds'])}-fold CV by session: RMSE {t['rmse']:.3f} (base {b['rmse']:.3f}),"
+            f" Pearson r {t['pearson']:.3f} (base {b['pearson']:.3f}), Spearman ρ {t['spearman']:.3f} (base {b['spearman']:.3f})"
+        )
+    return lines
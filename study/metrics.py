@@ -0,0 +1,217 @@
+"""
+Lightweight request metrics for the backends, exposed in Prometheus text format.
+
+- METRICS.wsgi(app) wraps a WSGI application,
+- METRICS.instrument_handler(cls) wraps a BaseHTTPRequestHandler subclass,
+both record per-route latency histograms and error counts, and serve GET /metrics.
+"""
+import contextlib
+import functools
+import threading
+import time
+
+
+# Upper bounds of latency histogram buckets, seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Routes reported by name, everything else is "other" (keeps label cardinality bounded)
+ROUTES = ("/", "/health", "/next", "/stats", "/submit", "/metrics")
+
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+PREFIX = "colorstudy"
+
+
+def route_of(path: str) -> str:
+    path = path.split("?", 1)[0]
+    return path if path in ROUTES else "other"
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram, as Prometheus expects it.
+    """
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def lines(self, name: str, labels: str) -> list[str]:
+        sep = "," if labels else ""
+        result = []
+        for bound, c in zip(LATENCY_BUCKETS, self.counts):
+            result.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {c}')
+        result.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        result.append(f'{name}_sum{{{labels}}} {self.sum:.6f}')
+        result.append(f'{name}_count{{{labels}}} {self.count}')
+        return result
+
+
+class Metrics:
+    """
+    Counters, histograms and gauges of one backend process.
+    """
+    def __init__(self):
+        self.started = time.time()
+        self.requests = {}  # (route, method, status) -> count
+        self.errors = {}  # route -> count of 4xx/5xx responses and exceptions
+        self.latency = {}  # route -> Histogram
+        self.phases = {}  # (route, phase) -> Histogram
+        self.write_queue = 0  # requests waiting for or doing the ratings log write
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, method: str, status: int, seconds: float):
+        with self._lock:
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if status >= 400:
+                self.errors[route] = self.errors.get(route, 0) + 1
+            hist = self.latency.get(route)
+            if hist is None:
+                hist = self.latency[route] = Histogram()
+            hist.observe(seconds)
+
+    @contextlib.contextmanager
+    def phase(self, route: str, name: str):
+        """
+        Time a part of request handling, like JSON parsing or the file write.
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                hist = self.phases.get((route, name))
+                if hist is None:
+                    hist = self.phases[(route, name)] = Histogram()
+                hist.observe(elapsed)
+
+    @contextlib.contextmanager
+    def writing(self):
+        """
+        Track the depth of the write queue: requests waiting for or doing a log write.
+        """
+        with self._lock:
+            self.write_queue += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.write_queue -= 1
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                f"# HELP {PREFIX}_requests_total Requests by route, method and status.",
+                f"# TYPE {PREFIX}_requests_total counter",
+            ]
+            for (route, method, status), c in sorted(self.requests.items()):
+                lines.append(f'{PREFIX}_requests_total{{route="{route}",method="{method}",status="{status}"}} {c}')
+
+            lines.append(f"# HELP {PREFIX}_request_errors_total Error responses (4xx, 5xx) by route.")
+            lines.append(f"# TYPE {PREFIX}_request_errors_total counter")
+            for route, c in sorted(self.errors.items()):
+                lines.append(f'{PREFIX}_request_errors_total{{route="{route}"}} {c}')
+
+            lines.append(f"# HELP {PREFIX}_request_duration_seconds Request latency by route.")
+            lines.append(f"# TYPE {PREFIX}_request_duration_seconds histogram")
+            for route, hist in sorted(self.latency.items()):
+                lines.extend(hist.lines(f"{PREFIX}_request_duration_seconds", f'route="{route}"'))
+
+            lines.append(f"# HELP {PREFIX}_request_phase_seconds Time spent in parts of request handling.")
+            lines.append(f"# TYPE {PREFIX}_request_phase_seconds histogram")
+            for (route, name), hist in sorted(self.phases.items()):
+                lines.extend(hist.lines(f"{PREFIX}_request_phase_seconds", f'route="{route}",phase="{name}"'))
+
+            lines.append(f"# HELP {PREFIX}_write_queue_depth Requests waiting for or doing the ratings log write.")
+            lines.append(f"# TYPE {PREFIX}_write_queue_depth gauge")
+            lines.append(f"{PREFIX}_write_queue_depth {self.write_queue}")
+
+        lines.append(f"# HELP {PREFIX}_uptime_seconds Seconds since the process started.")
+        lines.append(f"# TYPE {PREFIX}_uptime_seconds gauge")
+        lines.append(f"{PREFIX}_uptime_seconds {time.time() - self.started:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def wsgi(self, app):
+        """
+        Wrap a WSGI application: time every request and serve GET /metrics.
+        """
+        @functools.wraps(app)
+        def middleware(environ, start_response):
+            method = (environ.get("REQUEST_METHOD") or "GET").upper()
+            route = route_of(environ.get("PATH_INFO") or "/")
+            t0 = time.perf_counter()
+
+            if route == METRICS_PATH and method == "GET":
+                body = self.render().encode("utf-8")
+                start_response("200 OK", [("Content-Type", CONTENT_TYPE)])
+                self.observe(route, method, 200, time.perf_counter() - t0)
+                return [body]
+
+            status = [500]
+
+            def recording_start_response(status_line, headers, exc_info=None):
+                status[0] = int(status_line.split(" ", 1)[0])
+                return start_response(status_line, headers, exc_info)
+
+            try:
+                return app(environ, recording_start_response)
+            except Exception:
+                status[0] = 500
+                raise
+            finally:
+                self.observe(route, method, status[0], time.perf_counter() - t0)
+
+        return middleware
+
+    def instrument_handler(self, cls):
+        """
+        Class decorator for a BaseHTTPRequestHandler subclass: time every do_* call
+        and serve GET /metrics.
+        """
+        metrics = self
+        original_send_response = cls.send_response
+
+        def send_response(handler, code, message=None):
+            handler._metrics_status = code
+            original_send_response(handler, code, message)
+
+        cls.send_response = send_response
+
+        def wrap(do_method):
+            @functools.wraps(do_method)
+            def wrapper(handler):
+                route = route_of(handler.path)
+                t0 = time.perf_counter()
+                handler._metrics_status = 500
+                try:
+                    if route == METRICS_PATH and handler.command == "GET":
+                        body = metrics.render().encode("utf-8")
+                        handler.send_response(200)
+                        handler.send_header("Content-Type", CONTENT_TYPE)
+                        handler.end_headers()
+                        handler.wfile.write(body)
+                        return
+                    do_method(handler)
+                except Exception:
+                    handler._metrics_status = 500
+                    raise
+                finally:
+                    metrics.observe(route, handler.command, handler._metrics_status, time.perf_counter() - t0)
+            return wrapper
+
+        for name in ("do_GET", "do_POST", "do_OPTIONS"):
+            if hasattr(cls, name):
+                setattr(cls, name, wrap(getattr(cls, name)))
+        return cls
@@ -0,0 +1,122 @@
+"""
+Color pairs shown to participants, and helpers for the ratings log.
+"""
+import os
+
+
+# Predefined color pairs (the same list as PREDEFINED in web/index.html)
+PREDEFINED_PAIRS = [
+    ['#FFD700', '#FFD700'],
+    ['#964600', '#964600'],
+    ['#14960A', '#14960A'],
+    ['#000000', '#FFFFFF'],
+    ['#FF0000', '#00FFFF'],
+    ['#0057B7', '#FFD700'],
+    ['#191919', '#E5E5E5'],
+    ['#333333', '#CCCCCC'],
+    ['#4C4C4C', '#B2B2B2'],
+    ['#666666', '#999999'],
+    ['#002FA7', '#00005C'],
+    ['#FF00FF', '#DF00FF'],
+    ['#C41E3A', '#DF73FF'],
+    ['#C3B091', '#BDB76B'],
+    ['#808000', '#9AB973'],
+    ['#40E0D0', '#99FF99'],
+    ['#FF7F50', '#B7410E'],
+    ['#964B00', '#D2B48C'],
+    ['#000080', '#0F52BA'],
+    ['#FFF8E7', '#FFFDD0'],
+    ['#BDFCC9', '#F5FFFA'],
+    ['#E6E6FA', '#D8BFD8'],
+    ['#FA8072', '#FFA07A'],
+    ['#FFD700', '#CC7722'],
+    ['#C0FF00', '#FFBA00'],
+    ['#FF7F7F', '#99FF7F'],
+    ['#2D77E5', '#E52D9C'],
+    ['#CBFF00', '#F4FFCC'],
+    ['#2800CC', '#9B8ECC'],
+    ['#11B252', '#6BB287'],
+    ['#A3BFCC', '#008ECC'],
+    ['#B2A0AB', '#B22379'],
+    ['#00FF66', '#004C1E'],
+    ['#E52D9C', '#661445'],
+    ['#CC923D', '#33240F'],
+    ['#E59C2D', '#7F5619'],
+    ['#5B92E5', '#284166'],
+    ['#CC8214', '#5B994C'],
+    ['#4C607F', '#E52D9C'],
+    ['#787878', '#828282'],
+    ['#F0F0E6', '#FAFAF0'],
+    ['#001900', '#E5FFE5'],
+    ['#111110', '#4016E5'],
+    ['#494854', '#ABF60D'],
+    ['#1AF000', '#0B09F2'],
+    ['#CB00D6', '#07EB1D'],
+    ['#B98602', '#4904E4'],
+]
+
+
+def parse_hex_color(color) -> tuple[int, int, int]:
+    if len(color) != 7 or color[0] != '#':
+        raise ValueError("color must be in #RRGGBB format")
+    r = int(color[1:3], 16)
+    g = int(color[3:5], 16)
+    b = int(color[5:7], 16)
+    return r, g, b
+
+
+HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+
+def parse_packed_color(color) -> int:
+    # The same as parse_hex_color, packed as 0xRRGGBB
+    if len(color) != 7 or color[0] != '#' or not HEX_DIGITS.issuperset(color[1:]):
+        raise ValueError("color must be in #RRGGBB format")
+    return int(color[1:], 16)
+
+
+def packed_pair_key(a: int, b: int) -> int:
+    """
+    Order-independent key of a pair of packed colors, the same as colors.pack_pairs.
+    """
+    return (a << 32) | b if a <= b else (b << 32) | a
+
+
+def pair_key(color_a: str, color_b: str) -> tuple[str, str]:
+    """
+    Order-independent key of a color pair: both colors in upper case, the smaller first.
+    Raises ValueError if a color is not in #RRGGBB format.
+    """
+    parse_hex_color(color_a)
+    parse_hex_color(color_b)
+    a = color_a.upper()
+    b = color_b.upper()
+    if a > b:
+        a, b = b, a
+    return a, b
+
+
+def read_ratings(path):
+    """
+    Iterate over the valid records of a ratings log.
+    Format is ip\tts\tname\tcolorA\tcolorB\tscore, malformed lines are skipped.
+    Yields tuples (ip, ts, name, colorA, colorB, score).
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) != 6:
+                continue
+            ip, ts_str, name, colorA, colorB, score_str = parts
+            try:
+                ts = int(ts_str)
+                score = int(score_str)
+                if not (0 <= score <= 100):
+                    continue
+                parse_hex_color(colorA)
+                parse_hex_color(colorB)
+            except ValueError:
+                continue
+            yield ip, ts, name, colorA, colorB, score
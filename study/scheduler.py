@@ -0,0 +1,132 @@
+"""
+Adaptive scheduler of color pairs.
+
+Keeps an in-memory table with the number of ratings and the running variance of
+scores for every predefined pair, and serves the pair where one more rating
+reduces the uncertainty of the mean score the most.
+"""
+import collections
+import math
+import random
+import threading
+import time
+
+from .aggregate import PairStat
+from .pairs import PREDEFINED_PAIRS, pair_key, read_ratings
+
+
+# Prior for the variance of scores of a pair (raw 0..100 scale, stddev ~20),
+# and its weight in pseudo-ratings.  Keeps rarely rated pairs from looking certain.
+PRIOR_VARIANCE = 20.0 ** 2
+PRIOR_WEIGHT = 2.0
+
+# Half-width of the 95% confidence interval of the mean score we aim for
+TARGET_HALF_WIDTH = 5.0
+
+# How long a served pair is considered "being rated" (seconds)
+PENDING_TTL = 60.0
+
+
+class PairScheduler:
+    """
+    Chooses the next pair to rate by the expected information gain.
+
+    The gain of one more rating is the reduction of the variance of the mean score,
+    s^2/n - s^2/(n+1), where s^2 is the variance shrunk towards PRIOR_VARIANCE.
+    Pairs which already reached TARGET_HALF_WIDTH are served only when all pairs did.
+    Pairs served during the last PENDING_TTL seconds count as already rated,
+    so concurrent participants do not all get the same pair.
+    """
+    def __init__(self, pairs=PREDEFINED_PAIRS,
+                 prior_variance: float = PRIOR_VARIANCE,
+                 prior_weight: float = PRIOR_WEIGHT,
+                 target_half_width: float = TARGET_HALF_WIDTH,
+                 pending_ttl: float = PENDING_TTL):
+        self.prior_variance = prior_variance
+        self.prior_weight = prior_weight
+        self.target_half_width = target_half_width
+        self.pending_ttl = pending_ttl
+        self.stats = {}
+        for a, b in pairs:
+            self.stats[pair_key(a, b)] = PairStat()
+        self._pending = collections.defaultdict(collections.deque)
+        self._lock = threading.Lock()
+
+    def seed(self, path: str) -> int:
+        """
+        Load scores from a ratings log.  Returns the number of used records.
+        """
+        n = 0
+        for _ip, _ts, _name, colorA, colorB, score in read_ratings(path):
+            if self.add(colorA, colorB, score):
+                n += 1
+        return n
+
+    def add(self, color_a: str, color_b: str, score: float) -> bool:
+        """
+        Register a rating.  Returns False if the pair is not scheduled.
+        """
+        try:
+            key = pair_key(color_a, color_b)
+        except ValueError:
+            return False
+        with self._lock:
+            stat = self.stats.get(key)
+            if stat is None:
+                return False
+            stat.add(score)
+            pending = self._pending.get(key)
+            if pending:
+                pending.popleft()
+        return True
+
+    def variance(self, stat: PairStat) -> float:
+        """
+        Variance of the scores, shrunk towards the prior.
+        """
+        return (stat.m2 + self.prior_weight * self.prior_variance) / (max(stat.count - 1, 0) + self.prior_weight)
+
+    def half_width(self, stat: PairStat) -> float:
+        """
+        Half-width of the 95% confidence interval of the mean score.
+        """
+        if stat.count == 0:
+            return math.inf
+        return 1.96 * math.sqrt(self.variance(stat) / stat.count)
+
+    def expected_gain(self, stat: PairStat, pending: int = 0) -> float:
+        n = stat.count + pending
+        if n == 0:
+            return math.inf
+        s2 = self.variance(stat)
+        return s2 / n - s2 / (n + 1)
+
+    def next_pair(self, exclude=None) -> tuple[str, str]:
+        """
+        Return the pair with the highest expected gain.
+        The `exclude` pair (usually the one just shown) is skipped.
+        """
+        try:
+            exclude_key = pair_key(*exclude) if exclude else None
+        except ValueError:
+            exclude_key = None
+        now = time.monotonic()
+        with self._lock:
+            best = []
+            best_rank = None
+            for key, stat in self.stats.items():
+                if key == exclude_key and len(self.stats) > 1:
+                    continue
+                pending = self._pending.get(key)
+                while pending and now - pending[0] > self.pending_ttl:
+                    pending.popleft()
+                gain = self.expected_gain(stat, len(pending) if pending else 0)
+                rank = (self.half_width(stat) > self.target_half_width, gain)
+                if best_rank is None or rank > best_rank:
+                    best, best_rank = [key], rank
+                elif rank == best_rank:
+                    best.append(key)
+            key = random.choice(best)
+            self._pending[key].append(now)
+        return key
+
@@ -0,0 +1,219 @@
+"""
+Streaming detection of untrusted rating sessions.
+
+The same heuristics as the offline filter in stat.py, evaluated incrementally
+as ratings arrive: every rating re-judges the whole session so far, so a session
+flagged on a prefix (say, a fast start) is trusted again once its totals pass.
+Only inconsistent scores flag a session for good.  A session is keyed by
+(name, ip) and keeps O(1) state: running moments of its scores, timestamps,
+counters, min/max score of each rated predefined pair, and its warmup ratings,
+held back from the live aggregates until the session is first judged.
+"""
+import collections
+import threading
+
+from .pairs import PREDEFINED_PAIRS, pair_key
+
+
+# Thresholds of the untrusted session heuristics (shared with stat.py)
+MIN_SESSION_LENGTH = 15
+MIN_SCORE_STDDEV = 10.0
+MIN_SESSION_DURATION = 10  # seconds
+MAX_RATING_RATE = 0.5  # ratings per second
+MAX_NEUTRAL_SHARE = 0.5  # share of 50 scores
+INCONSISTENT_SCORE_RANGE = 50  # max - min score of the same pair
+MAX_INCONSISTENT_PAIRS = 1
+
+# Number of sessions kept in memory; the least recently active judged ones are dropped,
+# sessions in warmup only when all of them are
+MAX_ACTIVE_SESSIONS = 10_000
+
+# Session states
+WARMUP = "warmup"  # fewer than MIN_SESSION_LENGTH ratings, not judged yet
+TRUSTED = "trusted"
+FLAGGED = "flagged"  # quarantined while the checks fail, for good if inconsistent
+
+# Pairs whose score ranges are tracked, which bounds the state of a session
+PREDEFINED_KEYS = frozenset(pair_key(a, b) for a, b in PREDEFINED_PAIRS)
+
+
+class SessionState:
+    """
+    Incremental state of one session.
+    """
+    __slots__ = (
+        "count", "mean", "m2", "first_score", "identical",
+        "first_ts", "last_ts", "count_50",
+        "pair_ranges", "n_inconsistent",
+        "status", "reason", "held", "ever_flagged",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.first_score = None
+        self.identical = True
+        self.first_ts = None
+        self.last_ts = None
+        self.count_50 = 0
+        self.pair_ranges = {}  # predefined pair key -> [min score, max score]
+        self.n_inconsistent = 0
+        self.status = WARMUP
+        self.reason = None
+        self.held = []  # ratings of the warmup, at most MIN_SESSION_LENGTH
+        self.ever_flagged = False
+
+    @property
+    def flagged(self) -> bool:
+        return self.status == FLAGGED
+
+    def add(self, ts: int, key, score: int):
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+
+        if self.first_score is None:
+            self.first_score = score
+        elif score != self.first_score:
+            self.identical = False
+
+        if self.first_ts is None or ts < self.first_ts:
+            self.first_ts = ts
+        if self.last_ts is None or ts > self.last_ts:
+            self.last_ts = ts
+
+        if score == 50:
+            self.count_50 += 1
+
+        rng = self.pair_ranges.get(key)
+        if rng is None:
+            if key in PREDEFINED_KEYS:
+                self.pair_ranges[key] = [score, score]
+        else:
+            was_consistent = rng[1] - rng[0] < INCONSISTENT_SCORE_RANGE
+            rng[0] = min(rng[0], score)
+            rng[1] = max(rng[1], score)
+            if was_consistent and rng[1] - rng[0] >= INCONSISTENT_SCORE_RANGE:
+                self.n_inconsistent += 1
+
+        # Judged on all the ratings so far, as session_verdicts() would
+        self.reason = self.check()
+        if self.reason is not None:
+            self.status = FLAGGED
+            self.ever_flagged = True
+        elif self.count >= MIN_SESSION_LENGTH:
+            self.status = TRUSTED
+        else:
+            self.status = WARMUP
+
+    def check(self):
+        """
+        Return the reason to distrust the session, or None.
+        """
+        # Score ranges only grow: an inconsistent session stays flagged
+        if self.n_inconsistent > MAX_INCONSISTENT_PAIRS:
+            return f"inconsistent scores for {self.n_inconsistent} pairs"
+        if self.count < MIN_SESSION_LENGTH:
+            return None
+
+        if self.identical:
+            return f"identical scores: {self.first_score}"
+
+        stddev = (self.m2 / (self.count - 1)) ** 0.5
+        if stddev < MIN_SCORE_STDDEV:
+            return f"low score stddev: {stddev:.2f}"
+
+        duration_sec = self.last_ts - self.first_ts
+        if duration_sec < MIN_SESSION_DURATION:
+            return f"too short duration: {duration_sec} sec for {self.count} ratings"
+
+        rate = self.count / duration_sec
+        if rate > MAX_RATING_RATE:
+            return f"too high rate: {rate:.2f} ratings/sec"
+
+        if self.count_50 > self.count * MAX_NEUTRAL_SHARE:
+            return f"too many 50 scores: {self.count_50} out of {self.count}"
+
+        return None
+
+    def release(self, rating) -> list:
+        """
+        The ratings to add to the live aggregates after `rating` was added: none
+        while the session is in warmup (they are held) or flagged, the held ones
+        when it is judged trusted.  Ratings of a warmup which ends flagged are dropped.
+        """
+        if self.status == WARMUP:
+            self.held.append(rating)
+            return []
+        ratings, self.held = self.held + [rating], []
+        return ratings if self.status == TRUSTED else []
+
+
+class SessionMonitor:
+    """
+    Bounded LRU of active sessions, judging every rating as it arrives.
+    """
+    def __init__(self, max_sessions: int = MAX_ACTIVE_SESSIONS):
+        self.max_sessions = max_sessions
+        self.sessions = collections.OrderedDict()
+        self.n_flagged = 0  # sessions flagged at least once
+        self.n_dropped = 0  # held ratings of the evicted sessions in warmup
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, ip: str, ts: int, color_a: str, color_b: str, score: int) -> SessionState:
+        """
+        Register a rating of the session (name, ip) and return the session state.
+        """
+        return self._observe(name, ip, ts, color_a, color_b, score)[0]
+
+    def submit(self, name: str, ip: str, ts: int, color_a: str, color_b: str, score: int) -> tuple[SessionState, list]:
+        """
+        Register a rating like observe(), and return the session state and the
+        ratings, (color_a, color_b, score), to add to the live aggregates now.
+        """
+        return self._observe(name, ip, ts, color_a, color_b, score)
+
+    def _observe(self, name, ip, ts, color_a, color_b, score) -> tuple[SessionState, list]:
+        try:
+            key = pair_key(color_a, color_b)
+        except ValueError:
+            key = None  # not a predefined pair, not tracked
+        session_id = (name, ip)
+        with self._lock:
+            state = self.sessions.get(session_id)
+            if state is None:
+                state = self.sessions[session_id] = SessionState()
+                if len(self.sessions) > self.max_sessions:
+                    self._evict()
+            else:
+                self.sessions.move_to_end(session_id)
+            was_flagged = state.ever_flagged
+            state.add(ts, key, score)
+            if state.ever_flagged and not was_flagged:
+                self.n_flagged += 1
+            released = state.release((color_a, color_b, score))
+        return state, released
+
+    def _evict(self):
+        # The least recently active judged session: the held ratings of a warmup are not
+        # in the aggregates yet, they are lost only when every session is in warmup
+        for session_id, state in self.sessions.items():
+            if state.status != WARMUP:
+                del self.sessions[session_id]
+                return
+        _, state = self.sessions.popitem(last=False)
+        self.n_dropped += len(state.held)
+
+    def summary(self) -> dict:
+        with self._lock:
+            statuses = collections.Counter(state.status for state in self.sessions.values())
+            return {
+                'active': len(self.sessions),
+                'warmup': statuses[WARMUP],
+                'trusted': statuses[TRUSTED],
+                'flagged': statuses[FLAGGED],
+                'flagged_total': self.n_flagged,
+                'dropped_warmup': self.n_dropped,
+            }
@@ -0,0 +1,63 @@
+import math
+import random
+import unittest
+
+from study import LiveStats, PairStat
+
+
+def row_trimmed(row):
+    # Reference: the trimming of stat.row_stat
+    n = len(row)
+    trimmed_row = sorted(row)[n // 10: n - n // 10]
+    t_n = len(trimmed_row)
+    t_mean = sum(trimmed_row) / t_n
+    t_variance = sum((x - t_mean) ** 2 for x in trimmed_row) / t_n
+    return t_n, t_mean, math.sqrt(t_variance)
+
+
+class TestPairStat(unittest.TestCase):
+    def test_trimmed(self):
+        rnd = random.Random(1)
+        for n in (1, 2, 9, 10, 11, 37, 200):
+            row = [rnd.choice((0, 50, 100, rnd.randint(0, 100))) for _ in range(n)]
+            stat = PairStat()
+            for score in row:
+                stat.add(score)
+            t_n, t_mean, t_stddev = stat.trimmed()
+            r_n, r_mean, r_stddev = row_trimmed(row)
+            self.assertEqual(t_n, r_n)
+            self.assertAlmostEqual(t_mean, r_mean)
+            self.assertAlmostEqual(t_stddev, r_stddev, places=6)
+
+
+class TestLiveStats(unittest.TestCase):
+    def test_summary(self):
+        stats = LiveStats(min_pair_ratings=1)
+        self.assertFalse(stats.add('#00000', '#FFFFFF', 10))
+        for score in (0, 2, 4):
+            self.assertTrue(stats.add('#000000', '#FFFFFF', score))
+        for score in (95, 100, 100):
+            stats.add('#787878', '#828282', score)
+        for score in (30, 40, 50):
+            stats.add('#404040', '#808080', score)
+
+        summary = stats.summary()
+        self.assertEqual(summary['n_ratings'], 9)
+        self.assertEqual(summary['n_pairs'], 3)
+        pair = summary['pairs'][0]
+        self.assertEqual((pair['a'], pair['b']), ('#000000', '#FFFFFF'))
+        self.assertEqual(pair['n'], 3)
+        self.assertAlmostEqual(pair['mean'], 2.0)
+        self.assertAlmostEqual(pair['variance'], 4.0)
+        self.assertEqual(sum(pair['histogram']), 3)
+        self.assertEqual(set(summary['correlation']), {'rgbd', 'rgbl', 'hsv', 'lab76', 'lab2k'})
+        # Black/white is the most different, gray/gray the closest: all models agree
+        for name in ('rgbd', 'rgbl', 'lab76', 'lab2k'):
+            self.assertAlmostEqual(summary['correlation'][name]['spearman'], 1.0)
+
+    def test_too_few_pairs(self):
+        stats = LiveStats()
+        stats.add('#000000', '#FFFFFF', 0)
+        summary = stats.summary()
+        self.assertEqual(summary['n_correlated_pairs'], 0)
+        self.assertEqual(summary['correlation'], {})
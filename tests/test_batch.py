@@ -0,0 +1,137 @@
+import itertools
+import random
+import unittest
+
+import numpy as np
+
+from colors import *
+from colors import batch
+from colors.metrics import all_distances, get_metric
+from colors.models import DEFAULT_TOLERANCE
+
+
+def sample_colors():
+    values = list(range(0, 256, 51)) + [7, 128, 250]
+    rnd = random.Random(11)
+    colors = [RGBLinear.from_8bit(*rgb) for rgb in itertools.product(values, repeat=3)]
+    colors += [RGBLinear(rnd.random(), rnd.random(), rnd.random()) for _ in range(200)]
+    return colors
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.colors = sample_colors()
+        self.rgb = np.array([c.components() for c in self.colors])
+
+    def assert_rows(self, array, expected, places=9):
+        self.assertEqual(array.shape, (len(expected), 3))
+        np.testing.assert_allclose(array, np.array(expected), atol=10 ** -places)
+
+    def test_conversions(self):
+        self.assert_rows(batch.srgb_to_linear(self.rgb), [rgbd_to_rgbl(c).components() for c in self.colors])
+        self.assert_rows(batch.linear_to_srgb(self.rgb), [rgbl_to_rgbd(c).components() for c in self.colors])
+        self.assert_rows(batch.rgb_to_yiq(self.rgb), [rgb_to_yiq(c).components() for c in self.colors])
+        self.assert_rows(batch.rgb_to_hsv(self.rgb), [rgb_to_hsv(c).components() for c in self.colors])
+        self.assert_rows(batch.rgb_to_hls(self.rgb), [rgb_to_hls(c).components() for c in self.colors])
+        self.assert_rows(batch.rgb_to_lab(self.rgb), [rgb_to_lab76(c).components() for c in self.colors])
+        self.assert_rows(batch.rgb_to_oklab(self.rgb), [rgb_to_oklab(c).components() for c in self.colors])
+        self.assert_rows(batch.rgb_to_cam16ucs(self.rgb), [rgb_to_cam16ucs(c).components() for c in self.colors])
+
+    def test_distances(self):
+        a_colors = self.colors
+        b_colors = self.colors[::-1]
+        a = self.rgb
+        b = self.rgb[::-1]
+        cases = [
+            (batch.euclidean_distance, lambda x: x),
+            (batch.yiq_distance, rgb_to_yiq),
+            (batch.cylindrical_distance, rgb_to_hsv),
+            (batch.cylindrical_distance, rgb_to_hls),
+            (batch.lab76_distance, rgb_to_lab76),
+            (batch.lab2k_distance, rgb_to_lab2k),
+            (batch.lab94_distance, rgb_to_lab94),
+            (batch.labcmc_distance, rgb_to_labcmc),
+            (batch.oklab_distance, rgb_to_oklab),
+            (batch.cam16ucs_distance, rgb_to_cam16ucs),
+        ]
+        for distance, convert in cases:
+            ma = np.array([convert(c).components() for c in a_colors])
+            mb = np.array([convert(c).components() for c in b_colors])
+            expected = [convert(x).distance(convert(y)) for x, y in zip(a_colors, b_colors)]
+            np.testing.assert_allclose(distance(ma, mb), expected, atol=1e-9)
+
+        lab_a = batch.rgb_to_lab(a)
+        lab_b = batch.rgb_to_lab(b)
+        expected = [rgb_to_lab2k(x).distance_not_normalized(rgb_to_lab2k(y)) for x, y in zip(a_colors, b_colors)]
+        np.testing.assert_allclose(batch.delta_e2000(lab_a, lab_b), expected, atol=1e-9)
+
+    def test_shapes(self):
+        self.assertEqual(batch.rgb_to_lab(np.zeros((4, 5, 3))).shape, (4, 5, 3))
+        self.assertEqual(batch.delta_e2000(np.zeros((4, 5, 3)), np.ones((4, 5, 3))).shape, (4, 5))
+        self.assertEqual(batch.delta_e76(np.zeros(3), np.ones(3)).shape, ())
+
+    def test_oklab_fast_path(self):
+        rgb8 = np.random.default_rng(4).integers(0, 256, (5000, 3), dtype=np.uint8)
+        linear = batch.srgb_to_linear(rgb8 / 255.0)
+        np.testing.assert_array_equal(batch.srgb8_to_linear(rgb8), linear)
+        reference = batch.rgb_to_oklab(linear)
+        fast = batch.srgb8_to_oklab(rgb8)
+        self.assertEqual(fast.dtype, np.float32)
+        self.assertEqual(fast.shape, (5000, 3))
+        np.testing.assert_allclose(fast, reference, atol=1e-6)
+        np.testing.assert_array_equal(batch.srgb8_to_oklab(rgb8, np.float64), reference)
+        self.assertEqual(batch.rgb_to_oklab(linear, np.float32).dtype, np.float32)
+
+    def test_inverse(self):
+        cases = [
+            (batch.yiq_to_rgb, batch.rgb_to_yiq, yiq_to_rgbl, rgb_to_yiq),
+            (batch.hsv_to_rgb, batch.rgb_to_hsv, hsv_to_rgbl, rgb_to_hsv),
+            (batch.hls_to_rgb, batch.rgb_to_hls, hls_to_rgbl, rgb_to_hls),
+            (batch.lab_to_rgb, batch.rgb_to_lab, lab76_to_rgbl, rgb_to_lab76),
+            (batch.oklab_to_rgb, batch.rgb_to_oklab, oklab_to_rgbl, rgb_to_oklab),
+            (batch.cam16ucs_to_rgb, batch.rgb_to_cam16ucs, cam16ucs_to_rgbl, rgb_to_cam16ucs),
+        ]
+        for inverse, forward, scalar_inverse, scalar_forward in cases:
+            expected = [scalar_inverse(scalar_forward(c)).components() for c in self.colors]
+            self.assert_rows(inverse(forward(self.rgb)), expected, places=6)
+
+    def test_float32(self):
+        # The round trips of tests/test_conversion.py, and float64 as the reference
+        values = np.array(list(range(0, 256, 16)) + [255]) / 255.0
+        rgb = np.stack(np.meshgrid(values, values, values, indexing='ij'), axis=-1).reshape(-1, 3)
+        rgb32 = rgb.astype(np.float32)
+        cases = [
+            (batch.rgb_to_yiq, batch.yiq_to_rgb, batch.yiq_distance),
+            (batch.rgb_to_hsv, batch.hsv_to_rgb, batch.cylindrical_distance),
+            (batch.rgb_to_hls, batch.hls_to_rgb, batch.cylindrical_distance),
+            (batch.rgb_to_lab, batch.lab_to_rgb, batch.lab2k_distance),
+            (batch.rgb_to_oklab, batch.oklab_to_rgb, batch.oklab_distance),
+            (batch.rgb_to_cam16ucs, batch.cam16ucs_to_rgb, batch.cam16ucs_distance),
+        ]
+        for forward, inverse, distance in cases:
+            converted = forward(rgb32)
+            self.assertEqual(converted.dtype, np.float32)
+            back = inverse(converted)
+            self.assertEqual(back.dtype, np.float32)
+            np.testing.assert_allclose(back, rgb, atol=DEFAULT_TOLERANCE)
+            np.testing.assert_allclose(back, inverse(forward(rgb)), atol=1e-5)
+            d = distance(converted, converted[::-1])
+            self.assertEqual(d.dtype, np.float32)
+            np.testing.assert_allclose(d, distance(forward(rgb), forward(rgb)[::-1]), atol=1e-5)
+
+        np.testing.assert_allclose(batch.linear_to_srgb(batch.srgb_to_linear(rgb32)), rgb, atol=1e-6)
+        self.assertEqual(batch.rgb_to_lab(rgb, np.float32).dtype, np.float32)
+        self.assertEqual(batch.rgb_to_lab(rgb32, np.float64).dtype, np.float64)
+        self.assertEqual(batch.rgb_to_lab(np.zeros((2, 3), dtype=np.uint8)).dtype, np.float64)
+
+        single = all_distances(rgb, rgb[::-1], dtype=np.float32)
+        for name, d in all_distances(rgb, rgb[::-1]).items():
+            self.assertEqual(single[name].dtype, np.float32, name)
+            np.testing.assert_allclose(single[name], d, atol=1e-5, err_msg=name)
+        # float32 input stays float32 by default
+        for name, d in all_distances(rgb32, rgb32[::-1]).items():
+            self.assertEqual(d.dtype, np.float32, name)
+        metric = get_metric('lab2k')
+        self.assertEqual(metric.convert(rgb32).dtype, np.float32)
+        self.assertEqual(metric.pair_distances(rgb32, rgb[::-1]).dtype, np.float32)
+        self.assertEqual(metric.pair_distances(rgb, rgb32[::-1]).dtype, np.float64)
@@ -0,0 +1,43 @@
+import unittest
+
+from benchmarks import suite
+from colors.metrics import registered_metrics
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_cases(self):
+        names = [case.name for case in suite.all_cases(quick=True)]
+        self.assertEqual(len(names), len(set(names)))
+        for model in suite.MODELS:
+            self.assertIn(f"scalar/{model}.distance", names)
+            self.assertIn(f"construct/{model}", names)
+            self.assertIn(f"memory/{model}", names)
+        for metric in registered_metrics():
+            self.assertIn(f"batch/{metric.name}.pair_distances", names)
+        self.assertIn("scalar/rgb_to_cam16ucs", names)
+
+    def test_run_and_compare(self):
+        cases = [case for case in suite.all_cases(quick=True) if case.name in ('scalar/Lab2k.distance', 'memory/Lab2k')]
+        report = suite.run(cases, repeat=1, min_time=0.001)
+        self.assertEqual(set(report['results']), {'scalar/Lab2k.distance', 'memory/Lab2k'})
+        self.assertGreater(report['results']['memory/Lab2k']['value'], 0)
+
+        baseline = {'results': {
+            'scalar/Lab2k.distance': dict(report['results']['scalar/Lab2k.distance']),
+            'memory/Lab2k': dict(report['results']['memory/Lab2k']),
+        }}
+        baseline['results']['scalar/Lab2k.distance']['value'] *= 2  # was twice as fast
+        baseline['results']['memory/Lab2k']['value'] *= 2  # used twice as much memory
+        rows = {row['name']: row for row in suite.compare(report, baseline)}
+        self.assertEqual(rows['scalar/Lab2k.distance']['status'], 'regression')
+        self.assertEqual(rows['memory/Lab2k']['status'], 'improvement')
+        self.assertEqual(len(suite.format_comparison(list(rows.values()))), 2)
+
+        # Cases only in one of the reports are listed, not skipped
+        baseline['results']['scalar/Gone.distance'] = baseline['results'].pop('memory/Lab2k')
+        rows = {row['name']: row for row in suite.compare(report, baseline)}
+        self.assertEqual(rows['memory/Lab2k']['status'], 'new')
+        self.assertEqual(rows['scalar/Gone.distance']['status'], 'missing')
+        self.assertIsNone(rows['scalar/Gone.distance']['change'])
+        lines = suite.format_comparison(list(rows.values()))
+        self.assertTrue(any(line.endswith('missing') for line in lines))
@@ -0,0 +1,66 @@
+import random
+import unittest
+
+import numpy as np
+from scipy.stats import pearsonr, spearmanr
+
+from study.bootstrap import bootstrap_correlations, session_histograms, trimmed_human_distance
+
+
+def make_ratings(n_sessions=30, n_pairs=12, seed=3):
+    rnd = random.Random(seed)
+    truth = [rnd.randint(0, 100) for _ in range(n_pairs)]
+    sessions, pairs, scores = [], [], []
+    for s in range(n_sessions):
+        for p in range(n_pairs):
+            for _ in range(rnd.randint(1, 3)):
+                sessions.append(s * 7)  # codes do not need to be contiguous
+                pairs.append(p)
+                scores.append(max(0, min(100, truth[p] + rnd.randint(-30, 30))))
+    return np.array(sessions), np.array(pairs), np.array(scores), truth
+
+
+class TestBootstrap(unittest.TestCase):
+    def test_trimmed_mean(self):
+        rnd = random.Random(1)
+        for n in (2, 9, 10, 23, 100):
+            row = [rnd.randint(0, 100) for _ in range(n)]
+            hist = np.bincount(row, minlength=101)[None, :].astype(float)
+            trimmed = sorted(row)[n // 10: n - n // 10]
+            expected = (100 - sum(trimmed) / len(trimmed)) / 100.0
+            self.assertAlmostEqual(trimmed_human_distance(hist)[0], expected)
+        self.assertTrue(np.isnan(trimmed_human_distance(np.zeros((1, 101)))[0]))
+
+    def test_histograms(self):
+        hist = session_histograms([5, 5, 9], [0, 1, 1], [10, 20, 20], n_pairs=2)
+        self.assertEqual(hist.shape, (2, 2, 101))
+        self.assertEqual(hist[0, 1, 20], 1)
+        self.assertEqual(hist[1, 1, 20], 1)
+        self.assertEqual(hist.sum(), 3)
+
+    def test_point_and_intervals(self):
+        sessions, pairs, scores, truth = make_ratings()
+        good = np.array(truth, dtype=float)
+        noisy = good + np.random.default_rng(0).normal(0, 30, len(truth))
+        result = bootstrap_correlations(
+            sessions, pairs, scores, {'good': -good, 'noisy': -noisy}, n_boot=200, chunk_size=64,
+        )
+        hist = session_histograms(sessions, pairs, scores, len(truth)).sum(axis=0)
+        human = trimmed_human_distance(hist)
+        for name, d in (('good', -good), ('noisy', -noisy)):
+            r, lo, hi = result['metrics'][name]['pearson']
+            self.assertAlmostEqual(r, pearsonr(d, human)[0])
+            self.assertLessEqual(lo, hi)
+            rho = result['metrics'][name]['spearman'][0]
+            self.assertAlmostEqual(rho, spearmanr(d, human)[0])
+        diff, lo, hi, p = result['differences'][('good', 'noisy')]['pearson']
+        self.assertGreater(lo, 0.0)
+        self.assertLess(p, 0.05)
+
+    def test_workers(self):
+        sessions, pairs, scores, truth = make_ratings(n_sessions=10, n_pairs=6)
+        distances = {'a': np.arange(6.0), 'b': np.array(truth, dtype=float)}
+        one = bootstrap_correlations(sessions, pairs, scores, distances, n_boot=50, chunk_size=20, seed=5)
+        two = bootstrap_correlations(sessions, pairs, scores, distances, n_boot=50, chunk_size=20, seed=5, workers=2)
+        self.assertEqual(one['metrics'], two['metrics'])
+        self.assertEqual(one['differences'], two['differences'])
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+from colors import *
+
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        self.rgb8 = np.random.default_rng(2).integers(0, 256, (500, 3), dtype=np.uint8)
+        self.hexes = [RGBDisplay.from_8bit(*c).to_hex() for c in self.rgb8.tolist()]
+
+    def test_parse(self):
+        parsed = parse_hex_array(self.hexes)
+        self.assertEqual(parsed.dtype, np.uint8)
+        np.testing.assert_array_equal(parsed, self.rgb8)
+        np.testing.assert_array_equal(parse_hex_array([h.lower() for h in self.hexes]), self.rgb8)
+        np.testing.assert_array_equal(parse_hex_array([h[1:] for h in self.hexes]), self.rgb8)
+        np.testing.assert_array_equal(parse_hex_array('\n'.join(self.hexes).encode() + b'\n'), self.rgb8)
+        np.testing.assert_array_equal(parse_hex_array('\r\n'.join(self.hexes).encode()), self.rgb8)
+        np.testing.assert_array_equal(parse_hex_array(['#00FF7f']), [[0, 255, 127]])
+        self.assertEqual(parse_hex_array([]).shape, (0, 3))
+        self.assertEqual(parse_hex_array(b'').shape, (0, 3))
+
+    def test_malformed(self):
+        for colors in (
+            ['#00FF7F', '#00FF7'],
+            ['#00FF7F', '#00FF7FF'],
+            ['#00FF7F', '#00FG7F'],
+            ['#00FF7F', '00FF7F'],
+            ['00FF7F', '#00FF7'],
+            ['#00FF7F', '#00FF7é'],
+            ['#12345', '#1234567'],
+            ['', ''],
+            b'#00FF7F\n#00FF7F\n\n#00FF7F',
+        ):
+            with self.assertRaises(ValueError, msg=colors):
+                parse_hex_array(colors)
+        with self.assertRaisesRegex(ValueError, "#1: '#00FG7F'"):
+            parse_hex_array(['#00FF7F', '#00FG7F', '#00FF7F'])
+        with self.assertRaisesRegex(ValueError, "#0: ''"):
+            parse_hex_array([''])
+
+    def test_to_hex(self):
+        self.assertEqual(to_hex_array(self.rgb8), self.hexes)
+        self.assertEqual(to_hex_array(self.rgb8.astype(np.int64), prefix=''), [h[1:] for h in self.hexes])
+        self.assertEqual(to_hex_array([[0, 255, 127]]), ['#00FF7F'])
+        self.assertEqual(to_hex_array(np.zeros((0, 3), dtype=np.uint8)), [])
+        with self.assertRaises(ValueError):
+            to_hex_array([[0, 256, 0]])
+
+    def test_packed(self):
+        packed = pack_rgb8(self.rgb8)
+        self.assertEqual(packed.dtype, np.uint32)
+        self.assertEqual(packed.tolist(), [RGBDisplay.from_8bit(*c).to_packed() for c in self.rgb8.tolist()])
+        self.assertEqual(packed.tolist(), [int(h[1:], 16) for h in self.hexes])
+        unpacked = unpack_rgb8(packed)
+        self.assertEqual(unpacked.dtype, np.uint8)
+        np.testing.assert_array_equal(unpacked, self.rgb8)
+        np.testing.assert_array_equal(unpack_rgb8(packed.reshape(20, 25)), self.rgb8.reshape(20, 25, 3))
+        np.testing.assert_array_equal(unpack_rgb8([0x1464C8]), [[20, 100, 200]])
+        self.assertEqual(pack_rgb8([20, 100, 200]), 0x1464C8)
+        # The same order as tuples
+        self.assertEqual(np.argsort(packed, kind='stable').tolist(),
+                         sorted(range(len(packed)), key=lambda i: tuple(self.rgb8[i])))
+        with self.assertRaises(ValueError):
+            pack_rgb8([[0, 256, 0]])
+        with self.assertRaises(ValueError):
+            unpack_rgb8([-1])
+
+    def test_pairs(self):
+        a = pack_rgb8(self.rgb8)
+        b = a[::-1]
+        keys = pack_pairs(a, b)
+        self.assertEqual(keys.dtype, np.uint64)
+        np.testing.assert_array_equal(keys, pack_pairs(b, a))
+        low, high = unpack_pairs(keys)
+        np.testing.assert_array_equal(low, np.minimum(a, b))
+        np.testing.assert_array_equal(high, np.maximum(a, b))
+        self.assertEqual(low.dtype, np.uint32)
+        self.assertEqual(len(set(keys.tolist())), len({tuple(sorted(p)) for p in zip(a.tolist(), b.tolist())}))
+
+
+if __name__ == '__main__':
+    unittest.main()
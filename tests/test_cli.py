@@ -0,0 +1,107 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from colors import *
+from colors.cli import ROOT, main, random_pairs, sweep_stats
+from colors.metrics import all_distances
+
+
+def run(*argv) -> tuple[int, str]:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+        status = main(list(argv))
+    return status, out.getvalue()
+
+
+class TestCLI(unittest.TestCase):
+    def test_sweeps(self):
+        status, out = run('sweeps', '--passes', '5000', '--batch-size', '700', '--metrics', 'rgbd,lab2k', '--format', 'json')
+        self.assertEqual(status, 0)
+        result = json.loads(out)
+        self.assertEqual(list(result['metrics']), ['rgbd', 'lab2k'])
+        self.assertAlmostEqual(result['metrics']['rgbd']['mean'], 0.382, delta=0.01)
+
+        # The merged power sums give the statistics of all distances at once
+        stats = sweep_stats(3000, ['rgbl'], batch_size=3000)['rgbl']
+        d = all_distances(*np.random.default_rng(np.random.SeedSequence(0).spawn(1)[0]).random((2, 3000, 3)), ['rgbl'])['rgbl']
+        self.assertAlmostEqual(stats['mean'], d.mean())
+        self.assertAlmostEqual(stats['std'], d.std())
+        self.assertAlmostEqual(stats['max'], d.max())
+        self.assertAlmostEqual(stats['skew'], ((d - d.mean()) ** 3).mean() / d.std() ** 3)
+        self.assertEqual(sweep_stats(3000, ['rgbl'], batch_size=400, workers=3),
+                         sweep_stats(3000, ['rgbl'], batch_size=400))
+
+    def test_gen_random(self):
+        status, out = run('gen-random', '--count', '3', '--tolerance', '0.005', '--batch-size', '1000', '--format', 'csv')
+        self.assertEqual(status, 0)
+        rows = list(csv.DictReader(io.StringIO(out)))
+        self.assertEqual(len(rows), 3)
+        for row in rows:
+            a = rgb_to_lab76(RGBDisplay.from_hex(row['a']))
+            b = rgb_to_lab76(RGBDisplay.from_hex(row['b']))
+            self.assertAlmostEqual(a.distance(b), float(row['distance']), places=9)
+            self.assertLessEqual(abs(float(row['distance']) - 0.7), 0.005)
+
+        result = random_pairs(0.3, 0.01, 'rgbl', count=4, batch_size=500)
+        self.assertEqual(random_pairs(0.3, 0.01, 'rgbl', count=4, batch_size=500, workers=3), result)
+        self.assertEqual(result['tries'], result['pairs'][-1][3])
+        # Not found
+        result = random_pairs(2.0, 0.01, count=1, max_iter=1000, batch_size=300)
+        self.assertEqual(result, {'pairs': [], 'tries': 1000})
+
+    def test_cards(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            html = os.path.join(tmp, 'cards.html')
+            status, out = run('gen-cards-to-check', '--metrics', 'rgbl', '--format', 'json', '--html', html)
+            self.assertEqual(status, 0)
+            with open(html, encoding='utf-8') as f:
+                self.assertIn('#C0FF00', f.read())
+        pairs = json.loads(out)['pairs']
+        self.assertEqual(pairs[0]['a'], '#C0FF00')
+        a = rgbd_to_rgbl(RGBDisplay.from_hex(pairs[0]['a']))
+        b = rgbd_to_rgbl(RGBDisplay.from_hex(pairs[0]['b']))
+        self.assertAlmostEqual(pairs[0]['rgbl'], a.distance(b))
+
+        status, out = run('gen-cards')
+        self.assertEqual(status, 0)
+        self.assertTrue(out.startswith('Total cards: '))
+
+    def test_analysis(self):
+        status, out = run('analysis', os.path.join(ROOT, 'results/ratings-2025-11-06-15-33.tsv'), '--bootstrap', '20', '--workers', '1',
+                          '--metrics', 'rgbl,lab2k', '--fit', '', '--format', 'json')
+        self.assertEqual(status, 0)
+        result = json.loads(out)
+        self.assertEqual(result['n_pairs'], 47)
+        self.assertEqual(list(result['bootstrap']['differences']), ['rgbl - lab2k'])
+        self.assertEqual(result['fits'], [])
+
+    def test_errors(self):
+        self.assertEqual(run('sweeps', '--metrics', 'nope')[0], 2)
+        self.assertEqual(run('analysis', 'results/missing.tsv', '--bootstrap', '0', '--fit', '')[0], 2)
+        with self.assertRaises(SystemExit):
+            run('sweeps', '--format', 'xml')
+        for option in ('--passes', '--batch-size'):
+            with self.assertRaises(SystemExit):
+                run('sweeps', option, '0')
+        with self.assertRaises(SystemExit):
+            run('gen-random', '--count', '-1')
+        for option in ('--bootstrap', '--workers'):
+            with self.assertRaises(SystemExit):
+                run('analysis', option, '-1')
+        with self.assertRaises(SystemExit):
+            run('sweeps', '--workers', '-1')
+        with self.assertRaises(SystemExit):
+            run('gen-cards', '--page-size', '0')
+        with self.assertRaises(ValueError):
+            sweep_stats(0, ['rgbl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import colorsys
 
 from colors import *
+from colors.convert import conversion_path, convert, converter
 
 """
 Delta R caluclators:
@@ -55,6 +56,22 @@ class TestConversion(unittest.TestCase):
         self.assertAlmostEqual(lab_blue.a, 16.636374714070477, delta=0.01)
         self.assertAlmostEqual(lab_blue.b, -56.67426141344636, delta=0.01)
 
+    def test_oklab_samples(self):
+        # Linear sRGB, see https://bottosson.github.io/posts/oklab/
+        white = rgb_to_oklab(RGBLinear(1.0, 1.0, 1.0))
+        red = rgb_to_oklab(RGBLinear(1.0, 0.0, 0.0))
+        for our, ref in zip(white.components(), (1.0, 0.0, 0.0)):
+            self.assertAlmostEqual(our, ref, places=6)
+        for our, ref in zip(red.components(), (0.627955, 0.224863, 0.125846)):
+            self.assertAlmostEqual(our, ref, places=5)
+
+    def test_cam16ucs_samples(self):
+        white = rgb_to_cam16ucs(RGBLinear(1.0, 1.0, 1.0))
+        black = rgb_to_cam16ucs(RGBLinear(0.0, 0.0, 0.0))
+        self.assertAlmostEqual(white.j, 100.0, places=4)
+        self.assertAlmostEqual(black.j, 0.0)
+        self.assertLess(abs(white.a) + abs(white.b), 3.0)  # nearly neutral, adaptation is incomplete
+
     def test_all_conversions(self):
         """
         Test creation of all RGB colors and conversion round-trips.
@@ -115,3 +132,57 @@ class TestConversion(unittest.TestCase):
                     lab2k = rgb_to_lab2k(rgb)
                     back = lab2k_to_rgbl(lab2k)
                     self.assertTrue(rgb.almost_equal(back))
+
+                    # Lab94, LabCMC
+                    back = lab94_to_rgbl(rgb_to_lab94(rgb))
+                    self.assertTrue(rgb.almost_equal(back))
+                    back = labcmc_to_rgbl(rgb_to_labcmc(rgb))
+                    self.assertTrue(rgb.almost_equal(back))
+
+                    # Oklab
+                    back = oklab_to_rgbl(rgb_to_oklab(rgb))
+                    self.assertTrue(rgb.almost_equal(back))
+
+                    # CAM16-UCS
+                    back = cam16ucs_to_rgbl(rgb_to_cam16ucs(rgb))
+                    self.assertTrue(rgb.almost_equal(back))
+
+
+class TestConversionGraph(unittest.TestCase):
+    MODELS = (RGBDisplay, RGBLinear, YIQ, HSV, HLS, Lab, Lab76, Lab2k, Lab2kTextiles, Lab94, LabCMC, Oklab, CAM16UCS)
+
+    def test_paths(self):
+        self.assertEqual(conversion_path(HSV, Lab76), (hsv_to_rgbl, rgb_to_lab76))
+        self.assertEqual(conversion_path(RGBDisplay, Oklab), (rgbd_to_rgbl, rgb_to_oklab))
+        self.assertEqual(conversion_path(Oklab, Oklab), ())
+        self.assertEqual(len(conversion_path(Lab76, Lab2k)), 1)
+        self.assertIs(converter(HSV, Lab2k), converter(HSV, Lab2k))
+        with self.assertRaises(ValueError):
+            conversion_path(RGB, Lab2k)
+
+    def test_objects(self):
+        color = RGBDisplay.from_8bit(255, 215, 0)
+        for source in self.MODELS:
+            start = convert(color, to=source)
+            self.assertIs(type(start), source)
+            for target in self.MODELS:
+                result = convert(start, to=target)
+                self.assertIs(type(result), target, (source, target))
+                self.assertTrue(convert(result, to=RGBDisplay).almost_equal(color), (source, target))
+
+        hsv = HSV(0.3, 0.5, 0.7)
+        self.assertEqual(convert(hsv, to=Lab2k), rgb_to_lab2k(hsv_to_rgbl(hsv)))
+        lab76 = rgb_to_lab76(rgbd_to_rgbl(color))
+        self.assertEqual(convert(lab76, to=Lab2k).components(), lab76.components())
+        self.assertIs(convert(hsv, to=HSV), hsv)
+
+    def test_arrays(self):
+        import numpy as np
+
+        rgb8 = np.array([[255, 215, 0], [0, 87, 183], [10, 10, 10]], dtype=np.uint8)
+        hsv = convert(rgb8, to=HSV)
+        for model in (Lab2k, Oklab, CAM16UCS, RGBLinear):
+            expected = [convert(HSV(*c), to=model).components() for c in hsv.tolist()]
+            np.testing.assert_allclose(convert(hsv, to=model, source=HSV), expected, atol=1e-9)
+        self.assertEqual(convert(hsv, to=Lab2k, source=HSV, dtype=np.float32).dtype, np.float32)
+        np.testing.assert_allclose(convert(convert(rgb8, to=Oklab), to=RGBDisplay, source=Oklab), rgb8 / 255.0, atol=1e-6)
@@ -1,6 +1,8 @@
 import unittest
 
-from colors import RGBDisplay, RGBLinear
+import numpy as np
+
+from colors import RGBDisplay, RGBLinear, Lab2k, Lab2kTextiles
 from colors import (
     rgbd_to_rgbl,
     rgbl_to_rgbd,
@@ -9,7 +11,13 @@ from colors import (
     rgb_to_hls,
     rgb_to_lab76,
     rgb_to_lab2k,
+    rgb_to_lab94,
+    rgb_to_labcmc,
+    rgb_to_oklab,
+    rgb_to_cam16ucs,
 )
+from colors.image import convert_image
+from colors.models import CAM16UCS, CAM16UCS_MAX
 
 
 class TestDistance(unittest.TestCase):
@@ -86,3 +94,74 @@ class TestDistance(unittest.TestCase):
         lab2k_dist = lab2k_yellow.distance_not_normalized(lab2k_blue)
         # self.assertAlmostEqual(lab2k_dist, 75.2134, delta=0.01)  # TODO: does not match
         self.assertAlmostEqual(lab2k_dist, 77.3566, delta=0.01)
+
+    def test_lab2k_factors(self):
+        gray1 = rgb_to_lab2k(RGBLinear(0.2, 0.2, 0.2))
+        gray2 = rgb_to_lab2k(RGBLinear(0.3, 0.3, 0.3))
+        d = gray1.distance_not_normalized(gray2)
+
+        # Only lightness differs, so kL = 2 halves the difference
+        t1 = Lab2kTextiles(*gray1.components())
+        t2 = Lab2kTextiles(*gray2.components())
+        self.assertAlmostEqual(t1.distance_not_normalized(t2), d / 2)
+        self.assertAlmostEqual(t1.distance(t2), gray1.distance(gray2) / 2)
+        with self.assertRaises(TypeError):
+            t1.distance(gray2)
+
+    def test_lab2k_prepared(self):
+        yellow = rgb_to_lab2k(rgbd_to_rgbl(RGBDisplay.from_8bit(255, 215, 0)))
+        others = [rgb_to_lab2k(rgbd_to_rgbl(RGBDisplay.from_8bit(r, g, b)))
+                  for r, g, b in [(0, 87, 183), (0, 0, 0), (250, 210, 10), (255, 215, 0)]]
+        prepared = yellow.prepared()
+        for d, other in zip(prepared.distances(others), others):
+            self.assertAlmostEqual(d, yellow.distance(other), places=12)
+        for d, other in zip(prepared.distances_not_normalized(others), others):
+            self.assertAlmostEqual(d, yellow.distance_not_normalized(other), places=12)
+
+        # A snapshot: later changes of the color do not reach it, and it can not be changed
+        expected = prepared.distances(others)
+        yellow.a += 10
+        self.assertEqual(prepared.distances(others), expected)
+        with self.assertRaises(AttributeError):
+            prepared.a = 0.0
+
+        textiles = Lab2kTextiles(*others[0].components())
+        t = textiles.prepared()
+        self.assertAlmostEqual(t.distances([Lab2kTextiles(*others[1].components())])[0],
+                               textiles.distance(Lab2kTextiles(*others[1].components())), places=12)
+        with self.assertRaises(TypeError):
+            t.distances(others[:1])
+
+    def test_new_metrics(self):
+        white = RGBLinear(1.0, 1.0, 1.0)
+        black = RGBLinear(0.0, 0.0, 0.0)
+        yellow = rgbd_to_rgbl(RGBDisplay.from_8bit(255, 215, 0))
+        blue = rgbd_to_rgbl(RGBDisplay.from_8bit(0, 87, 183))
+        for convert in (rgb_to_lab94, rgb_to_labcmc, rgb_to_oklab, rgb_to_cam16ucs):
+            self.assertAlmostEqual(convert(yellow).distance(convert(yellow)), 0.0)
+            d = convert(white).distance(convert(black))
+            self.assertTrue(0.0 < d <= 1.0)
+            self.assertTrue(0.0 < convert(yellow).distance(convert(blue)) <= 1.0)
+        self.assertAlmostEqual(rgb_to_oklab(white).distance(rgb_to_oklab(black)), 1.0, places=6)
+
+        # Lightness difference only: CIE94 is ΔL, CMC 2:1 is the half of ΔL / SL
+        self.assertAlmostEqual(rgb_to_lab94(white).distance_not_normalized(rgb_to_lab94(black)), 100.0, places=4)
+        lab_white = rgb_to_labcmc(white)
+        sl = 0.040975 * lab_white.l / (1 + 0.01765 * lab_white.l)
+        self.assertAlmostEqual(lab_white.distance_not_normalized(rgb_to_labcmc(black)), 100.0 / (2 * sl), places=3)
+
+        # CIE94 and CMC are not symmetric: the first color is the reference
+        d1 = rgb_to_lab94(yellow).distance_not_normalized(rgb_to_lab94(blue))
+        d2 = rgb_to_lab94(blue).distance_not_normalized(rgb_to_lab94(yellow))
+        self.assertNotAlmostEqual(d1, d2)
+
+    def test_cam16ucs_max(self):
+        # No pair of colors of a grid over the RGB cube, with its corners and the farthest pair, reaches the clip
+        values = np.array([0, 32, 64, 96, 128, 160, 192, 224, 255], dtype=np.uint8)
+        grid = np.stack(np.meshgrid(values, values, values, indexing='ij'), axis=-1).reshape(-1, 3)
+        points = convert_image(grid, to=CAM16UCS)
+        d = np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=-1))
+        self.assertLess(d.max(), CAM16UCS_MAX)
+        self.assertGreater(d.max(), 105.5)
+        far = rgb_to_cam16ucs(rgbd_to_rgbl(RGBDisplay.from_8bit(0, 0, 32)))
+        self.assertLess(far.distance(rgb_to_cam16ucs(rgbd_to_rgbl(RGBDisplay.from_8bit(255, 255, 0)))), 1.0)
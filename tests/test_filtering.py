@@ -0,0 +1,88 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+from study.filtering import REASONS, session_verdicts
+
+
+def reference_reason(rows, blacklisted):
+    # Reference: the per-session loops stat.analyze() used to run
+    if blacklisted:
+        return "blacklisted"
+    if len(rows) < 15:
+        return "short"
+    scores = [r[2] for r in rows]
+    if len(set(scores)) == 1:
+        return "identical"
+    mean = sum(scores) / len(scores)
+    if math.sqrt(sum((s - mean) ** 2 for s in scores) / (len(scores) - 1)) < 10.0:
+        return "low_stddev"
+    ts = [r[0] for r in rows]
+    duration = max(ts) - min(ts)
+    if duration < 10:
+        return "short_duration"
+    if len(ts) / duration > 0.5:
+        return "high_rate"
+    if sum(1 for s in scores if s == 50) > len(scores) * 0.5:
+        return "neutral"
+    pair_scores = {}
+    for _, pair, score in rows:
+        pair_scores.setdefault(pair, []).append(score)
+    if sum(1 for s in pair_scores.values() if max(s) - min(s) >= 50) > 1:
+        return "inconsistent"
+    return None
+
+
+class TestSessionVerdicts(unittest.TestCase):
+    def test_against_reference(self):
+        rnd = random.Random(7)
+        n_sessions = 60
+        sessions, ts, pairs, scores = [], [], [], []
+        clocks = [1000] * n_sessions
+        for _ in range(3000):
+            s = rnd.randrange(n_sessions)
+            kind = s % 6
+            clocks[s] += 1 if kind == 1 else rnd.randint(2, 6)
+            sessions.append(s)
+            ts.append(clocks[s])
+            pairs.append(rnd.randrange(40) if kind != 5 else rnd.randrange(3))
+            if kind == 2:
+                scores.append(70)
+            elif kind == 3:
+                scores.append(rnd.choice((50, 50, 50, rnd.randint(0, 100))))
+            elif kind == 4:
+                scores.append(rnd.randint(60, 75))
+            else:
+                scores.append(rnd.randint(0, 100))
+        # Empty and short sessions
+        n_sessions += 1
+        sessions += [n_sessions] * 3
+        ts += [1, 5, 9]
+        pairs += [0, 1, 2]
+        scores += [0, 50, 100]
+        n_sessions += 1
+        blacklisted = np.zeros(n_sessions, dtype=bool)
+        blacklisted[0] = True
+
+        verdicts = session_verdicts(sessions, ts, pairs, scores, n_sessions, blacklisted)
+
+        seen = set()
+        for code in range(n_sessions):
+            rows = [(t, p, sc) for s, t, p, sc in zip(sessions, ts, pairs, scores) if s == code]
+            if not rows:
+                self.assertFalse(verdicts['trusted'][code])
+                self.assertEqual(verdicts['n'][code], 0)
+                continue
+            expected = reference_reason(rows, blacklisted[code])
+            got = verdicts['reason'][code]
+            self.assertEqual(REASONS[got] if got >= 0 else None, expected, code)
+            self.assertEqual(verdicts['trusted'][code], expected is None)
+            seen.add(expected)
+        # The data exercises most of the checks
+        self.assertGreaterEqual(len(seen), 6)
+
+    def test_empty(self):
+        verdicts = session_verdicts([], [], [], [], n_sessions=0)
+        self.assertEqual(len(verdicts['trusted']), 0)
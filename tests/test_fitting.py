@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from colors import Lab, RGBDisplay, rgbd_to_rgbl, rgb_to_lab2k
+from study.fitting import FittedMetric, PARAMETRIC_METRICS, cross_validate, fit_metric, fitted_color_class
+
+
+def make_pairs(n=60, seed=5):
+    rng = np.random.default_rng(seed)
+    return rng.random((n, 3)), rng.random((n, 3))
+
+
+class TestFitting(unittest.TestCase):
+    def test_recovers_parameters(self):
+        a, b = make_pairs()
+        truth = FittedMetric(PARAMETRIC_METRICS['lab2k-k'], {'kL': 2.0, 'kC': 1.0, 'kH': 0.8, 'scale': 25.0, 'gamma': 1.3})
+        human = truth.pair_distances(a, b)
+        human[3] = np.nan  # pairs without ratings are skipped
+        fitted = fit_metric('lab2k-k', a, b, human)
+        self.assertEqual(fitted.n_pairs, len(a) - 1)
+        self.assertLess(fitted.loss, 1e-6)
+        for name in ('kL', 'kH', 'scale', 'gamma'):
+            self.assertAlmostEqual(fitted.params[name], truth.params[name], delta=0.05 * truth.params[name])
+        self.assertEqual(fitted.params['kC'], 1.0)
+
+    def test_weighted_axes(self):
+        a, b = make_pairs()
+        for name in ('lab-weighted', 'yiq-weighted', 'hsv-weighted'):
+            metric = PARAMETRIC_METRICS[name]
+            params = dict(zip(metric.params, (1.0, 2.0, 0.5)), scale=0.5 if name != 'lab-weighted' else 40.0, gamma=1.0)
+            truth = FittedMetric(metric, params)
+            fitted = fit_metric(name, a, b, truth.pair_distances(a, b))
+            np.testing.assert_allclose(fitted.pair_distances(a, b), truth.pair_distances(a, b), atol=1e-3)
+
+    def test_color_class(self):
+        params = {'kL': 2.0, 'kC': 1.0, 'kH': 1.0, 'scale': 20.0, 'gamma': 1.0}
+        cls = fitted_color_class('lab2k-k', params)
+        self.assertTrue(issubclass(cls, Lab))
+        self.assertEqual(cls.__name__, 'FittedLab2kK')
+        x = rgbd_to_rgbl(RGBDisplay.from_8bit(255, 215, 0))
+        y = rgbd_to_rgbl(RGBDisplay.from_8bit(0, 87, 183))
+        fx = cls(*rgb_to_lab2k(x).components())
+        fy = cls(*rgb_to_lab2k(y).components())
+        expected = FittedMetric(PARAMETRIC_METRICS['lab2k-k'], params).distance_converted(
+            np.array(rgb_to_lab2k(x).components()), np.array(rgb_to_lab2k(y).components()))
+        self.assertAlmostEqual(fx.distance(fy), float(expected))
+        self.assertAlmostEqual(fx.distance(fx), 0.0)
+        self.assertTrue(0.0 < fx.distance(fy) < 1.0)
+        with self.assertRaises(TypeError):
+            fx.distance(rgb_to_lab2k(y))
+        with self.assertRaises(TypeError):
+            fx.distance_not_normalized(rgb_to_lab2k(y))
+
+    def test_cross_validate(self):
+        a, b = make_pairs(n=15)
+        truth = FittedMetric(PARAMETRIC_METRICS['lab-weighted'], {'wL': 1.0, 'wa': 1.5, 'wb': 0.5, 'scale': 40.0, 'gamma': 1.0})
+        target = 100 - 100 * truth.pair_distances(a, b)
+        rng = np.random.default_rng(0)
+        sessions, pairs, scores = [], [], []
+        for s in range(20):
+            for p in range(15):
+                sessions.append(s)
+                pairs.append(p)
+                scores.append(int(np.clip(round(target[p] + rng.normal(0, 5)), 0, 100)))
+        cv = cross_validate('lab-weighted', sessions, pairs, scores, a, b, folds=4)
+        self.assertEqual(len(cv['folds']), 4)
+        self.assertGreater(cv['test']['pearson'], 0.9)
+        self.assertLess(cv['test']['rmse'], cv['base']['rmse'])
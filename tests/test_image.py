@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+
+from colors import *
+from colors.image import convert_image, conversion_steps, delta_e_map, map_tiles, tiles, to_uint8
+
+
+class TestImage(unittest.TestCase):
+    def setUp(self):
+        self.image = np.random.default_rng(3).integers(0, 256, (37, 29, 3), dtype=np.uint8)
+
+    def test_conversions(self):
+        cases = [
+            (RGBLinear, lambda c: c),
+            (YIQ, rgb_to_yiq),
+            (HSV, rgb_to_hsv),
+            (HLS, rgb_to_hls),
+            (Lab2k, rgb_to_lab2k),
+            (Oklab, rgb_to_oklab),
+            (CAM16UCS, rgb_to_cam16ucs),
+        ]
+        pixels = self.image.reshape(-1, 3)[::40]
+        for model, convert in cases:
+            result = convert_image(self.image, to=model)
+            self.assertEqual(result.shape, self.image.shape)
+            expected = [convert(rgbd_to_rgbl(RGBDisplay.from_8bit(*p))).components() for p in pixels.tolist()]
+            np.testing.assert_allclose(result.reshape(-1, 3)[::40], expected, atol=1e-9, err_msg=model.__name__)
+
+    def test_round_trip(self):
+        for model in (RGBDisplay, RGBLinear, YIQ, HSV, HLS, Lab76, Oklab, CAM16UCS):
+            converted = convert_image(self.image, to=model)
+            back = convert_image(converted, to=RGBDisplay, source=model)
+            if model is YIQ:
+                # The rounded YIQ matrices, amplified by the sRGB gamma near black
+                np.testing.assert_allclose(back, self.image / 255.0, atol=0.02)
+            else:
+                np.testing.assert_array_equal(to_uint8(back), self.image, err_msg=model.__name__)
+
+    def test_tiles(self):
+        self.assertEqual(tiles(10, 4), [slice(0, 4), slice(4, 8), slice(8, 10)])
+        self.assertEqual(tiles(0, 4), [])
+        self.assertEqual(map_tiles(lambda tile: tile.stop, 10, 3, workers=4), [3, 6, 9, 10])
+
+        whole = convert_image(self.image, to=Lab2k)
+        np.testing.assert_array_equal(convert_image(self.image, to=Lab2k, tile_pixels=100), whole)
+        np.testing.assert_array_equal(convert_image(self.image, to=Lab2k, tile_pixels=100, workers=4), whole)
+        np.testing.assert_array_equal(convert_image(self.image, to=Lab2k, tile_pixels=100, workers=None), whole)
+
+    def test_options(self):
+        lab32 = convert_image(self.image, to=Lab2k, dtype=np.float32)
+        self.assertEqual(lab32.dtype, np.float32)
+        np.testing.assert_allclose(lab32, convert_image(self.image, to=Lab2k), atol=1e-3)
+        self.assertEqual(conversion_steps(Lab76, Lab2kTextiles), [])
+        self.assertEqual(convert_image(self.image[0], to=Oklab).shape, (29, 3))
+        np.testing.assert_array_equal(convert_image(pack_rgb8(self.image), to=Lab2k), convert_image(self.image, to=Lab2k))
+        with self.assertRaises(ValueError):
+            convert_image(self.image, to=Lab2k, source=HSV)
+        with self.assertRaises(ValueError):
+            convert_image(np.zeros((2, 2, 4)), to=Lab2k)
+
+    def test_delta_e_map(self):
+        other = self.image.copy()
+        other[:10] = np.clip(other[:10].astype(int) + 9, 0, 255)
+        for metric, convert in (('lab2k', rgb_to_lab2k), ('lab76', rgb_to_lab76), ('oklab', rgb_to_oklab)):
+            differences, summary = delta_e_map(self.image, other, metric=metric)
+            self.assertEqual(differences.shape, (37, 29))
+            for y, x in ((0, 0), (5, 17), (9, 28), (20, 3)):
+                a, b = (convert(rgbd_to_rgbl(RGBDisplay.from_8bit(*img[y, x].tolist()))) for img in (self.image, other))
+                self.assertAlmostEqual(differences[y, x], a.distance_not_normalized(b), places=9)
+            self.assertTrue(np.all(differences[10:] == 0))
+            self.assertAlmostEqual(summary['max'], differences.max())
+            self.assertAlmostEqual(summary['mean'], differences.mean())
+            self.assertAlmostEqual(summary['p95'], np.percentile(differences, 95))
+            self.assertAlmostEqual(summary['above'], np.mean(differences > summary['threshold']))
+            self.assertGreater(summary['above'], 0)
+            self.assertLessEqual(summary['above'], 10 / 37)
+
+        tiled, _ = delta_e_map(self.image, other, tile_pixels=50, workers=3)
+        np.testing.assert_array_equal(tiled, delta_e_map(self.image, other)[0])
+        _, summary = delta_e_map(self.image, other, threshold=1000)
+        self.assertEqual(summary['above'], 0.0)
+        with self.assertRaises(ValueError):
+            delta_e_map(self.image, other[1:])
+        with self.assertRaisesRegex(ValueError, "Unknown metric: lab00, one of lab76, lab2k"):
+            delta_e_map(self.image, other, metric='lab00')
+
+
+if __name__ == '__main__':
+    unittest.main()
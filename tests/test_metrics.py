@@ -0,0 +1,52 @@
+import unittest
+
+from study import Metrics
+
+
+def app(environ, start_response):
+    if environ["PATH_INFO"] == "/boom":
+        raise RuntimeError("boom")
+    if environ["PATH_INFO"] == "/submit":
+        start_response("400 Bad Request", [])
+        return [b""]
+    start_response("200 OK", [])
+    return [b"ok"]
+
+
+def call(wsgi_app, method, path):
+    status = []
+    body = wsgi_app({"REQUEST_METHOD": method, "PATH_INFO": path},
+                    lambda s, h, exc_info=None: status.append(s))
+    return status[0], b"".join(body)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_wsgi(self):
+        metrics = Metrics()
+        wrapped = metrics.wsgi(app)
+        self.assertEqual(call(wrapped, "GET", "/health"), ("200 OK", b"ok"))
+        self.assertEqual(call(wrapped, "GET", "/health")[0], "200 OK")
+        self.assertEqual(call(wrapped, "POST", "/submit")[0], "400 Bad Request")
+        call(wrapped, "GET", "/whatever")
+        with self.assertRaises(RuntimeError):
+            call(wrapped, "GET", "/boom")
+        with metrics.phase("/submit", "parse"):
+            pass
+
+        status, body = call(wrapped, "GET", "/metrics")
+        self.assertEqual(status, "200 OK")
+        text = body.decode("utf-8")
+        self.assertIn('colorstudy_requests_total{route="/health",method="GET",status="200"} 2', text)
+        self.assertIn('colorstudy_requests_total{route="other",method="GET",status="500"} 1', text)
+        self.assertIn('colorstudy_request_errors_total{route="/submit"} 1', text)
+        self.assertIn('colorstudy_request_duration_seconds_count{route="/health"} 2', text)
+        self.assertIn('colorstudy_request_duration_seconds_bucket{route="/health",le="+Inf"} 2', text)
+        self.assertIn('colorstudy_request_phase_seconds_count{route="/submit",phase="parse"} 1', text)
+        self.assertIn('colorstudy_write_queue_depth 0', text)
+
+    def test_write_queue(self):
+        metrics = Metrics()
+        with metrics.writing():
+            with metrics.writing():
+                self.assertEqual(metrics.write_queue, 2)
+        self.assertEqual(metrics.write_queue, 0)
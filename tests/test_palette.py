@@ -0,0 +1,148 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from colors import *
+from colors.image import DELTA_E, convert_image
+from colors.palette import DISTANCE_BOUNDS, PaletteMapper, dominant_colors, histogram, palette_rgb8, quantize
+
+
+# Colors of the test image and their shares of the pixels
+COLORS = [(200, 30, 40), (20, 90, 200), (240, 230, 210)]
+SHARES = [0.5, 0.3, 0.2]
+
+
+def make_image(noise: int = 6) -> np.ndarray:
+    rng = np.random.default_rng(5)
+    rows = [np.tile(color, (int(share * 100), 80, 1)) for color, share in zip(COLORS, SHARES)]
+    image = np.concatenate(rows).astype(int) + rng.integers(-noise, noise + 1, (100, 80, 3))
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+class TestPalette(unittest.TestCase):
+    def test_histogram(self):
+        image = make_image()
+        rgb, weights = histogram(image)
+        self.assertEqual(weights.sum(), 100 * 80)
+        self.assertLessEqual(len(weights), 1 << 15)
+        np.testing.assert_allclose((rgb * weights[:, None]).sum(axis=0), (image / 255.0).reshape(-1, 3).sum(axis=0))
+
+        flat, weights = histogram(make_image(noise=0))
+        self.assertEqual(sorted(weights.tolist()), [1600, 2400, 4000])
+        self.assertEqual(sorted(np.rint(flat * 255).astype(int).tolist()), sorted(list(c) for c in COLORS))
+        _, weights = histogram(make_image(noise=0) / 255.0)
+        self.assertEqual(len(weights), 3)
+
+    def test_dominant_colors(self):
+        image = make_image()
+        for method in ('kmeans', 'median-cut'):
+            for space, convert in ((Lab2k, rgb_to_lab2k), (Oklab, rgb_to_oklab)):
+                result = dominant_colors(image, 3, space=space, method=method)
+                self.assertEqual(len(result), 3)
+                self.assertTrue(all(type(c) is space for c in result))
+                for color, expected in zip(result, COLORS):
+                    reference = convert(rgbd_to_rgbl(RGBDisplay.from_8bit(*expected)))
+                    self.assertLess(color.distance(reference), 0.01, (method, space.__name__))
+
+    def test_quantize(self):
+        image = make_image()
+        centers, shares = quantize(image, 3)
+        self.assertEqual(centers.shape, (3, 3))
+        np.testing.assert_allclose(shares, SHARES)
+        np.testing.assert_array_equal(quantize(image, 3)[0], centers)
+
+        centers, shares = quantize(image, 16, method='median-cut', space=Lab76)
+        self.assertEqual(len(centers), 16)
+        self.assertAlmostEqual(shares.sum(), 1.0)
+        self.assertTrue(np.all(np.diff(shares) <= 0))
+        # More colors than the image has
+        self.assertEqual(len(quantize(make_image(noise=0), 5)[0]), 3)
+        self.assertEqual(len(quantize(make_image(noise=0), 5, method='median-cut')[0]), 3)
+        with self.assertRaises(ValueError):
+            quantize(image, 3, space=HSV)
+        with self.assertRaises(ValueError):
+            quantize(image, 3, method='octree')
+
+
+class TestPaletteMapper(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        self.palette = rng.integers(0, 256, (12, 3), dtype=np.uint8)
+        self.colors = rng.integers(0, 256, (20000, 3), dtype=np.uint8)
+
+    def test_nearest(self):
+        mapper = PaletteMapper(self.palette, bits=5)
+        palette = [rgb_to_lab2k(rgbd_to_rgbl(RGBDisplay.from_8bit(*c))) for c in self.palette.tolist()]
+        for rgb8, index in zip(self.colors[:200].tolist(), mapper.nearest(self.colors[:200])):
+            color = rgb_to_lab2k(rgbd_to_rgbl(RGBDisplay.from_8bit(*rgb8)))
+            distances = [p.distance_not_normalized(color) for p in palette]
+            self.assertAlmostEqual(distances[index], min(distances), places=9)
+
+    def test_table(self):
+        for bits in (5, 6):
+            mapper = PaletteMapper(self.palette, bits=bits)
+            self.assertEqual(mapper.table.shape, (1 << (3 * bits),))
+            shift = 8 - bits
+            cells = ((self.colors >> shift) << shift) + ((1 << shift) >> 1)
+            np.testing.assert_array_equal(mapper.map(self.colors), mapper.nearest(cells), bits)
+
+        mapper = PaletteMapper(self.palette, metric='oklab', bits=5)
+        image = self.colors.reshape(100, 200, 3)
+        self.assertEqual(mapper.map(image).shape, (100, 200))
+        np.testing.assert_array_equal(mapper.apply(image), self.palette[mapper.map(image)])
+        np.testing.assert_array_equal(mapper.map(self.palette), np.arange(12))
+        np.testing.assert_array_equal(mapper.map(pack_rgb8(image)), mapper.map(image))
+        np.testing.assert_array_equal(palette_rgb8(pack_rgb8(self.palette)), self.palette)
+
+    def test_exact(self):
+        # A clustered palette near the gray axis: the nearest colors change within the cells of the table
+        palette = np.clip(120 + np.random.default_rng(9).integers(-12, 13, (16, 3)), 0, 255).astype(np.uint8)
+        values = np.arange(100, 141, 2, dtype=np.uint8)
+        block = np.stack(np.meshgrid(values, values, values, indexing='ij'), axis=-1).reshape(-1, 3)
+        colors = np.concatenate([block, self.colors])
+        cells = ((colors >> 2) << 2) + 2
+        for metric in ('lab2k', 'lab94', 'cmc', 'oklab'):
+            mapper = PaletteMapper(palette, metric=metric, bits=6)
+            np.testing.assert_array_equal(mapper.map(colors), mapper.nearest(cells), metric)
+
+    def test_bounds(self):
+        # Cells of 4^3 colors, some of them on the gray axis, and palette colors, one gray
+        rng = np.random.default_rng(3)
+        corners = np.concatenate([rng.integers(0, 253, (40, 3)), np.repeat(rng.integers(0, 253, (8, 1)), 3, axis=1)])
+        offsets = np.stack(np.meshgrid(*[np.arange(4)] * 3, indexing='ij'), axis=-1).reshape(-1, 3)
+        cells = (corners[:, None, :] + offsets).astype(np.uint8)
+        palette = np.concatenate([self.palette, [[128, 128, 128]]]).astype(np.uint8)
+        rows, cols = np.divmod(np.arange(len(cells) * len(palette)), len(palette))
+        for metric, bounds in DISTANCE_BOUNDS.items():
+            model, distance, _ = DELTA_E[metric]
+            points, reference = convert_image(cells, to=model), convert_image(palette, to=model)
+            low, high = bounds(reference[cols], points.min(axis=1)[rows], points.max(axis=1)[rows])
+            d = distance(reference[cols][:, None, :], points[rows])
+            self.assertTrue(np.all(low <= d.min(axis=1) + 1e-9), metric)
+            self.assertTrue(np.all(high >= d.max(axis=1) - 1e-9), metric)
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            mapper = PaletteMapper(self.palette, bits=5, cache_dir=cache_dir)
+            self.assertEqual(os.listdir(cache_dir), [f"palette-{mapper.key}.npy"])
+            build = PaletteMapper._build_table
+            PaletteMapper._build_table = None
+            try:
+                cached = PaletteMapper(self.palette, bits=5, cache_dir=cache_dir)
+            finally:
+                PaletteMapper._build_table = build
+            np.testing.assert_array_equal(cached.table, mapper.table)
+            self.assertNotEqual(PaletteMapper(self.palette, metric='lab76', bits=5).key, mapper.key)
+            self.assertNotEqual(PaletteMapper(self.palette[::-1], bits=5).key, mapper.key)
+
+    def test_palette(self):
+        objects = [rgb_to_lab2k(rgbd_to_rgbl(RGBDisplay.from_8bit(*c))) for c in self.palette.tolist()]
+        np.testing.assert_array_equal(palette_rgb8(objects), self.palette)
+        np.testing.assert_array_equal(palette_rgb8(self.palette / 255.0), self.palette)
+        np.testing.assert_array_equal(palette_rgb8(self.palette.tolist()), self.palette)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from colors import *
+from colors.preview import page_paths, pair_rgb8, write_preview
+
+
+class TestPreview(unittest.TestCase):
+    def setUp(self):
+        self.rgb8 = np.random.default_rng(4).integers(0, 256, (1200, 2, 3), dtype=np.uint8)
+
+    def read(self, path) -> str:
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    def test_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cards.html')
+            paths = write_preview(path, self.rgb8, page_size=500, workers=2)
+            self.assertEqual(paths, page_paths(path, 3))
+            self.assertEqual(sorted(os.listdir(tmp)), ['cards-2.html', 'cards-3.html', 'cards.html'])
+            pages = [self.read(p) for p in paths]
+            self.assertEqual([page.count('<div class="pair"') for page in pages], [500, 500, 200])
+            self.assertIn('id="pair-501"', pages[1])
+            self.assertIn('Page 2 of 3', pages[1])
+            self.assertIn('href="cards.html">previous', pages[1])
+            self.assertIn('href="cards-3.html">next', pages[1])
+            self.assertNotIn('previous', pages[0])
+            self.assertTrue(all(page.endswith('</html>\n') for page in pages))
+
+    def test_distances(self):
+        a, b = RGBDisplay.from_8bit(255, 215, 0), RGBDisplay.from_8bit(0, 87, 183)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cards.html')
+            self.assertEqual(write_preview(path, [(a, b), ('#000000', '#ffffff')], names=['rgbd', 'lab2k']), [path])
+            page = self.read(path)
+        self.assertIn('#FFD700', page)
+        self.assertIn('#FFFFFF', page)
+        self.assertNotIn('Page 1', page)
+        lab2k = rgb_to_lab2k(rgbd_to_rgbl(a)).distance(rgb_to_lab2k(rgbd_to_rgbl(b)))
+        self.assertIn(f"RGBD {a.distance(b):.3f}, Lab ΔE2000 {lab2k:.3f}", page)
+
+    def test_input(self):
+        pairs = [('#102030', '#405060')]
+        np.testing.assert_array_equal(pair_rgb8(pairs), [[[16, 32, 48], [64, 80, 96]]])
+        np.testing.assert_array_equal(pair_rgb8([(RGB.from_hex(a), RGB.from_hex(b)) for a, b in pairs]), pair_rgb8(pairs))
+        with self.assertRaises(ValueError):
+            pair_rgb8([('#102030', 'red')])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'empty.html')
+            write_preview(path, [])
+            self.assertNotIn('class="pair"', self.read(path))
+            with self.assertRaises(ValueError):
+                write_preview(path, pairs, page_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import colors
+from colors import convert, models, profiling
+
+
+class TestProfiling(unittest.TestCase):
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def test_disabled_by_default(self):
+        self.assertFalse(profiling.enabled())
+        self.assertIs(colors.rgb_to_lab2k, convert.rgb_to_lab2k)
+        self.assertNotIn('__wrapped__', vars(convert.rgb_to_lab2k))
+
+    def test_counts(self):
+        original = convert.rgb_to_lab2k
+        original_distance = models.Lab2k.distance
+        profiling.enable()
+        self.assertTrue(profiling.enabled())
+        self.assertIs(colors.rgb_to_lab2k, convert.rgb_to_lab2k)
+        self.assertIsNot(convert.rgb_to_lab2k, original)
+
+        a = colors.RGBDisplay.from_8bit(255, 215, 0)
+        b = colors.RGBDisplay.from_8bit(0, 87, 183)
+        for _ in range(5):
+            colors.rgb_to_lab2k(colors.rgbd_to_rgbl(a)).distance(colors.rgb_to_lab2k(colors.rgbd_to_rgbl(b)))
+        stats = profiling.stats()
+        self.assertEqual(stats['convert.rgb_to_lab2k'][0], 10)
+        self.assertEqual(stats['convert._srgb_to_linear'][0], 30)
+        self.assertEqual(stats['Lab2k.distance'][0], 5)
+        self.assertGreater(stats['models.check01'][0], 0)
+        self.assertGreater(stats['Lab2k.distance'][1], 0)
+        self.assertTrue(profiling.report()[1].split()[0] in stats)
+
+        profiling.disable()
+        self.assertIs(convert.rgb_to_lab2k, original)
+        self.assertIs(colors.rgb_to_lab2k, original)
+        self.assertIs(models.Lab2k.distance, original_distance)
+        self.assertNotIn('distance', vars(models.Lab2kTextiles))
+        colors.rgb_to_lab2k(a)
+        self.assertEqual(profiling.stats()['convert.rgb_to_lab2k'][0], 10)
+
+        profiling.reset()
+        self.assertEqual(profiling.stats(), {})
+
+    def test_convert(self):
+        # The conversion graph calls the wrappers, not the functions bound before enable()
+        color = colors.RGBDisplay.from_8bit(255, 215, 0)
+        original = convert.convert(color, to=colors.HSV)
+        profiling.enable()
+        self.assertEqual(convert.convert(color, to=colors.HSV), original)
+        stats = profiling.stats()
+        self.assertEqual(stats['convert.rgbd_to_rgbl'][0], 1)
+        self.assertEqual(stats['convert.rgb_to_hsv'][0], 1)
+        self.assertNotIn('convert._node', stats)
+        profiling.disable()
+        self.assertIs(convert.conversion_path(colors.RGBDisplay, colors.HSV)[0], convert.rgbd_to_rgbl)
@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+
+from colors import RGBDisplay, rgbd_to_rgbl, rgb_to_hsv, rgb_to_lab2k
+from colors.metrics import Metric, all_distances, get_metric, register_metric, registered_metrics
+
+
+class TestRegistry(unittest.TestCase):
+    def test_registered(self):
+        names = [metric.name for metric in registered_metrics()]
+        for name in ('rgbd', 'rgbl', 'yiq', 'hsv', 'hls', 'lab76', 'lab2k', 'hsv-d', 'lab2k-d'):
+            self.assertIn(name, names)
+        with self.assertRaises(KeyError):
+            get_metric('nope')
+        with self.assertRaises(ValueError):
+            register_metric(Metric('rgbd', 'RGBD', (), None))
+
+    def test_matches_models(self):
+        pairs = [((255, 215, 0), (0, 87, 183)), ((0, 0, 0), (255, 255, 255)), ((120, 120, 120), (130, 130, 130))]
+        a = np.array([p[0] for p in pairs]) / 255.0
+        b = np.array([p[1] for p in pairs]) / 255.0
+        result = all_distances(a, b)
+        self.assertEqual(set(result), {metric.name for metric in registered_metrics()})
+        for i, (x, y) in enumerate(pairs):
+            xd = RGBDisplay.from_8bit(*x)
+            yd = RGBDisplay.from_8bit(*y)
+            xl = rgbd_to_rgbl(xd)
+            yl = rgbd_to_rgbl(yd)
+            self.assertAlmostEqual(result['rgbd'][i], xd.distance(yd))
+            self.assertAlmostEqual(result['rgbl'][i], xl.distance(yl))
+            self.assertAlmostEqual(result['hsv'][i], rgb_to_hsv(xl).distance(rgb_to_hsv(yl)))
+            self.assertAlmostEqual(result['hsv-d'][i], rgb_to_hsv(xd).distance(rgb_to_hsv(yd)))
+            self.assertAlmostEqual(result['lab2k'][i], rgb_to_lab2k(xl).distance(rgb_to_lab2k(yl)))
+            self.assertAlmostEqual(get_metric('lab2k').pair_distances(a, b)[i], result['lab2k'][i])
+
+    def test_subset(self):
+        result = all_distances(np.zeros((2, 3)), np.ones((2, 3)), names=['lab76', 'rgbd'])
+        self.assertEqual(list(result), ['lab76', 'rgbd'])
+        np.testing.assert_allclose(result['rgbd'], [1.0, 1.0])
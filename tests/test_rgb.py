@@ -46,6 +46,14 @@ class TestRGB(unittest.TestCase):
             self.assertIsInstance(b, cls)
             self.assertEqual(b.to_8bit(), (20, 100, 200))
 
+            # To and from packed 0xRRGGBB
+            self.assertEqual(a.to_packed(), 0x1464C8)
+            b = cls.from_packed(0x1464C8)
+            self.assertIsInstance(b, cls)
+            self.assertEqual(b.to_8bit(), (20, 100, 200))
+            with self.assertRaises(ValueError):
+                cls.from_packed(0x1000000)
+
     def test_equality(self):
         a = RGBDisplay(0.1, 0.2, 0.3)
         b = RGBDisplay(0.1, 0.2, 0.3)
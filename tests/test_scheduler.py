@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from study import PairScheduler, PairStat, pair_key, packed_pair_key, parse_packed_color
+
+
+PAIRS = [
+    ['#000000', '#FFFFFF'],
+    ['#FF0000', '#00FFFF'],
+    ['#787878', '#828282'],
+]
+
+
+class TestPairStat(unittest.TestCase):
+    def test_running_stats(self):
+        stat = PairStat()
+        self.assertEqual(stat.variance(), 0.0)
+        for score in (10, 20, 30, 40):
+            stat.add(score)
+        self.assertEqual(stat.count, 4)
+        self.assertAlmostEqual(stat.mean, 25.0)
+        self.assertAlmostEqual(stat.variance(), 500.0 / 3)
+
+
+class TestPairScheduler(unittest.TestCase):
+    def test_pair_key(self):
+        self.assertEqual(pair_key('#ffffff', '#000000'), ('#000000', '#FFFFFF'))
+        with self.assertRaises(ValueError):
+            pair_key('FFFFFF', '#000000')
+
+    def test_packed_pair_key(self):
+        self.assertEqual(parse_packed_color('#1464c8'), 0x1464C8)
+        for color in ('1464C8', '#1464C', '#+464C8', '#0x64C8', '#1464G8'):
+            with self.assertRaises(ValueError):
+                parse_packed_color(color)
+        key = packed_pair_key(0xFFFFFF, 0x000001)
+        self.assertEqual(key, (1 << 32) | 0xFFFFFF)
+        self.assertEqual(packed_pair_key(0x000001, 0xFFFFFF), key)
+
+    def test_unrated_first(self):
+        scheduler = PairScheduler(PAIRS)
+        for _ in range(5):
+            scheduler.add('#000000', '#FFFFFF', 0)
+            scheduler.add('#FF0000', '#00FFFF', 20)
+        self.assertEqual(scheduler.next_pair(), ('#787878', '#828282'))
+
+    def test_high_variance_first(self):
+        scheduler = PairScheduler(PAIRS, pending_ttl=0.0)
+        for score in (0, 1, 0, 1, 0, 1):
+            scheduler.add('#000000', '#FFFFFF', score)
+            scheduler.add('#787878', '#828282', 90 + score)
+        for score in (0, 80, 10, 90, 30, 60):
+            scheduler.add('#FF0000', '#00FFFF', score)
+        self.assertEqual(scheduler.next_pair(), ('#00FFFF', '#FF0000'))
+        # The pair just shown is not repeated
+        self.assertNotEqual(scheduler.next_pair(exclude=('#FF0000', '#00FFFF')), ('#00FFFF', '#FF0000'))
+
+    def test_pending_pairs(self):
+        scheduler = PairScheduler(PAIRS)
+        served = {scheduler.next_pair() for _ in range(len(PAIRS))}
+        self.assertEqual(len(served), len(PAIRS))
+
+    def test_unknown_pair(self):
+        scheduler = PairScheduler(PAIRS)
+        self.assertFalse(scheduler.add('#123456', '#654321', 50))
+        self.assertFalse(scheduler.add('bad', '#654321', 50))
+        self.assertTrue(scheduler.add('#FFFFFF', '#000000', 50))
+
+    def test_seed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ratings.tsv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("1.2.3.4\t1762330799\tA\t#FFFFFF\t#000000\t3\n")
+                f.write("1.2.3.4\t1762330802\tA\t#FF0000\t#00FFFF\t40\n")
+                f.write("1.2.3.4\t1762330805\tA\t#FF0000\t#00FFFF\tbad\n")
+                f.write("1762330808\tA\t#FF0000\t#00FFFF\t40\n")
+            scheduler = PairScheduler(PAIRS)
+            self.assertEqual(scheduler.seed(path), 2)
+            self.assertEqual(scheduler.stats[('#000000', '#FFFFFF')].count, 1)
+            self.assertEqual(scheduler.seed(os.path.join(tmp, "missing.tsv")), 0)
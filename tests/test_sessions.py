@@ -0,0 +1,129 @@
+import unittest
+
+import numpy as np
+
+from study import PREDEFINED_PAIRS, SessionMonitor
+from study.filtering import session_verdicts
+
+
+def feed(monitor, name, scores, step=3, pairs=PREDEFINED_PAIRS, start=1000):
+    state = None
+    for i, score in enumerate(scores):
+        a, b = pairs[i % len(pairs)]
+        state = monitor.observe(name, "1.2.3.4", start + i * step, a, b, score)
+    return state
+
+
+class TestSessionMonitor(unittest.TestCase):
+    def test_trusted(self):
+        monitor = SessionMonitor()
+        state = feed(monitor, "ok", [100, 0, 40, 80, 20] * 2)
+        self.assertEqual(state.status, "warmup")
+        state = feed(monitor, "ok2", [100, 0, 40, 80, 20] * 4)
+        self.assertEqual(state.status, "trusted")
+        self.assertIsNone(state.reason)
+
+    def test_identical(self):
+        state = feed(SessionMonitor(), "same", [70] * 20)
+        self.assertTrue(state.flagged)
+        self.assertIn("identical", state.reason)
+
+    def test_low_stddev(self):
+        state = feed(SessionMonitor(), "flat", [70, 71, 72] * 6)
+        self.assertTrue(state.flagged)
+        self.assertIn("stddev", state.reason)
+
+    def test_rate(self):
+        state = feed(SessionMonitor(), "fast", [100, 0, 40, 80, 20] * 4, step=1)
+        self.assertTrue(state.flagged)
+        self.assertIn("rate", state.reason)
+
+    def test_neutral(self):
+        state = feed(SessionMonitor(), "lazy", [50, 50, 50, 0, 100] * 4)
+        self.assertTrue(state.flagged)
+        self.assertIn("50 scores", state.reason)
+
+    def test_inconsistent(self):
+        # The same two pairs rated once as identical, once as very different
+        pairs = PREDEFINED_PAIRS[:2]
+        state = feed(SessionMonitor(), "random", [100, 100, 0, 0], pairs=pairs)
+        self.assertTrue(state.flagged)
+        self.assertIn("inconsistent", state.reason)
+
+    def test_recovers(self):
+        # Flagged on a prefix, trusted on all the ratings, as by session_verdicts()
+        monitor = SessionMonitor()
+        pairs = np.arange(65) % len(PREDEFINED_PAIRS)
+        scores = [[100, 0, 40, 80, 20][p % 5] for p in pairs]
+        ts = [1000 + i for i in range(15)] + [1014 + 10 * i for i in range(1, 51)]
+        statuses = []
+        for i, (t, score) in enumerate(zip(ts, scores)):
+            a, b = PREDEFINED_PAIRS[pairs[i]]
+            statuses.append(monitor.observe("slow", "1.2.3.4", t, a, b, score).status)
+        self.assertEqual(statuses[14], "flagged")
+        self.assertEqual(statuses[-1], "trusted")
+        verdicts = session_verdicts(np.zeros(len(ts), dtype=int), ts, pairs, scores, n_sessions=1)
+        self.assertTrue(verdicts['trusted'][0])
+
+        feed(monitor, "same", [70] * 20)
+        state = feed(monitor, "same", [40, 100, 70, 90, 50] * 10, start=1060)
+        self.assertEqual(state.status, "trusted")
+        self.assertEqual(monitor.summary()['flagged_total'], 2)
+        # Flagged again, still counted once
+        state = feed(monitor, "same", [50] * 51, start=1300)
+        self.assertTrue(state.flagged)
+        self.assertEqual(monitor.summary()['flagged_total'], 2)
+
+    def test_sticky(self):
+        # Inconsistent scores flag a session for good
+        monitor = SessionMonitor()
+        feed(monitor, "random", [100, 100, 0, 0], pairs=PREDEFINED_PAIRS[:2])
+        state = feed(monitor, "random", [100, 0, 40, 80, 20] * 10, pairs=PREDEFINED_PAIRS[2:])
+        self.assertTrue(state.flagged)
+        self.assertIn("inconsistent", state.reason)
+
+    def test_release(self):
+        monitor = SessionMonitor()
+        released = []
+        for i, score in enumerate([100, 0, 40, 80, 20] * 4):
+            a, b = PREDEFINED_PAIRS[i]
+            state, ratings = monitor.submit("ok", "1.2.3.4", 1000 + 3 * i, a, b, score)
+            self.assertEqual(len(ratings), 0 if i < 14 else 15 if i == 14 else 1)
+            released += ratings
+        self.assertEqual(state.held, [])
+        self.assertEqual([score for _, _, score in released], [100, 0, 40, 80, 20] * 4)
+        self.assertEqual(released[0], (*PREDEFINED_PAIRS[0], 100))
+
+        # The warmup of a flagged session is dropped
+        for i in range(20):
+            state, ratings = monitor.submit("same", "1.2.3.4", 1000 + 3 * i, *PREDEFINED_PAIRS[i], 70)
+            self.assertEqual(ratings, [])
+        self.assertEqual(state.held, [])
+
+    def test_bounded(self):
+        monitor = SessionMonitor()
+        for i in range(100):
+            monitor.observe("junk", "1.2.3.4", 1000 + 3 * i, f"#{i:06X}", "#000000", i)
+            monitor.observe("junk", "1.2.3.4", 1000 + 3 * i, f"bad{i}", "#000000", i)
+        state = monitor.observe("junk", "1.2.3.4", 2000, *PREDEFINED_PAIRS[0], 50)
+        self.assertEqual(list(state.pair_ranges), [tuple(sorted(PREDEFINED_PAIRS[0]))])
+
+    def test_lru(self):
+        monitor = SessionMonitor(max_sessions=2)
+        feed(monitor, "a", [10])
+        feed(monitor, "b", [10])
+        feed(monitor, "a", [10])
+        feed(monitor, "c", [10])
+        self.assertEqual(list(monitor.sessions), [("a", "1.2.3.4"), ("c", "1.2.3.4")])
+        self.assertEqual(monitor.sessions[("a", "1.2.3.4")].count, 2)
+        self.assertEqual(monitor.summary()['dropped_warmup'], 1)
+
+    def test_evict_judged(self):
+        # The held ratings of a warmup outlive a judged session
+        monitor = SessionMonitor(max_sessions=2)
+        feed(monitor, "warmup", [10])
+        feed(monitor, "ok", [100, 0, 40, 80, 20] * 3)
+        feed(monitor, "new", [10])
+        self.assertEqual(list(monitor.sessions), [("warmup", "1.2.3.4"), ("new", "1.2.3.4")])
+        self.assertEqual(monitor.sessions[("warmup", "1.2.3.4")].held, [(*PREDEFINED_PAIRS[0], 10)])
+        self.assertEqual(monitor.summary()['dropped_warmup'], 0)
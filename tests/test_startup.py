@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET = 0.05  # seconds, for `import colors` and the scalar API
+RUNS = 3
+
+# Prints the seconds and the heavy modules imported
+IMPORT_COLORS = """
+import sys, time
+start = time.perf_counter()
+import colors
+from colors import RGBDisplay, rgbd_to_rgbl, rgb_to_lab2k
+rgb_to_lab2k(rgbd_to_rgbl(RGBDisplay(0.1, 0.2, 0.3)))
+print(time.perf_counter() - start, *sorted({'numpy', 'scipy', 'matplotlib'} & set(sys.modules)))
+"""
+
+# Loads a script as a module without running it
+LOAD_SCRIPT = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location('script', sys.argv[1])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+print(*sorted({'matplotlib'} & set(sys.modules)))
+"""
+
+
+def run(code: str, *args) -> list[str]:
+    result = subprocess.run(
+        [sys.executable, '-c', code, *args], cwd=ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, 'COLORS_PROFILE': ''},
+    )
+    return result.stdout.split()
+
+
+class TestStartup(unittest.TestCase):
+    def test_import_colors(self):
+        runs = [run(IMPORT_COLORS) for _ in range(RUNS)]
+        for output in runs:
+            self.assertEqual(output[1:], [], "import colors must not import NumPy, SciPy or matplotlib")
+        self.assertLess(min(float(output[0]) for output in runs), IMPORT_BUDGET)
+
+    def test_lazy_names(self):
+        import colors
+        self.assertIn('rgb_to_lab2k', dir(colors))
+        self.assertIs(colors.Lab2k, colors.models.Lab2k)
+        self.assertIs(colors.parse_hex_array, colors.bulk.parse_hex_array)
+        self.assertEqual(colors.batch.__name__, 'colors.batch')
+        with self.assertRaises(AttributeError):
+            colors.no_such_name
+
+    def test_scripts(self):
+        for script in ('stat.py', 'distance_range.py'):
+            self.assertEqual(run(LOAD_SCRIPT, os.path.join(ROOT, script)), [], script)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from colors import *
+from colors import models
+
+
+class TestValidation(unittest.TestCase):
+    INVALID = [
+        (RGB, (1.5, 0.0, 0.0)),
+        (RGBDisplay, (0.0, -0.1, 0.0)),
+        (RGBLinear, (0.0, 0.0, 2.0)),
+        (YIQ, (0.5, 0.7, 0.0)),
+        (YIQ, (0.5, 0.0, -0.6)),
+        (YIQ, (1.2, 0.0, 0.0)),
+        (HSV, (1.1, 0.5, 0.5)),
+        (HLS, (0.5, -0.5, 0.5)),
+    ]
+
+    def tearDown(self):
+        set_validation(True)
+
+    def test_public_constructors_validate(self):
+        self.assertTrue(validation_enabled())
+        for cls, components in self.INVALID:
+            with self.assertRaises(ValueError, msg=cls.__name__):
+                cls(*components)
+        with self.assertRaises(ValueError):
+            RGBDisplay.from_8bit(256, 0, 0)
+        with self.assertRaises(ValueError):
+            HSV.from_degrees(90, 120, 50)
+
+    def test_set_validation(self):
+        self.assertTrue(set_validation(False))
+        self.assertFalse(validation_enabled())
+        for cls, components in self.INVALID:
+            self.assertEqual(cls(*components).components(), components)
+        self.assertFalse(set_validation(True))
+        with self.assertRaises(ValueError):
+            RGB(1.5, 0.0, 0.0)
+
+    def test_conversions_are_trusted(self):
+        calls = []
+        check01 = models.check01
+        models.check01 = lambda value: calls.append(value) or check01(value)
+        try:
+            color = RGBDisplay(0.2, 0.6, 0.9)
+            self.assertEqual(len(calls), 3)
+            results = [
+                rgbd_to_rgbl(color), rgbl_to_rgbd(rgbd_to_rgbl(color)),
+                rgb_to_yiq(color), yiq_to_rgbd(rgb_to_yiq(color)),
+                rgb_to_hsv(color), hsv_to_rgbl(rgb_to_hsv(color)),
+                rgb_to_hls(color), hls_to_rgbd(rgb_to_hls(color)),
+                lab2k_to_rgbd(rgb_to_lab2k(color)), oklab_to_rgbl(rgb_to_oklab(color)),
+                cam16ucs_to_rgbd(rgb_to_cam16ucs(color)),
+            ]
+            self.assertEqual(len(calls), 3)
+        finally:
+            models.check01 = check01
+        # The same objects as of the validating constructors
+        for result in results:
+            self.assertEqual(type(result)(*result.components()), result)
+            self.assertEqual(vars(type(result)(*result.components())), vars(result))
+
+
+if __name__ == '__main__':
+    unittest.main()
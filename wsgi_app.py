@@ -3,6 +3,10 @@ WSGI backend for Color-Distance Study on PythonAnywhere
 - GET  /           -> serve web/index.html
 - GET  /index.html -> same
 - GET  /health     -> {"ok": true}
+- GET  /next       -> {"colorA": ..., "colorB": ...}, the pair to rate next;
+                      optional ?a=...&b=... is the pair just shown (not repeated)
+- GET  /stats      -> per-pair aggregates and model correlations, as JSON
+- GET  /metrics    -> request latency histograms and counters, Prometheus text format
 - POST /submit     -> JSON: {name, colorA, colorB, score}
                       append: ip \t timestamp \t name \t colorA \t colorB \t score
 CORS: Access-Control-Allow-Origin: *
@@ -12,6 +16,9 @@ import json
 import os
 import sys
 import time
+from urllib.parse import parse_qs
+
+from study import LiveStats, Metrics, PairScheduler, SessionMonitor, read_ratings
 
 BASE_DIR = os.path.dirname(__file__)
 INDEX_FILE = os.path.join(BASE_DIR, "web", "index.html")
@@ -26,6 +33,19 @@ try:
 except FileNotFoundError:
     INDEX_BODY = None
 
+METRICS = Metrics()
+
+# Per-pair rating counts and variances, and running aggregates for /stats,
+# seeded from the ratings log.  Ratings of untrusted sessions are kept out of them,
+# and those of new sessions until they are judged.
+SCHEDULER = PairScheduler()
+STATS = LiveStats()
+SESSIONS = SessionMonitor()
+for _ip, _ts, _name, _colorA, _colorB, _score in read_ratings(OUTPUT_FILE):
+    for _rating in SESSIONS.submit(_name, _ip, _ts, _colorA, _colorB, _score)[1]:
+        SCHEDULER.add(*_rating)
+        STATS.add(*_rating)
+
 
 def _cors_headers(extra=None):
     headers = [
@@ -56,6 +76,27 @@ def application(environ, start_response):
         )
         return [b'{"ok": true}']
 
+    # ---- API: Next pair ----
+    if path == "/next" and method == "GET":
+        query = parse_qs(environ.get("QUERY_STRING") or "")
+        shown = (query.get("a", [""])[0], query.get("b", [""])[0])
+        colorA, colorB = SCHEDULER.next_pair(exclude=shown if all(shown) else None)
+        body = json.dumps({"colorA": colorA, "colorB": colorB}).encode("utf-8")
+        start_response(
+            "200 OK",
+            _cors_headers([("Content-Type", "application/json; charset=utf-8")]),
+        )
+        return [body]
+
+    # ---- API: Live statistics ----
+    if path == "/stats" and method == "GET":
+        body = json.dumps(dict(STATS.summary(), sessions=SESSIONS.summary()), ensure_ascii=False).encode("utf-8")
+        start_response(
+            "200 OK",
+            _cors_headers([("Content-Type", "application/json; charset=utf-8")]),
+        )
+        return [body]
+
     # ---- Web app: web/index.html ----
     if path == "/" and method == "GET":
         if INDEX_BODY is None:
@@ -77,12 +118,13 @@ def application(environ, start_response):
             length_str = environ.get("CONTENT_LENGTH") or "0"
             length = int(length_str)
             raw = environ["wsgi.input"].read(length) if length > 0 else b""
-            data = json.loads(raw.decode("utf-8"))
+            with METRICS.phase(path, "parse"):
+                data = json.loads(raw.decode("utf-8"))
 
-            name = str(data.get("name", "")).strip()
-            colorA = str(data.get("colorA", "")).strip()
-            colorB = str(data.get("colorB", "")).strip()
-            score = int(data.get("score"))
+                name = str(data.get("name", "")).strip()
+                colorA = str(data.get("colorA", "")).strip()
+                colorB = str(data.get("colorB", "")).strip()
+                score = int(data.get("score"))
 
             if not name or not colorA or not colorB or not (0 <= score <= 100):
                 raise ValueError("Invalid payload")
@@ -91,15 +133,21 @@ def application(environ, start_response):
             ts = int(time.time())
             line = f"{ip}\t{ts}\t{name}\t{colorA}\t{colorB}\t{score}\n"
 
-            os.makedirs(os.path.dirname(OUTPUT_FILE) or ".", exist_ok=True)
-            with open(OUTPUT_FILE, "a", encoding="utf-8") as f:
-                f.write(line)
+            with METRICS.writing(), METRICS.phase(path, "write"):
+                os.makedirs(os.path.dirname(OUTPUT_FILE) or ".", exist_ok=True)
+                with open(OUTPUT_FILE, "a", encoding="utf-8") as f:
+                    f.write(line)
+            session, released = SESSIONS.submit(name, ip, ts, colorA, colorB, score)
+            for rating in released:
+                SCHEDULER.add(*rating)
+                STATS.add(*rating)
 
             # Log to stdout as JSON
             print(
                 json.dumps(
                     {"ip": ip, "ts": ts, "name": name,
-                     "A": colorA, "B": colorB, "score": score},
+                     "A": colorA, "B": colorB, "score": score,
+                     "session": session.status},
                     ensure_ascii=False,
                 ),
                 file=sys.stdout,
@@ -120,3 +168,7 @@ def application(environ, start_response):
     # ---- The rest: 404 ----
     start_response("404 Not Found", _cors_headers())
     return [b"not found"]
+
+
+# Request latency and error metrics, GET /metrics
+application = METRICS.wsgi(application)